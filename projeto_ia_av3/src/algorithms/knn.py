@@ -16,6 +16,13 @@ class KNearestNeighbors:
     - Minkowski
     """
 
+    # Parâmetro cujos valores a busca de hiperparâmetros avalia com uma
+    # única busca de vizinhos (ver kneighbors / predict_from_neighbors)
+    shared_search_param = 'k'
+
+    # partial_fit exato (ver learning_curve em utils.model_selection)
+    exact_partial_fit = True
+
     def __init__(self, k=5, distance_metric='euclidean', p=2):
         """
         Inicializa o classificador KNN
@@ -41,6 +48,42 @@ class KNearestNeighbors:
         """
         self.X_train = np.array(X)
         self.y_train = np.array(y)
+        self._X_buffer = None
+        self._y_buffer = None
+        return self
+
+    def partial_fit(self, X, y, classes=None):
+        """
+        Acrescenta amostras ao conjunto de treino (treino incremental)
+
+        As amostras ficam em um buffer com capacidade dobrada quando
+        cheio, de modo que acrescentar n linhas custa O(n) amortizado;
+        X_train e y_train são views do trecho preenchido.
+
+        Args:
+            X: Features do lote
+            y: Labels do lote
+            classes: Ignorado (compatibilidade com os demais modelos)
+        """
+        X = np.asarray(X)
+        y = np.asarray(y)
+        n_old = 0 if self.X_train is None else len(self.X_train)
+        n_new = n_old + len(X)
+
+        buffer = getattr(self, '_X_buffer', None)
+        if buffer is None or n_new > len(buffer):
+            capacity = max(n_new, 2 * (len(buffer) if buffer is not None else 0))
+            X_buffer = np.empty((capacity,) + X.shape[1:], dtype=X.dtype)
+            y_buffer = np.empty(capacity, dtype=y.dtype)
+            if n_old:
+                X_buffer[:n_old] = self.X_train
+                y_buffer[:n_old] = self.y_train
+            self._X_buffer, self._y_buffer = X_buffer, y_buffer
+
+        self._X_buffer[n_old:n_new] = X
+        self._y_buffer[n_old:n_new] = y
+        self.X_train = self._X_buffer[:n_new]
+        self.y_train = self._y_buffer[:n_new]
         return self
 
     def euclidean_distance(self, x1, x2):
@@ -161,6 +204,70 @@ class KNearestNeighbors:
             predictions.append(pred)
         return np.array(predictions)
 
+    def kneighbors(self, X, n_neighbors=None, chunk_bytes=64 * 1024 ** 2):
+        """
+        Índices dos vizinhos mais próximos de várias amostras (vetorizado)
+
+        Usa as mesmas distâncias (a menos de arredondamento na última casa)
+        e o mesmo desempate (menor índice de treino) de
+        get_k_nearest_neighbors, processando as consultas em blocos para
+        limitar a memória.
+
+        Args:
+            X: Pontos de consulta (n_queries, n_features)
+            n_neighbors: Número de vizinhos (padrão: self.k)
+            chunk_bytes: Memória aproximada por bloco de consultas
+
+        Returns:
+            Array (n_queries, n_neighbors) de índices, do mais próximo ao
+            mais distante
+        """
+        X = np.asarray(X, dtype=float)
+        n_neighbors = n_neighbors or self.k
+        n_train, n_features = self.X_train.shape
+        chunk = max(1, chunk_bytes // (8 * n_train * max(n_features, 1)))
+
+        neighbors = np.empty((len(X), min(n_neighbors, n_train)), dtype=np.intp)
+        for start in range(0, len(X), chunk):
+            diff = X[start:start + chunk, None, :] - self.X_train[None, :, :]
+            if self.distance_metric == 'euclidean':
+                distances = np.sqrt(np.sum(diff ** 2, axis=2))
+            elif self.distance_metric == 'manhattan':
+                distances = np.sum(np.abs(diff), axis=2)
+            elif self.distance_metric == 'minkowski':
+                distances = np.sum(np.abs(diff) ** self.p, axis=2) ** (1 / self.p)
+            else:
+                raise ValueError(f"Métrica {self.distance_metric} não suportada")
+
+            order = np.argsort(distances, axis=1, kind='stable')
+            neighbors[start:start + chunk] = order[:, :n_neighbors]
+        return neighbors
+
+    def predict_from_neighbors(self, neighbors, k=None):
+        """
+        Votação majoritária a partir de vizinhos já calculados
+
+        Empates são resolvidos como em predict_single (Counter): vence a
+        classe que aparece primeiro entre os vizinhos.
+
+        Args:
+            neighbors: Saída de kneighbors com pelo menos k colunas
+            k: Número de vizinhos usados na votação (padrão: self.k)
+
+        Returns:
+            Array de predições
+        """
+        k = k or self.k
+        classes = np.unique(self.y_train)
+        labels = np.searchsorted(classes, self.y_train[neighbors[:, :k]])
+
+        matches = labels[:, :, None] == np.arange(len(classes))
+        counts = matches.sum(axis=1)
+        first_pos = np.where(matches, np.arange(k)[None, :, None], k).min(axis=1)
+
+        # Maior contagem; em empate, a primeira ocorrência
+        return classes[np.argmax(counts * (k + 1) - first_pos, axis=1)]
+
     def predict_proba(self, X):
         """
         Prediz probabilidades de cada classe
@@ -171,26 +278,14 @@ class KNearestNeighbors:
         Returns:
             Array de probabilidades
         """
-        probas = []
+        # Busca de vizinhos vetorizada (libera o GIL nas operações NumPy)
+        neighbors = self.kneighbors(X, self.k)
         unique_classes = np.unique(self.y_train)
-        n_classes = len(unique_classes)
-
-        for x in X:
-            # Encontra k vizinhos
-            k_nearest_indices = self.get_k_nearest_neighbors(x)
-            k_nearest_labels = [self.y_train[i] for i in k_nearest_indices]
-
-            # Conta votos para cada classe
-            class_counts = Counter(k_nearest_labels)
-
-            # Calcula probabilidades
-            proba = np.zeros(n_classes)
-            for i, cls in enumerate(unique_classes):
-                proba[i] = class_counts.get(cls, 0) / self.k
-
-            probas.append(proba)
+        labels = np.searchsorted(unique_classes, self.y_train[neighbors])
 
-        return np.array(probas)
+        # Conta votos para cada classe
+        counts = (labels[:, :, None] == np.arange(len(unique_classes))).sum(axis=1)
+        return counts / self.k
 
     def get_params(self):
         """
@@ -14,6 +14,13 @@ class MLP:
     Treinamento: Backpropagation + Gradient Descent
     """
 
+    # Candidatos que diferem só no número de épocas são avaliados pela
+    # busca de hiperparâmetros continuando o treino do anterior
+    shared_search_param = 'n_epochs'
+
+    # fit aceita um Dataset (utils.dataset) e treina em streaming
+    accepts_dataset = True
+
     def __init__(self, input_size, hidden_sizes=[64], output_size=2,
                  learning_rate=0.01, n_epochs=100, activation='relu',
                  random_seed=42, batch_size=32):
@@ -28,7 +35,7 @@ class MLP:
             n_epochs: Número de épocas
             activation: 'relu', 'sigmoid' ou 'tanh'
             random_seed: Seed
-            batch_size: Tamanho do batch para mini-batch GD
+            batch_size: Tamanho do batch para mini-batch GD (None = batch completo)
         """
         self.input_size = input_size
         self.hidden_sizes = hidden_sizes
@@ -54,6 +61,8 @@ class MLP:
 
         # Camadas: input -> hidden1 -> hidden2 -> ... -> output
         layer_sizes = [self.input_size] + self.hidden_sizes + [self.output_size]
+        self.weights = []
+        self.biases = []
 
         for i in range(len(layer_sizes) - 1):
             # Xavier initialization
@@ -124,6 +133,23 @@ class MLP:
         exp_x = np.exp(x - np.max(x, axis=1, keepdims=True))
         return exp_x / np.sum(exp_x, axis=1, keepdims=True)
 
+    def output_activation(self, z):
+        """Ativação da camada de saída (softmax para classificação)"""
+        return self.softmax(z)
+
+    def compute_loss(self, predictions, targets):
+        """
+        Loss do batch (cross-entropy)
+
+        Args:
+            predictions: Saída da rede
+            targets: Labels one-hot encoded
+
+        Returns:
+            Loss média
+        """
+        return -np.mean(np.sum(targets * np.log(predictions + 1e-8), axis=1))
+
     def forward_propagation(self, X):
         """
         Forward pass pela rede
@@ -151,8 +177,8 @@ class MLP:
                 # Camadas ocultas
                 activation = self.apply_activation(z)
             else:
-                # Camada de saída: softmax
-                activation = self.softmax(z)
+                # Camada de saída
+                activation = self.output_activation(z)
 
             activations.append(activation)
             current_activation = activation
@@ -194,71 +220,155 @@ class MLP:
 
         return gradients_w, gradients_b
 
-    def fit(self, X, y):
+    def fit(self, X, y=None, shuffle_buffer=65536):
         """
         Treina o MLP
 
         Args:
-            X: Features (n_samples, n_features)
-            y: Labels (n_samples,)
+            X: Features (n_samples, n_features) ou um Dataset (utils.dataset),
+                lido em lotes a cada época sem carregar os dados inteiros
+            y: Labels (n_samples,); ignorado se X for um Dataset
+            shuffle_buffer: Linhas do buffer de embaralhamento (só Dataset)
+        """
+        if hasattr(X, 'iter_batches'):
+            self._set_classes(X.classes())
+            return self._fit_stream(X, shuffle_buffer)
+        self._set_classes(np.unique(y))
+        return self._fit_targets(X, self._one_hot(y))
+
+    def partial_fit(self, X, y, classes=None):
         """
-        # Converte labels para one-hot
-        unique_labels = np.unique(y)
-        self.classes_ = unique_labels
-        self.n_classes = len(unique_labels)
+        Continua o treinamento a partir dos pesos atuais com um novo lote
+
+        Na primeira chamada define as classes (use `classes` se o lote não
+        contiver todas); as seguintes executam n_epochs épocas apenas sobre
+        o lote recebido e acrescentam ao loss_history.
+
+        Args:
+            X: Features do lote (n_samples, n_features)
+            y: Labels do lote (n_samples,)
+            classes: Todas as classes do problema (opcional)
+        """
+        if not hasattr(self, 'classes_'):
+            self._set_classes(np.unique(y) if classes is None else np.unique(classes))
+        return self._fit_targets(X, self._one_hot(y), warm_start=True)
+
+    def _set_classes(self, classes):
+        """Define as classes e ajusta a camada de saída se necessário"""
+        self.classes_ = classes
+        self.n_classes = len(classes)
 
         if self.n_classes != self.output_size:
             self.output_size = self.n_classes
             self._initialize_weights()
 
-        label_to_idx = {label: idx for idx, label in enumerate(unique_labels)}
-        y_indices = np.array([label_to_idx[label] for label in y])
-
+    def _one_hot(self, y):
+        """Converte labels para one-hot na ordem de classes_"""
+        y = np.asarray(y)
+        y_indices = np.searchsorted(self.classes_, y)
+        # searchsorted leva um label desconhecido à classe vizinha
+        known = y_indices < self.n_classes
+        known[known] = self.classes_[y_indices[known]] == y[known]
+        if not known.all():
+            raise ValueError(f"label {y[~known][0]} fora das classes do modelo "
+                             f"{self.classes_.tolist()}")
         y_one_hot = np.zeros((len(y), self.n_classes))
         y_one_hot[np.arange(len(y)), y_indices] = 1
+        return y_one_hot
+
+    def _fit_targets(self, X, targets, warm_start=False):
+        """
+        Loop de treinamento por mini-batch GD
 
-        # Treinamento
+        Args:
+            X: Features (n_samples, n_features)
+            targets: Saídas desejadas (n_samples, output_size)
+            warm_start: Se True, mantém o loss_history anterior
+        """
         n_samples = X.shape[0]
-        self.loss_history = []
+        batch_size = self.batch_size or n_samples
+        if not warm_start:
+            self.loss_history = []
 
         for epoch in range(self.n_epochs):
             # Shuffle dos dados
             indices = np.random.permutation(n_samples)
             X_shuffled = X[indices]
-            y_shuffled = y_one_hot[indices]
+            y_shuffled = targets[indices]
 
             # Mini-batch gradient descent
             epoch_loss = 0
             n_batches = 0
 
-            for i in range(0, n_samples, self.batch_size):
-                X_batch = X_shuffled[i:i + self.batch_size]
-                y_batch = y_shuffled[i:i + self.batch_size]
+            for i in range(0, n_samples, batch_size):
+                X_batch = X_shuffled[i:i + batch_size]
+                y_batch = y_shuffled[i:i + batch_size]
+
+                epoch_loss += self._train_batch(X_batch, y_batch)
+                n_batches += 1
+
+            avg_loss = epoch_loss / n_batches
+            self.loss_history.append(avg_loss)
+
+        return self
 
-                # Forward pass
-                activations, z_values = self.forward_propagation(X_batch)
+    def _fit_stream(self, dataset, shuffle_buffer, warm_start=False):
+        """
+        Loop de treinamento sobre um Dataset (memória de um lote + buffer)
 
-                # Backward pass
-                gradients_w, gradients_b = self.backward_propagation(
-                    X_batch, y_batch, activations, z_values
-                )
+        Cada época relê o Dataset em lotes de batch_size (1024 se None),
+        embaralhados pelo buffer com seed sorteada do estado global, como
+        a permutação de _fit_targets.
 
-                # Atualiza pesos
-                for j in range(len(self.weights)):
-                    self.weights[j] -= self.learning_rate * gradients_w[j]
-                    self.biases[j] -= self.learning_rate * gradients_b[j]
+        Args:
+            dataset: Dataset com os dados de treino
+            shuffle_buffer: Linhas do buffer de embaralhamento
+            warm_start: Se True, mantém o loss_history anterior
+        """
+        batch_size = self.batch_size or 1024
+        if not warm_start:
+            self.loss_history = []
 
-                # Calcula loss (cross-entropy)
-                predictions = activations[-1]
-                batch_loss = -np.mean(np.sum(y_batch * np.log(predictions + 1e-8), axis=1))
-                epoch_loss += batch_loss
+        for epoch in range(self.n_epochs):
+            epoch_loss = 0
+            n_batches = 0
+            seed = np.random.randint(2 ** 31 - 1)
+            for X_batch, y_batch in dataset.iter_batches(batch_size, shuffle_buffer=shuffle_buffer,
+                                                         random_seed=seed):
+                epoch_loss += self._train_batch(X_batch, self._one_hot(y_batch))
                 n_batches += 1
 
-            avg_loss = epoch_loss / n_batches
-            self.loss_history.append(avg_loss)
+            self.loss_history.append(epoch_loss / max(n_batches, 1))
 
         return self
 
+    def _train_batch(self, X_batch, y_batch):
+        """
+        Um passo de gradiente em um lote
+
+        Args:
+            X_batch: Features do lote
+            y_batch: Saídas desejadas do lote
+
+        Returns:
+            Loss do lote (antes da atualização)
+        """
+        # Forward pass
+        activations, z_values = self.forward_propagation(X_batch)
+
+        # Backward pass
+        gradients_w, gradients_b = self.backward_propagation(
+            X_batch, y_batch, activations, z_values
+        )
+
+        # Atualiza pesos
+        for j in range(len(self.weights)):
+            self.weights[j] -= self.learning_rate * gradients_w[j]
+            self.biases[j] -= self.learning_rate * gradients_b[j]
+
+        # Calcula loss
+        return self.compute_loss(activations[-1], y_batch)
+
     def predict_proba(self, X):
         """
         Prediz probabilidades
@@ -284,8 +394,7 @@ class MLP:
         """
         probas = self.predict_proba(X)
         class_indices = np.argmax(probas, axis=1)
-        predictions = np.array([self.classes_[idx] for idx in class_indices])
-        return predictions
+        return np.take(self.classes_, class_indices)
 
     def score(self, X, y):
         """
@@ -301,6 +410,21 @@ class MLP:
         predictions = self.predict(X)
         return np.mean(predictions == y)
 
+    def freeze(self, dtype=np.float32, chunk_size=4096):
+        """
+        Exporta um grafo de inferência congelado (somente predição)
+
+        Args:
+            dtype: Tipo dos pesos congelados (float32 por padrão)
+            chunk_size: Número de linhas avaliadas por bloco
+
+        Returns:
+            FrozenMLP com cópias contíguas dos pesos
+        """
+        classes = getattr(self, 'classes_', np.arange(self.output_size))
+        return FrozenMLP(self.weights, self.biases, self.activation, classes,
+                         dtype=dtype, chunk_size=chunk_size)
+
     def get_params(self):
         """Retorna parâmetros do modelo"""
         return {
@@ -310,5 +434,180 @@ class MLP:
             'learning_rate': self.learning_rate,
             'n_epochs': self.n_epochs,
             'activation': self.activation,
+            'random_seed': self.random_seed,
             'batch_size': self.batch_size
         }
+
+    def set_params(self, **params):
+        """
+        Define parâmetros do modelo
+
+        Mudanças de arquitetura ou de seed reinicializam os pesos.
+        """
+        for key, value in params.items():
+            setattr(self, key, value)
+        if {'input_size', 'hidden_sizes', 'output_size', 'random_seed'} & set(params):
+            self._initialize_weights()
+        return self
+
+
+class FrozenMLP:
+    """
+    Grafo de inferência congelado de um MLP treinado
+
+    Mantém apenas os pesos (contíguos, em float32 por padrão) e avalia a
+    rede em blocos de linhas usando dois buffers pré-alocados que se
+    alternam entre as camadas (ping-pong). Nenhuma ativação intermediária
+    é retida. Os buffers pertencem à instância: não compartilhe o mesmo
+    objeto entre threads.
+    """
+
+    def __init__(self, weights, biases, activation, classes,
+                 dtype=np.float32, chunk_size=4096):
+        """
+        Inicializa o grafo congelado
+
+        Args:
+            weights: Lista de matrizes de pesos (fan_in, fan_out)
+            biases: Lista de biases (1, fan_out)
+            activation: 'relu', 'sigmoid', 'tanh' ou outra (identidade)
+            classes: Labels originais, na ordem das saídas
+            dtype: Tipo numérico da inferência
+            chunk_size: Número de linhas avaliadas por bloco
+        """
+        self.dtype = np.dtype(dtype)
+        self.weights = [np.ascontiguousarray(W, dtype=self.dtype) for W in weights]
+        self.biases = [np.ascontiguousarray(np.ravel(b), dtype=self.dtype) for b in biases]
+        self.activation = activation
+        self.classes_ = np.asarray(classes)
+        self.chunk_size = chunk_size
+
+        self.input_size = self.weights[0].shape[0]
+        self.output_size = self.weights[-1].shape[1]
+
+        # Resolve a ativação uma única vez (todas operam in-place)
+        self._activation_fn = self._resolve_activation(activation)
+        self._buffers = None
+
+    @staticmethod
+    def _resolve_activation(activation):
+        """Retorna função de ativação in-place"""
+        if activation == 'relu':
+            return lambda z: np.maximum(z, 0, out=z)
+        elif activation == 'sigmoid':
+            def sigmoid_(z):
+                np.clip(z, -500, 500, out=z)
+                np.negative(z, out=z)
+                np.exp(z, out=z)
+                z += 1
+                return np.reciprocal(z, out=z)
+            return sigmoid_
+        elif activation == 'tanh':
+            return lambda z: np.tanh(z, out=z)
+        else:
+            return lambda z: z
+
+    def _allocate_buffers(self):
+        """Aloca buffer de entrada e os dois buffers ping-pong"""
+        max_width = max(W.shape[1] for W in self.weights)
+        self._buffers = (
+            np.empty(self.chunk_size * self.input_size, dtype=self.dtype),
+            np.empty(self.chunk_size * max_width, dtype=self.dtype),
+            np.empty(self.chunk_size * max_width, dtype=self.dtype),
+        )
+
+    def _logits_chunk(self, X_chunk):
+        """
+        Avalia um bloco de até chunk_size linhas
+
+        Args:
+            X_chunk: Features do bloco
+
+        Returns:
+            View (n, output_size) com os logits (válida até a próxima chamada)
+        """
+        if self._buffers is None:
+            self._allocate_buffers()
+        in_buf, ping, pong = self._buffers
+        n = X_chunk.shape[0]
+
+        current = in_buf[:n * self.input_size].reshape(n, self.input_size)
+        np.copyto(current, X_chunk, casting='unsafe')
+
+        n_layers = len(self.weights)
+        for i in range(n_layers):
+            W, b = self.weights[i], self.biases[i]
+            out = ping[:n * W.shape[1]].reshape(n, W.shape[1])
+            np.matmul(current, W, out=out)
+            out += b
+            if i < n_layers - 1:
+                self._activation_fn(out)
+            current = out
+            ping, pong = pong, ping
+
+        return current
+
+    def predict_proba(self, X):
+        """
+        Prediz probabilidades (softmax) em blocos
+
+        Args:
+            X: Features
+
+        Returns:
+            Probabilidades de cada classe
+        """
+        n_samples = X.shape[0]
+        probas = np.empty((n_samples, self.output_size), dtype=self.dtype)
+
+        for start in range(0, n_samples, self.chunk_size):
+            stop = min(start + self.chunk_size, n_samples)
+            out = probas[start:stop]
+            out[...] = self._logits_chunk(X[start:stop])
+            out -= out.max(axis=1, keepdims=True)
+            np.exp(out, out=out)
+            out /= out.sum(axis=1, keepdims=True)
+
+        return probas
+
+    def predict(self, X):
+        """
+        Prediz classes (argmax dos logits, sem softmax)
+
+        Args:
+            X: Features
+
+        Returns:
+            Array de predições
+        """
+        n_samples = X.shape[0]
+        class_indices = np.empty(n_samples, dtype=np.intp)
+
+        for start in range(0, n_samples, self.chunk_size):
+            stop = min(start + self.chunk_size, n_samples)
+            class_indices[start:stop] = np.argmax(
+                self._logits_chunk(X[start:stop]), axis=1
+            )
+
+        return np.take(self.classes_, class_indices)
+
+    def score(self, X, y):
+        """
+        Calcula acurácia
+
+        Args:
+            X: Features
+            y: Labels verdadeiros
+
+        Returns:
+            Acurácia
+        """
+        return np.mean(self.predict(X) == y)
+
+    @property
+    def nbytes(self):
+        """Memória ocupada pelos pesos e buffers (bytes)"""
+        total = sum(W.nbytes for W in self.weights) + sum(b.nbytes for b in self.biases)
+        if self._buffers is not None:
+            total += sum(buf.nbytes for buf in self._buffers)
+        return total
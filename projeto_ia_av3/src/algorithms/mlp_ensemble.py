@@ -0,0 +1,322 @@
+"""
+Ensemble vetorizado de MLPs
+Treina M redes de mesmo formato simultaneamente com np.matmul em lote
+SEM uso de frameworks de deep learning
+"""
+import numpy as np
+
+from .mlp import MLP
+
+
+class MLPEnsemble(MLP):
+    """
+    Conjunto de M redes MLP com a mesma arquitetura treinadas em paralelo
+
+    Os pesos de todos os membros são empilhados em arrays 3-D
+    (M, fan_in, fan_out), de modo que cada passo de forward/backward é um
+    único np.matmul em lote. Cada membro mantém sua própria taxa de
+    aprendizado, inicialização (seed) e ordem de apresentação dos dados.
+    """
+
+    # fit só aceita arrays (Datasets são ajustados via partial_fit)
+    accepts_dataset = False
+
+    def __init__(self, input_size, hidden_sizes=[64], output_size=2,
+                 learning_rates=0.01, n_epochs=100, activation='relu',
+                 random_seeds=(42,), batch_size=32):
+        """
+        Inicializa o ensemble
+
+        Args:
+            input_size: Número de features de entrada
+            hidden_sizes: Lista com tamanhos das camadas ocultas (comum a todos)
+            output_size: Número de classes de saída
+            learning_rates: Taxa única ou lista com uma taxa por membro
+            n_epochs: Número de épocas
+            activation: 'relu', 'sigmoid' ou 'tanh'
+            random_seeds: Lista de seeds (uma por membro)
+            batch_size: Tamanho do batch para mini-batch GD
+        """
+        self.random_seeds = list(random_seeds)
+        self.n_members = len(self.random_seeds)
+
+        learning_rates = np.atleast_1d(np.asarray(learning_rates, dtype=float))
+        if len(learning_rates) == 1:
+            learning_rates = np.full(self.n_members, learning_rates[0])
+        if len(learning_rates) != self.n_members:
+            raise ValueError("learning_rates deve ter um valor por membro do ensemble")
+        self.learning_rates = learning_rates
+
+        super().__init__(input_size, hidden_sizes=hidden_sizes,
+                         output_size=output_size,
+                         learning_rate=learning_rates[0], n_epochs=n_epochs,
+                         activation=activation,
+                         random_seed=self.random_seeds[0],
+                         batch_size=batch_size)
+
+    def _initialize_weights(self):
+        """
+        Inicializa os pesos de cada membro exatamente como um MLP com a
+        mesma seed, empilhando-os no eixo 0
+        """
+        layer_sizes = [self.input_size] + self.hidden_sizes + [self.output_size]
+        n_layers = len(layer_sizes) - 1
+
+        self.weights = [np.empty((self.n_members, layer_sizes[i], layer_sizes[i + 1]))
+                        for i in range(n_layers)]
+        self.biases = [np.zeros((self.n_members, 1, layer_sizes[i + 1]))
+                       for i in range(n_layers)]
+
+        for m, seed in enumerate(self.random_seeds):
+            np.random.seed(seed)
+            for i in range(n_layers):
+                # Xavier initialization (mesma sequência do MLP)
+                limit = np.sqrt(6 / (layer_sizes[i] + layer_sizes[i + 1]))
+                self.weights[i][m] = np.random.uniform(
+                    -limit, limit, (layer_sizes[i], layer_sizes[i + 1])
+                )
+
+    def softmax(self, x):
+        """
+        Softmax no último eixo (suporta lotes 3-D)
+        """
+        exp_x = np.exp(x - np.max(x, axis=-1, keepdims=True))
+        return exp_x / np.sum(exp_x, axis=-1, keepdims=True)
+
+    def forward_propagation(self, X):
+        """
+        Forward pass de todos os membros
+
+        Args:
+            X: Input (n, input_size) compartilhado ou (M, n, input_size)
+
+        Returns:
+            activations: Lista de ativações (M, n, units) de cada camada
+            z_values: Lista de valores pré-ativação
+        """
+        activations = [X]
+        z_values = []
+
+        current_activation = X
+
+        for i in range(len(self.weights)):
+            # (M, n, fan_in) @ (M, fan_in, fan_out) -> (M, n, fan_out)
+            z = np.matmul(current_activation, self.weights[i]) + self.biases[i]
+            z_values.append(z)
+
+            if i < len(self.weights) - 1:
+                activation = self.apply_activation(z)
+            else:
+                activation = self.softmax(z)
+
+            activations.append(activation)
+            current_activation = activation
+
+        return activations, z_values
+
+    def backward_propagation(self, X, y, activations, z_values):
+        """
+        Backward pass em lote para todos os membros
+
+        Args:
+            X: Input (M, n, input_size)
+            y: Labels one-hot (M, n, n_classes)
+            activations: Ativações do forward pass
+            z_values: Valores pré-ativação
+
+        Returns:
+            gradients_w: Gradientes dos pesos (M, fan_in, fan_out)
+            gradients_b: Gradientes dos biases (M, 1, fan_out)
+        """
+        m = X.shape[-2]
+        n_layers = len(self.weights)
+
+        gradients_w = [None] * n_layers
+        gradients_b = [None] * n_layers
+
+        delta = activations[-1] - y
+
+        for i in reversed(range(n_layers)):
+            gradients_w[i] = np.matmul(activations[i].transpose(0, 2, 1), delta) / m
+            gradients_b[i] = np.sum(delta, axis=1, keepdims=True) / m
+
+            if i > 0:
+                delta = (np.matmul(delta, self.weights[i].transpose(0, 2, 1))
+                         * self.apply_activation_derivative(z_values[i - 1]))
+
+        return gradients_w, gradients_b
+
+    def fit(self, X, y):
+        """
+        Treina todos os membros simultaneamente
+
+        Args:
+            X: Features (n_samples, n_features)
+            y: Labels (n_samples,)
+        """
+        self._set_classes(np.unique(y))
+        return self._fit_targets(X, self._one_hot(y))
+
+    def _fit_targets(self, X, targets, warm_start=False):
+        """
+        Loop de treinamento em lote de todos os membros
+
+        Args:
+            X: Features (n_samples, n_features)
+            targets: Labels one-hot (n_samples, n_classes)
+            warm_start: Se True, continua os geradores e o loss_history
+                anteriores (partial_fit)
+        """
+        n_samples = X.shape[0]
+        batch_size = self.batch_size or n_samples
+        lr = self.learning_rates[:, None, None]
+
+        # Um gerador por membro: cada rede vê sua própria ordem dos dados
+        if not warm_start or not hasattr(self, '_rngs'):
+            self._rngs = [np.random.RandomState(seed) for seed in self.random_seeds]
+        loss_history = []
+
+        for epoch in range(self.n_epochs):
+            # (M, n_samples): permutação independente por membro
+            order = np.stack([rng.permutation(n_samples) for rng in self._rngs])
+
+            epoch_loss = np.zeros(self.n_members)
+            n_batches = 0
+
+            for i in range(0, n_samples, batch_size):
+                batch_idx = order[:, i:i + batch_size]
+                X_batch = X[batch_idx]
+                y_batch = targets[batch_idx]
+
+                activations, z_values = self.forward_propagation(X_batch)
+                gradients_w, gradients_b = self.backward_propagation(
+                    X_batch, y_batch, activations, z_values
+                )
+
+                for j in range(len(self.weights)):
+                    self.weights[j] -= lr * gradients_w[j]
+                    self.biases[j] -= lr * gradients_b[j]
+
+                # Cross-entropy por membro
+                predictions = activations[-1]
+                epoch_loss += -np.mean(
+                    np.sum(y_batch * np.log(predictions + 1e-8), axis=2), axis=1
+                )
+                n_batches += 1
+
+            loss_history.append(epoch_loss / n_batches)
+
+        # (n_epochs, M)
+        loss_history = np.array(loss_history).reshape(-1, self.n_members)
+        if warm_start and len(self.loss_history):
+            loss_history = np.concatenate([self.loss_history, loss_history])
+        self.loss_history = loss_history
+
+        return self
+
+    def predict_proba(self, X):
+        """
+        Prediz probabilidades de cada membro
+
+        Args:
+            X: Features
+
+        Returns:
+            Array (M, n_samples, n_classes)
+        """
+        activations, _ = self.forward_propagation(X)
+        return activations[-1]
+
+    def predict(self, X):
+        """
+        Prediz classes de cada membro
+
+        Args:
+            X: Features
+
+        Returns:
+            Array (M, n_samples) de predições
+        """
+        class_indices = np.argmax(self.predict_proba(X), axis=-1)
+        return np.take(self.classes_, class_indices)
+
+    def predict_mean(self, X):
+        """
+        Predição por média das probabilidades dos membros (seed averaging)
+
+        Args:
+            X: Features
+
+        Returns:
+            Array de predições
+        """
+        mean_proba = np.mean(self.predict_proba(X), axis=0)
+        return np.take(self.classes_, np.argmax(mean_proba, axis=1))
+
+    def score(self, X, y):
+        """
+        Calcula acurácia de cada membro
+
+        Args:
+            X: Features
+            y: Labels verdadeiros
+
+        Returns:
+            Array (M,) de acurácias
+        """
+        return np.mean(self.predict(X) == y, axis=1)
+
+    def get_member(self, index):
+        """
+        Extrai um membro como um MLP independente
+
+        Args:
+            index: Índice do membro
+
+        Returns:
+            MLP com os pesos do membro
+        """
+        mlp = MLP(self.input_size, hidden_sizes=self.hidden_sizes,
+                  output_size=self.output_size,
+                  learning_rate=float(self.learning_rates[index]),
+                  n_epochs=self.n_epochs, activation=self.activation,
+                  random_seed=self.random_seeds[index],
+                  batch_size=self.batch_size)
+        mlp.weights = [W[index].copy() for W in self.weights]
+        mlp.biases = [b[index].copy() for b in self.biases]
+        if hasattr(self, 'classes_'):
+            mlp.classes_ = self.classes_
+            mlp.n_classes = self.n_classes
+            mlp.loss_history = list(self.loss_history[:, index])
+        return mlp
+
+    def get_params(self):
+        """Retorna parâmetros do modelo"""
+        params = super().get_params()
+        del params['learning_rate']
+        del params['random_seed']
+        params['learning_rates'] = list(self.learning_rates)
+        params['random_seeds'] = list(self.random_seeds)
+        return params
+
+    def set_params(self, **params):
+        """
+        Define parâmetros do modelo
+
+        learning_rates e random_seeds são validados como no construtor;
+        novas seeds reinicializam os pesos de todos os membros.
+        """
+        if 'random_seeds' in params:
+            self.random_seeds = list(params.pop('random_seeds'))
+            self.n_members = len(self.random_seeds)
+            params['random_seed'] = self.random_seeds[0]
+        if 'learning_rates' in params or len(self.learning_rates) != self.n_members:
+            learning_rates = np.atleast_1d(np.asarray(
+                params.pop('learning_rates', self.learning_rates), dtype=float))
+            if len(learning_rates) == 1:
+                learning_rates = np.full(self.n_members, learning_rates[0])
+            if len(learning_rates) != self.n_members:
+                raise ValueError("learning_rates deve ter um valor por membro do ensemble")
+            self.learning_rates = learning_rates
+            params['learning_rate'] = learning_rates[0]
+        return super().set_params(**params)
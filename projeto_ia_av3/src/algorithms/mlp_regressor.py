@@ -0,0 +1,264 @@
+"""
+MLP para regressão multi-saída
+Reaproveita o forward/backward do MLP com saída linear e loss MSE
+SEM uso de frameworks de deep learning
+"""
+import numpy as np
+
+from .mlp import MLP, FrozenMLP
+
+
+def _r2_score(y, y_pred):
+    """R² médio entre os alvos"""
+    Y = np.asarray(y, dtype=float).reshape(len(y), -1)
+    Y_pred = np.asarray(y_pred, dtype=float).reshape(len(y), -1)
+
+    ss_res = np.sum((Y - Y_pred) ** 2, axis=0)
+    ss_tot = np.sum((Y - Y.mean(axis=0)) ** 2, axis=0)
+    r2 = np.where(ss_tot > 0, 1 - ss_res / np.where(ss_tot > 0, ss_tot, 1), 0.0)
+    return np.mean(r2)
+
+
+class MLPRegressor(MLP):
+    """
+    Rede MLP para regressão com múltiplas saídas
+
+    Camada de saída linear, loss MSE e normalização Z-Score por alvo
+    (os alvos são padronizados no treino e revertidos na predição).
+    """
+
+    # fit só aceita arrays (Datasets são ajustados via partial_fit)
+    accepts_dataset = False
+    # Alvo contínuo: fit_dataset não calcula as classes
+    is_regressor = True
+
+    def __init__(self, input_size, hidden_sizes=[64], output_size=1,
+                 learning_rate=0.01, n_epochs=100, activation='relu',
+                 random_seed=42, batch_size=32, scale_targets=True):
+        """
+        Inicializa o regressor
+
+        Args:
+            input_size: Número de features de entrada
+            hidden_sizes: Lista com tamanhos das camadas ocultas
+            output_size: Número de variáveis alvo
+            learning_rate: Taxa de aprendizado
+            n_epochs: Número de épocas
+            activation: 'relu', 'sigmoid' ou 'tanh'
+            random_seed: Seed
+            batch_size: Tamanho do batch (None = batch completo)
+            scale_targets: Se True, padroniza cada alvo antes do treino
+        """
+        super().__init__(input_size, hidden_sizes=hidden_sizes,
+                         output_size=output_size, learning_rate=learning_rate,
+                         n_epochs=n_epochs, activation=activation,
+                         random_seed=random_seed, batch_size=batch_size)
+        self.scale_targets = scale_targets
+        self.y_mean_ = np.zeros(output_size)
+        self.y_scale_ = np.ones(output_size)
+
+    def output_activation(self, z):
+        """Saída linear"""
+        return z
+
+    def compute_loss(self, predictions, targets):
+        """
+        Loss do batch (MSE no espaço normalizado)
+
+        Args:
+            predictions: Saída da rede
+            targets: Alvos
+
+        Returns:
+            MSE médio
+        """
+        return np.mean((predictions - targets) ** 2)
+
+    def fit(self, X, y):
+        """
+        Treina o regressor
+
+        Args:
+            X: Features (n_samples, n_features)
+            y: Alvos (n_samples,) ou (n_samples, n_targets)
+        """
+        Y = self._setup_targets(y)
+        return self._fit_targets(X, (Y - self.y_mean_) / self.y_scale_)
+
+    def partial_fit(self, X, y, classes=None):
+        """
+        Continua o treinamento a partir dos pesos atuais com um novo lote
+
+        A normalização dos alvos é estimada no primeiro lote e mantida
+        nos seguintes.
+
+        Args:
+            X: Features do lote
+            y: Alvos do lote
+            classes: Ignorado (compatibilidade com os classificadores)
+        """
+        if not hasattr(self, '_single_target'):
+            Y = self._setup_targets(y)
+        else:
+            Y = np.asarray(y, dtype=float).reshape(len(y), -1)
+        return self._fit_targets(X, (Y - self.y_mean_) / self.y_scale_, warm_start=True)
+
+    def _setup_targets(self, y):
+        """
+        Ajusta a camada de saída e a normalização aos alvos
+
+        Args:
+            y: Alvos (n_samples,) ou (n_samples, n_targets)
+
+        Returns:
+            Alvos como matriz (n_samples, n_targets)
+        """
+        y = np.asarray(y, dtype=float)
+        self._single_target = y.ndim == 1
+        Y = y.reshape(len(y), -1)
+
+        if Y.shape[1] != self.output_size:
+            self.output_size = Y.shape[1]
+            self._initialize_weights()
+
+        # Normalização por alvo
+        if self.scale_targets:
+            self.y_mean_ = Y.mean(axis=0)
+            std = Y.std(axis=0)
+            self.y_scale_ = np.where(std > 0, std, 1.0)
+        else:
+            self.y_mean_ = np.zeros(self.output_size)
+            self.y_scale_ = np.ones(self.output_size)
+
+        return Y
+
+    def predict(self, X):
+        """
+        Prediz os alvos (forward sem reter ativações)
+
+        Args:
+            X: Features
+
+        Returns:
+            Array (n_samples,) ou (n_samples, n_targets)
+        """
+        out = X
+        n_layers = len(self.weights)
+        for i in range(n_layers):
+            out = np.dot(out, self.weights[i]) + self.biases[i]
+            if i < n_layers - 1:
+                out = self.apply_activation(out)
+
+        out = out * self.y_scale_ + self.y_mean_
+
+        if getattr(self, '_single_target', False):
+            return out[:, 0]
+        return out
+
+    @property
+    def predict_proba(self):
+        """Indisponível: a saída é linear, não há probabilidades"""
+        raise AttributeError("MLPRegressor não tem predict_proba (saída linear)")
+
+    def score(self, X, y):
+        """
+        Calcula R² médio entre os alvos
+
+        Args:
+            X: Features
+            y: Alvos verdadeiros
+
+        Returns:
+            R²
+        """
+        return _r2_score(y, self.predict(X))
+
+    def freeze(self, dtype=np.float32, chunk_size=4096):
+        """
+        Exporta um grafo de inferência congelado (somente predição)
+
+        Args:
+            dtype: Tipo dos pesos congelados (float32 por padrão)
+            chunk_size: Número de linhas avaliadas por bloco
+
+        Returns:
+            FrozenMLPRegressor com cópias contíguas dos pesos
+        """
+        return FrozenMLPRegressor(self.weights, self.biases, self.activation,
+                                  self.y_mean_, self.y_scale_,
+                                  getattr(self, '_single_target', False),
+                                  dtype=dtype, chunk_size=chunk_size)
+
+    def get_params(self):
+        """Retorna parâmetros do modelo"""
+        params = super().get_params()
+        params['scale_targets'] = self.scale_targets
+        return params
+
+
+class FrozenMLPRegressor(FrozenMLP):
+    """
+    Grafo de inferência congelado de um MLPRegressor
+
+    Mesmo forward em blocos do FrozenMLP, com a saída linear revertida
+    para a escala original dos alvos (sem softmax nem argmax).
+    """
+
+    def __init__(self, weights, biases, activation, y_mean, y_scale, single_target,
+                 dtype=np.float32, chunk_size=4096):
+        """
+        Inicializa o grafo congelado
+
+        Args:
+            weights: Lista de matrizes de pesos (fan_in, fan_out)
+            biases: Lista de biases (1, fan_out)
+            activation: Ativação das camadas ocultas
+            y_mean, y_scale: Normalização dos alvos
+            single_target: Se True, predict retorna (n_samples,)
+            dtype: Tipo numérico da inferência
+            chunk_size: Número de linhas avaliadas por bloco
+        """
+        super().__init__(weights, biases, activation, np.arange(len(np.ravel(y_mean))),
+                         dtype=dtype, chunk_size=chunk_size)
+        self.y_mean_ = np.asarray(y_mean, dtype=self.dtype)
+        self.y_scale_ = np.asarray(y_scale, dtype=self.dtype)
+        self.single_target = single_target
+
+    @property
+    def predict_proba(self):
+        """Indisponível: a saída é linear, não há probabilidades"""
+        raise AttributeError("FrozenMLPRegressor não tem predict_proba (saída linear)")
+
+    def predict(self, X):
+        """
+        Prediz os alvos em blocos
+
+        Args:
+            X: Features
+
+        Returns:
+            Array (n_samples,) ou (n_samples, n_targets)
+        """
+        n_samples = X.shape[0]
+        out = np.empty((n_samples, self.output_size), dtype=self.dtype)
+
+        for start in range(0, n_samples, self.chunk_size):
+            stop = min(start + self.chunk_size, n_samples)
+            out[start:stop] = self._logits_chunk(X[start:stop])
+        out *= self.y_scale_
+        out += self.y_mean_
+
+        return out[:, 0] if self.single_target else out
+
+    def score(self, X, y):
+        """
+        Calcula R² médio entre os alvos
+
+        Args:
+            X: Features
+            y: Alvos verdadeiros
+
+        Returns:
+            R²
+        """
+        return _r2_score(y, self.predict(X))
@@ -13,6 +13,13 @@ class GaussianNaiveBayes:
     Assume que as features seguem distribuição normal
     """
 
+    # As duas variantes usam as mesmas estatísticas por classe: a busca de
+    # hiperparâmetros treina uma vez e troca apenas a variante
+    shared_search_param = 'variant'
+
+    # partial_fit exato (ver learning_curve em utils.model_selection)
+    exact_partial_fit = True
+
     def __init__(self, variant='multivariate'):
         """
         Inicializa Naive Bayes
@@ -84,26 +91,80 @@ class GaussianNaiveBayes:
             X: Features (n_samples, n_features)
             y: Labels (n_samples,)
         """
-        self.classes = np.unique(y)
-        n_samples, n_features = X.shape
+        self.classes = None
+        self.class_priors = {}
+        self.class_means = {}
+        self.class_stds = {}
+        self.class_covariances = {}
+        self._class_counts = {}
+        self._class_scatter = {}
 
-        # Para cada classe
-        for cls in self.classes:
-            # Filtra amostras da classe
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y, classes=None):
+        """
+        Atualiza as estatísticas com um novo lote (treino incremental)
+
+        Mantém, por classe, contagem, média e matriz de dispersão
+        (soma dos produtos dos desvios), combinadas entre lotes pela
+        fórmula de Chan et al. O resultado é o mesmo de fit() com todos os
+        lotes concatenados.
+
+        Args:
+            X: Features do lote (n_samples, n_features)
+            y: Labels do lote (n_samples,)
+            classes: Aceito por compatibilidade com os demais modelos; as
+                classes passam a existir quando têm amostras
+        """
+        if self.classes is None:
+            self._class_counts = {}
+            self._class_scatter = {}
+
+        for cls in np.unique(y):
             X_cls = X[y == cls]
+            n_b = len(X_cls)
+            mean_b = np.mean(X_cls, axis=0)
+            centered = X_cls - mean_b
+            scatter_b = np.dot(centered.T, centered)
+
+            n_a = self._class_counts.get(cls, 0)
+            if n_a == 0:
+                self._class_counts[cls] = n_b
+                self.class_means[cls] = mean_b
+                self._class_scatter[cls] = scatter_b
+                continue
+
+            # Combina (n_a, média_a, M2_a) com (n_b, média_b, M2_b)
+            n = n_a + n_b
+            delta = mean_b - self.class_means[cls]
+            self.class_means[cls] = self.class_means[cls] + delta * (n_b / n)
+            self._class_scatter[cls] = (self._class_scatter[cls] + scatter_b
+                                        + np.outer(delta, delta) * (n_a * n_b / n))
+            self._class_counts[cls] = n
+
+        self.classes = np.array(sorted(self._class_counts))
+        self._update_parameters()
+        return self
+
+    def _update_parameters(self):
+        """
+        Recalcula priors, desvios e covariâncias a partir das estatísticas
+        """
+        n_total = sum(self._class_counts.values())
+        n_features = len(next(iter(self.class_means.values())))
 
+        for cls, n_cls in self._class_counts.items():
             # Calcula probabilidade a priori
-            self.class_priors[cls] = len(X_cls) / n_samples
+            self.class_priors[cls] = n_cls / n_total
 
-            # Calcula estatísticas
-            self.class_means[cls] = np.mean(X_cls, axis=0)
-            self.class_stds[cls] = np.std(X_cls, axis=0) + 1e-10  # Evita divisão por zero
+            # Desvio padrão populacional (ddof=0), como np.std
+            variances = np.diag(self._class_scatter[cls]) / n_cls
+            self.class_stds[cls] = np.sqrt(variances) + 1e-10  # Evita divisão por zero
 
-            # Para versão multivariada, calcula matriz de covariância
+            # Para versão multivariada, covariância amostral (ddof=1), como np.cov
             if self.variant == 'multivariate':
-                self.class_covariances[cls] = np.cov(X_cls.T) + np.eye(n_features) * 1e-6
-
-        return self
+                self.class_covariances[cls] = (self._class_scatter[cls] / max(n_cls - 1, 1)
+                                               + np.eye(n_features) * 1e-6)
 
     def predict_log_proba_univariate(self, x):
         """
@@ -243,6 +304,14 @@ class GaussianNaiveBayes:
             'variant': self.variant
         }
 
+    def set_params(self, **params):
+        """
+        Define parâmetros do modelo
+        """
+        for key, value in params.items():
+            setattr(self, key, value)
+        return self
+
 
 # Aliases para facilitar uso
 class UnivariateNaiveBayes(GaussianNaiveBayes):
@@ -65,26 +65,62 @@ class Perceptron:
             X: Features de treino (n_samples, n_features)
             y: Labels de treino (n_samples,)
         """
-        n_samples, n_features = X.shape
+        # Inicializa pesos, bias e mapeamento de labels
+        self._initialize(X.shape[1], np.unique(y))
+        self.errors_per_epoch = []
 
-        # Inicializa pesos e bias
+        return self._run_epochs(X, y)
+
+    def partial_fit(self, X, y, classes=None):
+        """
+        Continua o treinamento a partir dos pesos atuais com um novo lote
+
+        Na primeira chamada inicializa os pesos como fit(); as seguintes
+        executam n_epochs épocas apenas sobre o lote recebido.
+
+        Args:
+            X: Features do lote (n_samples, n_features)
+            y: Labels do lote (n_samples,)
+            classes: As duas classes do problema (necessário se o primeiro
+                lote tiver uma única classe)
+        """
+        if self.weights is None:
+            self._initialize(X.shape[1], np.unique(y) if classes is None else classes)
+        return self._run_epochs(X, y)
+
+    def _initialize(self, n_features, labels):
+        """
+        Inicializa pesos, bias e o mapeamento das labels para 0 e 1
+
+        Args:
+            n_features: Número de features
+            labels: Labels distintas do problema
+        """
         np.random.seed(self.random_seed)
         self.weights = np.random.randn(n_features) * 0.01
         self.bias = 0.0
 
         # Converte labels para 0 e 1 se necessário
-        unique_labels = np.unique(y)
+        unique_labels = np.unique(labels)
         if len(unique_labels) > 2:
             raise ValueError("Perceptron suporta apenas classificação binária")
 
         # Mapeia labels para 0 e 1
         self.label_map = {unique_labels[0]: 0, unique_labels[1]: 1}
         self.inverse_label_map = {0: unique_labels[0], 1: unique_labels[1]}
+
+    def _run_epochs(self, X, y):
+        """
+        Épocas da regra do perceptron a partir dos pesos atuais
+
+        Args:
+            X: Features (n_samples, n_features)
+            y: Labels originais (n_samples,)
+        """
+        n_samples = X.shape[0]
         y_binary = np.array([self.label_map[label] for label in y])
 
         # Treinamento por épocas
-        self.errors_per_epoch = []
-
         for epoch in range(self.n_epochs):
             errors = 0
 
@@ -158,6 +194,14 @@ class Perceptron:
             'random_seed': self.random_seed
         }
 
+    def set_params(self, **params):
+        """
+        Define parâmetros do modelo
+        """
+        for key, value in params.items():
+            setattr(self, key, value)
+        return self
+
 
 class MultiClassPerceptron:
     """
@@ -188,28 +232,51 @@ class MultiClassPerceptron:
             X: Features
             y: Labels
         """
-        self.classes = np.unique(y)
+        self.classes = None
+        self.classifiers = {}
+
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y, classes=None):
+        """
+        Continua o treinamento One-vs-Rest com um novo lote
+
+        Cada perceptron binário é criado na primeira vez em que sua classe
+        é conhecida e, depois, apenas continua a partir dos pesos atuais.
+
+        Args:
+            X: Features do lote
+            y: Labels do lote
+            classes: Todas as classes do problema (opcional)
+        """
+        batch_classes = np.unique(y) if classes is None else np.unique(classes)
+        if self.classes is None:
+            self.classes = batch_classes
+        else:
+            self.classes = np.union1d(self.classes, batch_classes)
+
+        n_samples, n_features = X.shape
 
         # Treina um perceptron para cada classe
         for cls in self.classes:
             # Cria labels binárias: 1 se pertence à classe, 0 caso contrário
             y_binary = (y == cls).astype(int)
 
-            # Treina perceptron binário
-            perceptron = Perceptron(
-                learning_rate=self.learning_rate,
-                n_epochs=self.n_epochs,
-                random_seed=self.random_seed
-            )
+            perceptron = self.classifiers.get(cls)
+            if perceptron is None:
+                perceptron = Perceptron(
+                    learning_rate=self.learning_rate,
+                    n_epochs=self.n_epochs,
+                    random_seed=self.random_seed
+                )
 
-            # Hack para fazer funcionar com labels 0 e 1
-            perceptron.label_map = {0: 0, 1: 1}
-            perceptron.inverse_label_map = {0: 0, 1: 1}
+                # Hack para fazer funcionar com labels 0 e 1
+                perceptron.label_map = {0: 0, 1: 1}
+                perceptron.inverse_label_map = {0: 0, 1: 1}
 
-            n_samples, n_features = X.shape
-            np.random.seed(self.random_seed)
-            perceptron.weights = np.random.randn(n_features) * 0.01
-            perceptron.bias = 0.0
+                np.random.seed(self.random_seed)
+                perceptron.weights = np.random.randn(n_features) * 0.01
+                perceptron.bias = 0.0
 
             # Treina
             for epoch in range(self.n_epochs):
@@ -255,3 +322,21 @@ class MultiClassPerceptron:
             predictions.append(predicted_class)
 
         return np.array(predictions)
+
+    def get_params(self):
+        """
+        Retorna parâmetros do modelo
+        """
+        return {
+            'learning_rate': self.learning_rate,
+            'n_epochs': self.n_epochs,
+            'random_seed': self.random_seed
+        }
+
+    def set_params(self, **params):
+        """
+        Define parâmetros do modelo
+        """
+        for key, value in params.items():
+            setattr(self, key, value)
+        return self
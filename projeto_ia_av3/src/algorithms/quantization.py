@@ -0,0 +1,362 @@
+"""
+Compressão pós-treinamento para inferência
+Quantização int8 simétrica por canal e poda por magnitude
+SEM uso de frameworks de deep learning
+"""
+import time
+
+import numpy as np
+
+from .mlp import MLP, FrozenMLP
+from .mlp_ensemble import MLPEnsemble
+from .mlp_regressor import MLPRegressor
+from .perceptron import MultiClassPerceptron
+
+
+def magnitude_prune(W, sparsity):
+    """
+    Zera os pesos de menor magnitude
+
+    Args:
+        W: Matriz de pesos
+        sparsity: Fração de pesos a zerar (0 a 1)
+
+    Returns:
+        Cópia de W com os menores |w| zerados
+    """
+    W = np.array(W, dtype=float)
+    n_prune = int(round(sparsity * W.size))
+    if n_prune <= 0:
+        return W
+
+    flat = np.abs(W).ravel()
+    prune_idx = np.argpartition(flat, n_prune - 1)[:n_prune]
+    W.ravel()[prune_idx] = 0.0
+    return W
+
+
+def quantize_per_channel(W):
+    """
+    Quantização int8 simétrica por canal de saída (coluna)
+
+    Args:
+        W: Matriz de pesos (fan_in, fan_out)
+
+    Returns:
+        W_q: Pesos int8
+        scales: Escala float32 por coluna (W ≈ W_q * scales)
+    """
+    max_abs = np.max(np.abs(W), axis=0)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    W_q = np.clip(np.round(W / scales), -127, 127).astype(np.int8)
+    return W_q, scales
+
+
+def quantize_rows(X):
+    """
+    Quantização dinâmica int8 simétrica por linha (amostra)
+
+    Args:
+        X: Ativações (n_samples, n_features)
+
+    Returns:
+        X_q: Ativações int8
+        scales: Escala float32 por linha
+    """
+    max_abs = np.max(np.abs(X), axis=1)
+    scales = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    X_q = np.clip(np.round(X / scales[:, None]), -127, 127).astype(np.int8)
+    return X_q, scales
+
+
+class QuantizedLinear:
+    """
+    Camada linear com pesos int8 (opcionalmente podados)
+
+    Pesos podados são armazenados em formato compacto: uma máscara de bits
+    (np.packbits) indicando as posições não nulas e apenas os valores int8
+    não nulos. A matriz densa é reconstruída a cada inferência e
+    descartada em seguida: só o formato compacto fica na memória.
+    """
+
+    def __init__(self, W, b, sparsity=0.0):
+        """
+        Inicializa a camada quantizada
+
+        Args:
+            W: Pesos float (fan_in, fan_out)
+            b: Bias float (fan_out,) ou (1, fan_out)
+            sparsity: Fração de pesos a podar antes de quantizar
+        """
+        if sparsity > 0:
+            W = magnitude_prune(W, sparsity)
+
+        W_q, self.scales = quantize_per_channel(W)
+        self.shape = W_q.shape
+        self.bias = np.ravel(b).astype(np.float32)
+        self.sparse = sparsity > 0
+
+        if self.sparse:
+            mask = W_q != 0
+            self.mask_bits = np.packbits(mask.ravel())
+            self.values = W_q[mask]
+            self._W_q = None
+        else:
+            self._W_q = W_q
+
+    def _dense(self, dtype):
+        """Matriz densa (temporária, se a camada for esparsa)"""
+        if not self.sparse:
+            return self._W_q.astype(dtype)
+        mask = np.unpackbits(self.mask_bits, count=self.shape[0] * self.shape[1])
+        W = np.zeros(self.shape, dtype=dtype)
+        W[mask.reshape(self.shape).view(bool)] = self.values
+        return W
+
+    @property
+    def W_q(self):
+        """Matriz densa int8 (reconstruída a partir do formato compacto, sem cache)"""
+        return self._W_q if not self.sparse else self._dense(np.int8)
+
+    @property
+    def nbytes(self):
+        """Tamanho armazenado (bytes)"""
+        stored = self.mask_bits.nbytes + self.values.nbytes if self.sparse else self._W_q.nbytes
+        return stored + self.scales.nbytes + self.bias.nbytes
+
+    def forward(self, X):
+        """
+        Produto com acumulação inteira (int8 x int8 -> int32)
+
+        Args:
+            X: Entrada float (n_samples, fan_in)
+
+        Returns:
+            Saída float32 (n_samples, fan_out)
+        """
+        X_q, x_scales = quantize_rows(X)
+        acc = np.matmul(X_q.astype(np.int32), self._dense(np.int32))
+        out = acc.astype(np.float32)
+        out *= x_scales[:, None]
+        out *= self.scales
+        out += self.bias
+        return out
+
+
+class QuantizedMLP:
+    """
+    MLP comprimido para inferência (int8 + poda opcional)
+    """
+
+    def __init__(self, mlp, sparsity=0.0):
+        """
+        Quantiza um MLP treinado
+
+        Args:
+            mlp: Instância de MLP já treinada
+            sparsity: Fração de pesos a podar em cada camada
+        """
+        self.layers = [QuantizedLinear(W, b, sparsity)
+                       for W, b in zip(mlp.weights, mlp.biases)]
+        self.classes_ = getattr(mlp, 'classes_', np.arange(mlp.output_size))
+        self.sparsity = sparsity
+        self._activation_fn = FrozenMLP._resolve_activation(mlp.activation)
+
+    def _logits(self, X):
+        """Forward pass quantizado (sem reter ativações)"""
+        current = X
+        for i, layer in enumerate(self.layers):
+            current = layer.forward(current)
+            if i < len(self.layers) - 1:
+                self._activation_fn(current)
+        return current
+
+    def predict_proba(self, X):
+        """
+        Prediz probabilidades
+
+        Args:
+            X: Features
+
+        Returns:
+            Probabilidades de cada classe
+        """
+        logits = self._logits(X)
+        logits -= logits.max(axis=1, keepdims=True)
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=1, keepdims=True)
+        return logits
+
+    def predict(self, X):
+        """
+        Prediz classes
+
+        Args:
+            X: Features
+
+        Returns:
+            Array de predições
+        """
+        return np.take(self.classes_, np.argmax(self._logits(X), axis=1))
+
+    def score(self, X, y):
+        """Calcula acurácia"""
+        return np.mean(self.predict(X) == y)
+
+    @property
+    def nbytes(self):
+        """Tamanho armazenado (bytes)"""
+        return sum(layer.nbytes for layer in self.layers)
+
+
+class QuantizedPerceptron:
+    """
+    MultiClassPerceptron (One-vs-Rest) comprimido para inferência
+
+    Os vetores de pesos dos classificadores binários são empilhados em
+    uma matriz (n_features, n_classes) e quantizados por classe.
+    """
+
+    def __init__(self, model, sparsity=0.0):
+        """
+        Quantiza um MultiClassPerceptron treinado
+
+        Args:
+            model: Instância de MultiClassPerceptron já treinada
+            sparsity: Fração de pesos a podar
+        """
+        self.classes_ = np.array(list(model.classifiers.keys()))
+        W = np.column_stack([p.weights for p in model.classifiers.values()])
+        b = np.array([p.bias for p in model.classifiers.values()])
+        self.layer = QuantizedLinear(W, b, sparsity)
+        self.sparsity = sparsity
+
+    def predict(self, X):
+        """
+        Prediz classe com maior score
+
+        Args:
+            X: Features
+
+        Returns:
+            Predições
+        """
+        return np.take(self.classes_, np.argmax(self.layer.forward(X), axis=1))
+
+    def score(self, X, y):
+        """Calcula acurácia"""
+        return np.mean(self.predict(X) == y)
+
+    @property
+    def nbytes(self):
+        """Tamanho armazenado (bytes)"""
+        return self.layer.nbytes
+
+
+def _check_supported(model):
+    """Rejeita modelos que as versões comprimidas não reproduzem"""
+    # Subclasses de MLP com outra saída: pesos empilhados por membro ou
+    # saída linear (QuantizedMLP aplica softmax e argmax sobre classes_)
+    if isinstance(model, MLPEnsemble):
+        raise ValueError("MLPEnsemble não suportado: quantize cada membro (get_member) separadamente")
+    if isinstance(model, MLPRegressor):
+        raise ValueError("MLPRegressor não suportado: a compressão é só para classificadores")
+    if not isinstance(model, (MLP, MultiClassPerceptron)):
+        raise ValueError(f"Modelo {type(model).__name__} não suportado")
+
+
+def quantize_model(model, sparsity=0.0):
+    """
+    Comprime um modelo treinado
+
+    Args:
+        model: MLP ou MultiClassPerceptron treinado
+        sparsity: Fração de pesos a podar (0 = sem poda)
+
+    Returns:
+        QuantizedMLP ou QuantizedPerceptron
+    """
+    _check_supported(model)
+    if isinstance(model, MLP):
+        return QuantizedMLP(model, sparsity)
+    return QuantizedPerceptron(model, sparsity)
+
+
+def _float_nbytes(model):
+    """Tamanho dos pesos float64 do modelo original (bytes)"""
+    if isinstance(model, MLP):
+        return (sum(W.nbytes for W in model.weights)
+                + sum(b.nbytes for b in model.biases))
+    return sum(np.asarray(p.weights).nbytes + np.asarray(p.bias).nbytes
+               for p in model.classifiers.values())
+
+
+def _latency(predict_fn, X, n_repeats):
+    """Menor tempo de predição (s) entre n_repeats execuções"""
+    best = np.inf
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        predict_fn(X)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compression_report(model, X_val, y_val, sparsities=(0.0, 0.5, 0.8), n_repeats=3):
+    """
+    Compara o modelo float64 com versões comprimidas em um fold separado
+
+    Args:
+        model: MLP ou MultiClassPerceptron treinado
+        X_val: Features de validação (não usadas no treino)
+        y_val: Labels de validação
+        sparsities: Níveis de poda a avaliar
+        n_repeats: Repetições para medir latência
+
+    Returns:
+        Lista de dicts (uma linha por variante) com tamanho, latência,
+        acurácia e queda de acurácia
+    """
+    _check_supported(model)
+    base_acc = np.mean(model.predict(X_val) == y_val)
+    base_size = _float_nbytes(model)
+    rows = [{
+        'variant': 'float64',
+        'size_bytes': base_size,
+        'compression': 1.0,
+        'latency_s': _latency(model.predict, X_val, n_repeats),
+        'accuracy': base_acc,
+        'accuracy_drop': 0.0,
+    }]
+
+    for sparsity in sparsities:
+        compressed = quantize_model(model, sparsity)
+        acc = compressed.score(X_val, y_val)
+        rows.append({
+            'variant': f'int8 (poda {sparsity:.0%})',
+            'size_bytes': compressed.nbytes,
+            'compression': base_size / compressed.nbytes,
+            'latency_s': _latency(compressed.predict, X_val, n_repeats),
+            'accuracy': acc,
+            'accuracy_drop': base_acc - acc,
+        })
+
+    return rows
+
+
+def format_compression_report(rows):
+    """
+    Formata o relatório de compressão como tabela Markdown
+
+    Args:
+        rows: Saída de compression_report
+
+    Returns:
+        String com a tabela
+    """
+    table = "| Variante | Tamanho (KB) | Compressão | Latência (ms) | Acurácia | Queda |\n"
+    table += "|----------|--------------|------------|---------------|----------|-------|\n"
+    for row in rows:
+        table += (f"| {row['variant']} | {row['size_bytes'] / 1024:.1f} | "
+                  f"{row['compression']:.1f}x | {row['latency_s'] * 1000:.2f} | "
+                  f"{row['accuracy']:.4f} | {row['accuracy_drop']:+.4f} |\n")
+    return table
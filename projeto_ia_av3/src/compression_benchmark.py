@@ -0,0 +1,121 @@
+"""
+Benchmark de compressão pós-treinamento (int8 + poda)
+Compara tamanho, latência e acurácia do MLP e do Perceptron float64 com
+as versões quantizadas, em um fold de validação não usado no treino
+"""
+import os
+import sys
+
+import numpy as np
+
+# Adiciona src ao path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from algorithms.mlp import MLP
+from algorithms.perceptron import MultiClassPerceptron
+from algorithms.quantization import compression_report, format_compression_report
+from utils.cross_validation import FoldPlan
+from utils.data_loader import load_csv_manual
+from utils.preprocessing import StandardScaler, binarize_target
+
+
+def make_classification(n_samples=5000, n_features=20, random_seed=42):
+    """
+    Dataset sintético binário (usado quando o dataset do projeto não existe)
+
+    Args:
+        n_samples: Número de amostras
+        n_features: Número de features
+        random_seed: Seed
+
+    Returns:
+        X, y (binário)
+    """
+    rng = np.random.default_rng(random_seed)
+    X = rng.standard_normal((n_samples, n_features))
+    score = X @ rng.standard_normal(n_features) + 0.5 * rng.standard_normal(n_samples)
+    return X, (score > 0).astype(int)
+
+
+def build_models(n_features):
+    """
+    Modelos comprimíveis treinados no benchmark
+
+    Args:
+        n_features: Número de features de entrada
+
+    Returns:
+        Dict {nome: modelo não treinado}
+    """
+    return {
+        'MLP': MLP(input_size=n_features, hidden_sizes=[64, 32], output_size=2,
+                   learning_rate=0.01, n_epochs=50, activation='relu', batch_size=64),
+        'Perceptron': MultiClassPerceptron(learning_rate=0.01, n_epochs=50),
+    }
+
+
+def run_benchmark(X, y, sparsities=(0.0, 0.5, 0.8), n_repeats=5):
+    """
+    Treina cada modelo no treino do fold 0 e compara as versões comprimidas
+    na validação do mesmo fold
+
+    Args:
+        X: Features
+        y: Labels
+        sparsities: Níveis de poda a avaliar
+        n_repeats: Repetições para medir latência
+
+    Returns:
+        Dict {nome: linhas de compression_report}
+    """
+    train_idx, val_idx = FoldPlan(y, n_folds=5, stratified=True).indices(0)
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X[train_idx])
+    X_val = scaler.transform(X[val_idx])
+
+    reports = {}
+    for name, model in build_models(X.shape[1]).items():
+        model.fit(X_train, y[train_idx])
+        reports[name] = compression_report(model, X_val, y[val_idx],
+                                           sparsities=sparsities, n_repeats=n_repeats)
+    return reports
+
+
+def print_benchmark(title, X, y):
+    """
+    Executa e imprime o benchmark de um dataset
+
+    Args:
+        title: Nome do dataset
+        X: Features
+        y: Labels
+    """
+    print(f"\n{title} ({X.shape[0]} amostras, {X.shape[1]} features)")
+    for name, rows in run_benchmark(X, y).items():
+        print(f"\n{name}")
+        print(format_compression_report(rows))
+
+
+def main():
+    """
+    Executa o benchmark no dataset do projeto ou, na falta dele, em dados
+    sintéticos
+    """
+    print("=" * 80)
+    print("BENCHMARK DE COMPRESSÃO - MLP e Perceptron")
+    print("=" * 80)
+
+    filepath = os.path.join(os.path.dirname(__file__), '..', 'data', 'raw',
+                            'appliances_energy.csv')
+    if os.path.exists(filepath):
+        data, _ = load_csv_manual(filepath)
+        print_benchmark("Appliances Energy", data[:, :-1], binarize_target(data[:, -1]))
+    else:
+        print("Dataset do projeto não encontrado (python src/download_dataset.py)")
+        X, y = make_classification()
+        print_benchmark("Dados sintéticos", X, y)
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    main()
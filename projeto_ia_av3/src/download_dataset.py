@@ -4,10 +4,10 @@ Appliances Energy Prediction (ID: 46283)
 """
 import urllib.request
 import urllib.error
-import csv
-import numpy as np
 import os
 
+from utils.data_loader import read_numeric_csv
+
 
 def download_appliances_energy_dataset(output_dir='data/raw'):
     """
@@ -106,25 +106,15 @@ def load_and_verify_dataset(filepath):
     """
     print("\nVerificando dataset...")
 
-    data = []
-    with open(filepath, 'r') as file:
-        csv_reader = csv.reader(file)
-        header = next(csv_reader, None)
-
-        for row in csv_reader:
-            try:
-                numeric_row = [float(val) if val != '' else 0.0 for val in row]
-                data.append(numeric_row)
-            except ValueError:
-                continue
-
-    data = np.array(data)
+    data, header, n_skipped = read_numeric_csv(filepath)
 
     print(f"✓ Dataset carregado com sucesso!")
     print(f"  Shape: {data.shape}")
     print(f"  Features: {data.shape[1]}")
     print(f"  Instâncias: {data.shape[0]}")
     print(f"  Colunas: {header if header else 'N/A'}")
+    if n_skipped:
+        print(f"  Linhas malformadas ignoradas: {n_skipped}")
 
     # Verifica requisitos do projeto
     print("\n" + "=" * 60)
@@ -6,9 +6,9 @@ Disciplina: Inteligência Artificial Computacional
 Aluno: Mateus Macário
 """
 import numpy as np
+import argparse
 import os
 import sys
-import csv
 import time
 
 # Adiciona src ao path
@@ -22,10 +22,18 @@ from algorithms.naive_bayes import UnivariateNaiveBayes, MultivariateNaiveBayes
 
 # Imports dos utilitários
 from utils.preprocessing import StandardScaler, binarize_target
-from utils.cross_validation import cross_validate_stratified
+from utils.data_loader import load_dataset_cached
+from utils.column_store import column_store_for_csv
+from utils.dataset import Dataset
+from utils.metrics import evaluate_stream
+from utils.cross_validation import FoldPlan
+from utils.pipeline import Pipeline
+from utils.scheduler import run_experiments
+from utils.result_cache import ResultCache
+from utils.search import search
 from utils.visualization import (plot_metrics_comparison, plot_training_times,
                                  plot_performance_vs_time, generate_markdown_table,
-                                 generate_results_table)
+                                 generate_results_table, save_fold_metrics_jsonl)
 
 
 def load_dataset_manual(filepath):
@@ -40,24 +48,12 @@ def load_dataset_manual(filepath):
     """
     print("Carregando dataset...")
 
-    data = []
-    with open(filepath, 'r') as file:
-        csv_reader = csv.reader(file)
-        header = next(csv_reader, None)
-
-        for row in csv_reader:
-            try:
-                numeric_row = [float(val) if val != '' else 0.0 for val in row]
-                data.append(numeric_row)
-            except (ValueError, IndexError):
-                continue
-
-    data = np.array(data)
-
-    # Separa features e target
-    # Assume que última coluna é o target
-    X = data[:, :-1]
-    y = data[:, -1]
+    # Assume que última coluna é o target; a partir da segunda execução X e
+    # y vêm do cache binário (memmap) ao lado do CSV
+    X, y, info = load_dataset_cached(filepath, target_column=-1)
+    print(f"  Origem: {'cache binário (memmap)' if info['from_cache'] else 'CSV (cache criado)'}")
+    if info['n_skipped']:
+        print(f"  Linhas malformadas ignoradas: {info['n_skipped']}")
 
     print(f"  Shape X: {X.shape}")
     print(f"  Shape y: {y.shape}")
@@ -67,10 +63,95 @@ def load_dataset_manual(filepath):
     return X, y
 
 
-def main():
+def parse_args(argv=None):
+    """
+    Lê os argumentos de linha de comando
+    """
+    parser = argparse.ArgumentParser(description="Projeto IA AV3 - experimentos")
+    parser.add_argument('--jobs', type=int, default=-1,
+                        help="Processos para as tarefas (modelo, fold); -1 = todas as CPUs")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Ignora o cache de resultados e recalcula todos os folds")
+    parser.add_argument('--tune', action='store_true',
+                        help="Ajusta k do KNN e épocas/taxa do MLP por busca em grade "
+                             "antes da validação cruzada")
+    parser.add_argument('--stream', action='store_true',
+                        help="Treina e avalia em streaming (holdout), sem carregar o "
+                             "dataset na memória")
+    return parser.parse_args(argv)
+
+
+def run_streaming(filepath, test_size=0.2, random_seed=42):
+    """
+    Treino e avaliação fora da memória, para datasets maiores que a RAM
+
+    O CSV é convertido uma vez em store colunar; a partir dele os modelos
+    com memória limitada (o KNN guarda todo o treino e fica de fora) são
+    ajustados em streaming (Pipeline com Dataset) e avaliados em um
+    holdout pelo hash de cada linha, acumulando só a matriz de confusão.
+
+    Args:
+        filepath: Caminho do CSV
+        test_size: Fração das linhas no holdout
+        random_seed: Seed do split
+
+    Returns:
+        Dict {modelo: dict de métricas e tempos}
+    """
+    print("[1/3] STORE COLUNAR")
+    print("-" * 80)
+    store = column_store_for_csv(filepath)
+    print(f"  {store.path}: {store.n_rows} linhas, {len(store.columns)} colunas, "
+          f"{len(store.chunks)} blocos")
+
+    # Limiar da binarização pela mediana de uma amostra do alvo
+    dataset = Dataset.from_column_store(store, target=store.columns[-1])
+    threshold = np.median(dataset.sample_targets(random_seed=random_seed))
+    dataset = dataset.map(y_fn=lambda y: binarize_target(y, threshold))
+    train, test = dataset.split(test_size=test_size, random_seed=random_seed)
+    print(f"  Target binarizado pela mediana amostral ({threshold:.2f}); "
+          f"holdout de {test_size:.0%} das linhas")
+
+    print("\n[2/3] TREINO EM STREAMING")
+    print("-" * 80)
+    estimators = {
+        'Perceptron': MultiClassPerceptron(learning_rate=0.01, n_epochs=50),
+        'MLP': MLP(input_size=dataset.n_features, hidden_sizes=[32, 16],
+                   output_size=2, learning_rate=0.01, n_epochs=50,
+                   activation='relu', batch_size=64),
+        'Naive Bayes (Univariado)': UnivariateNaiveBayes(),
+        'Naive Bayes (Multivariado)': MultivariateNaiveBayes()
+    }
+    results = {}
+    for name, estimator in estimators.items():
+        model = Pipeline([('scaler', StandardScaler()), ('model', estimator)])
+        start = time.perf_counter()
+        model.fit(train)
+        train_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        report = evaluate_stream(model.predict, test)
+        results[name] = dict(report.as_dict(), train_time=train_time,
+                             test_time=time.perf_counter() - start)
+        print(f"  ✓ {name}: treino {train_time:.2f}s")
+
+    print("\n[3/3] RESULTADOS (HOLDOUT)")
+    print("-" * 80)
+    print(f"{'Modelo':<30} {'Acurácia':>10} {'F1':>8} {'Treino (s)':>11} {'Teste (s)':>10}")
+    for name, result in results.items():
+        print(f"{name:<30} {result['accuracy']:>10.4f} {result['f1_score']:>8.4f} "
+              f"{result['train_time']:>11.2f} {result['test_time']:>10.2f}")
+    print("=" * 80)
+    return results
+
+
+def main(args=None):
     """
     Função principal que executa todos os experimentos
     """
+    if args is None:
+        args = parse_args()
+
     print("=" * 80)
     print(" " * 20 + "PROJETO IA AV3 - CLASSIFICAÇÃO")
     print("=" * 80)
@@ -80,10 +161,6 @@ def main():
     print("=" * 80)
     print()
 
-    # ========== CARREGAMENTO DE DADOS ==========
-    print("[1/6] CARREGAMENTO DE DADOS")
-    print("-" * 80)
-
     # Define caminho do dataset
     if os.path.exists('data/raw/appliances_energy.csv'):
         filepath = 'data/raw/appliances_energy.csv'
@@ -94,6 +171,13 @@ def main():
         print("Execute: python src/download_dataset.py")
         return
 
+    if args.stream:
+        return run_streaming(filepath)
+
+    # ========== CARREGAMENTO DE DADOS ==========
+    print("[1/6] CARREGAMENTO DE DADOS")
+    print("-" * 80)
+
     X, y = load_dataset_manual(filepath)
 
     # ========== PRÉ-PROCESSAMENTO ==========
@@ -108,26 +192,27 @@ def main():
     print(f"  Classe 0: {n_class_0} amostras ({n_class_0/len(y_binary)*100:.1f}%)")
     print(f"  Classe 1: {n_class_1} amostras ({n_class_1/len(y_binary)*100:.1f}%)")
 
-    # Normaliza features
-    print("Normalizando features (Z-Score)...")
-    scaler = StandardScaler()
-    X_normalized = scaler.fit_transform(X)
-    print(f"  ✓ Normalização concluída")
+    # A normalização (Z-Score) é ajustada dentro de cada fold, pelo Pipeline
+    # de cada modelo; ajustá-la no dataset inteiro vazaria estatísticas da
+    # validação. Os modelos compartilham a cópia normalizada de cada fold.
+    print("Normalização Z-Score: ajustada no treino de cada fold (Pipeline)")
 
     # ========== DEFINIÇÃO DOS MODELOS ==========
     print("\n[3/6] DEFINIÇÃO DOS MODELOS")
     print("-" * 80)
 
-    models = {
+    estimators = {
         'KNN (Euclidiana)': KNNEuclidean(k=5),
         'KNN (Manhattan)': KNNManhattan(k=5),
         'Perceptron': MultiClassPerceptron(learning_rate=0.01, n_epochs=50),
-        'MLP': MLP(input_size=X_normalized.shape[1], hidden_sizes=[32, 16],
+        'MLP': MLP(input_size=X.shape[1], hidden_sizes=[32, 16],
                    output_size=2, learning_rate=0.01, n_epochs=50,
                    activation='relu', batch_size=64),
         'Naive Bayes (Univariado)': UnivariateNaiveBayes(),
         'Naive Bayes (Multivariado)': MultivariateNaiveBayes()
     }
+    models = {name: Pipeline([('scaler', StandardScaler()), ('model', estimator)])
+              for name, estimator in estimators.items()}
 
     print(f"Total de modelos: {len(models)}")
     for name in models.keys():
@@ -137,25 +222,57 @@ def main():
     print("\n[4/6] VALIDAÇÃO CRUZADA (K-FOLD, K=5)")
     print("-" * 80)
 
-    results = {}
     n_folds = 5
 
-    for i, (model_name, model) in enumerate(models.items(), 1):
-        print(f"\n[{i}/{len(models)}] Avaliando: {model_name}")
-        print("-" * 40)
-
-        start_time = time.time()
-
-        # Executa validação cruzada
-        cv_results = cross_validate_stratified(
-            model, X_normalized, y_binary,
-            n_folds=n_folds,
-            verbose=True
-        )
-
-        elapsed_time = time.time() - start_time
-
-        results[model_name] = cv_results
+    if args.tune:
+        # Os hiperparâmetros são escolhidos em um holdout estratificado de
+        # 20% que não entra na validação cruzada reportada: escolhê-los
+        # nos mesmos folds daria uma acurácia otimista
+        tune_idx = FoldPlan(y_binary, n_folds=5, stratified=True, random_seed=7).indices(0)[1]
+        eval_mask = np.ones(len(y_binary), dtype=bool)
+        eval_mask[tune_idx] = False
+        X_tune, y_tune = X[tune_idx], y_binary[tune_idx]
+        X, y_binary = X[eval_mask], y_binary[eval_mask]
+        print(f"Holdout de ajuste: {len(y_tune)} amostras; validação cruzada com "
+              f"{len(y_binary)}")
+
+        # Busca em grade com folds próprios no holdout (retomável pelo log)
+        search_spaces = {
+            'KNN (Euclidiana)': {'model__k': [1, 3, 5, 7, 9, 11, 15, 21]},
+            'KNN (Manhattan)': {'model__k': [1, 3, 5, 7, 9, 11, 15, 21]},
+            'MLP': {'model__n_epochs': [10, 25, 50, 100],
+                    'model__learning_rate': [0.001, 0.01, 0.1]}
+        }
+        os.makedirs('../results', exist_ok=True)
+        for name, space in search_spaces.items():
+            print(f"Ajustando {name}...")
+            tuned = search(models[name], space, X_tune, y_tune, n_folds=n_folds,
+                           n_jobs=args.jobs, log_path='../results/search_log.jsonl',
+                           verbose=False)
+            models[name].set_params(**tuned['best_params'])
+            print(f"  ✓ {tuned['best_params']} (acurácia no holdout {tuned['best_score']:.4f})")
+
+    # Plano de folds único, compartilhado por todos os modelos: cada fold é
+    # um par de slices sobre uma cópia de X contígua por fold (sem cópias)
+    fold_plan = FoldPlan(y_binary, n_folds=n_folds, stratified=True)
+    layout = fold_plan.layout(X, y_binary)
+
+    # Resultados por (modelo, fold) já calculados são reaproveitados
+    cache = ResultCache('../results/cache', enabled=not args.no_cache)
+
+    # Todas as tarefas (modelo, fold) em um único pool, maiores primeiro
+    results, stats = run_experiments(
+        models, layout.X, layout.y, layout.folds,
+        n_jobs=args.jobs,
+        cost_history_path='../results/task_costs.json',
+        verbose=True,
+        cache=cache
+    )
+    if cache.enabled:
+        print(f"  Cache: {cache.hits} tarefa(s) reaproveitada(s)")
+
+    for model_name, cv_results in results.items():
+        elapsed_time = np.sum(cv_results['train_time_all']) + np.sum(cv_results['test_time_all'])
 
         # Imprime resumo
         print(f"\nResumo {model_name}:")
@@ -164,8 +281,19 @@ def main():
         print(f"  F1-Score:  {cv_results['f1_score_mean']:.4f} ± {cv_results['f1_score_std']:.4f}")
         print(f"  Tempo Treino: {cv_results['train_time_mean']:.2f}s ± {cv_results['train_time_std']:.2f}s")
         print(f"  Tempo Teste:  {cv_results['test_time_mean']:.2f}s ± {cv_results['test_time_std']:.2f}s")
+        print(f"  Tempo CPU:    {cv_results['train_cpu_time_mean']:.2f}s treino | "
+              f"{cv_results['test_cpu_time_mean']:.2f}s teste")
+        # memory='rss': crescimento do RSS no fold, não o pico de alocações
+        print(f"  Cresc. RSS:   {cv_results['train_peak_mem_mean'] / 1024 ** 2:.1f} MB treino | "
+              f"{cv_results['test_peak_mem_mean'] / 1024 ** 2:.1f} MB teste")
+        print(f"  Vazão:        {cv_results['fit_rows_per_s_mean']:,.0f} linhas/s fit | "
+              f"{cv_results['predict_rows_per_s_mean']:,.0f} linhas/s predict")
         print(f"  Tempo Total:  {elapsed_time:.2f}s")
 
+    print(f"\nTempo de parede: {stats['wall_time']:.2f}s "
+          f"(soma dos tempos das tarefas: {stats['serial_time']:.2f}s, "
+          f"{stats['task_time_ratio']:.1f}x o tempo de parede)")
+
     # ========== GERAÇÃO DE RESULTADOS ==========
     print("\n[5/6] GERAÇÃO DE TABELAS E GRÁFICOS")
     print("-" * 80)
@@ -240,15 +368,23 @@ def main():
         f.write("=" * 80 + "\n\n")
         f.write("Dataset: Appliances Energy Prediction\n")
         f.write(f"Instâncias: {len(y_binary)}\n")
-        f.write(f"Features: {X_normalized.shape[1]}\n")
+        f.write(f"Features: {X.shape[1]}\n")
         f.write(f"Validação Cruzada: {n_folds}-fold\n\n")
         f.write(md_table)
         f.write("\n\n")
         f.write(f"Melhor Modelo (Acurácia): {best_accuracy[0]}\n")
         f.write(f"Melhor Modelo (F1-Score): {best_f1[0]}\n")
 
+    # Métricas por fold (JSON Lines) para acompanhar regressões de desempenho
+    save_fold_metrics_jsonl(results, '../results/fold_metrics.jsonl', run_info={
+        'n_samples': int(len(y_binary)),
+        'n_features': int(X.shape[1]),
+        'n_folds': n_folds,
+        'n_jobs': args.jobs
+    })
+
     print("\n✓ EXPERIMENTOS CONCLUÍDOS COM SUCESSO!")
-    print(f"✓ Resultados salvos em: results/")
+    print(f"✓ Resultados salvos em: results/ (métricas por fold: results/fold_metrics.jsonl)")
     print("=" * 80)
 
 
@@ -0,0 +1,169 @@
+"""
+Modelo surrogate do eletrolisador PEM com MLPRegressor
+Substitui a versão PyTorch de jupyter/deep-learning/modeloPreditivo.ipynb
+e compara a vazão (predições/s) com o modelo físico
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+# Adiciona src ao path
+sys.path.insert(0, os.path.dirname(__file__))
+
+from algorithms.mlp_regressor import MLPRegressor
+from utils.preprocessing import StandardScaler
+from utils.data_loader import train_test_split_manual
+from utils.metrics import r2_score, mean_squared_error
+
+# Constantes do modelo PEM (mesmas do notebook)
+FARADAY_C_MOL = 96485.3329
+R_GASES_J_MOL_K = 8.314462618
+MASSA_MOLAR_H2_KG_MOL = 0.002016
+E0 = 1.229  # V a 25 °C, 1 atm
+DENS_CORR_TROCA_A_CM2 = 1e-6
+CORRENTE_LIMITE_A_CM2 = 2.5
+RESIST_ESPEC_AREA_OHM_CM2 = 0.2
+AREA_ATIVA_CM2 = 100
+
+TARGET_NAMES = ["Tensão (V)", "Eficiência (%)", "CES (kWh/kg)"]
+
+
+def pem_physics_model(corrente, temperatura, pressao_parcial, umidade):
+    """
+    Modelo físico do eletrolisador PEM (aceita escalares ou arrays)
+
+    Args:
+        corrente: Densidade de corrente (A/cm²)
+        temperatura: Temperatura (°C)
+        pressao_parcial: Pressão (bar)
+        umidade: Umidade relativa (%)
+
+    Returns:
+        tensao_total, eficiencia, massa_h2_s, consumo_especifico
+    """
+    temp_kelvin = temperatura + 273.15
+    tensao_reversivel = E0 + (R_GASES_J_MOL_K * temp_kelvin / (2 * FARADAY_C_MOL)) * np.log(pressao_parcial)
+    perda_ativacao = (MASSA_MOLAR_H2_KG_MOL * temp_kelvin / (0.5 * FARADAY_C_MOL)) * np.log(corrente / DENS_CORR_TROCA_A_CM2 + 1e-9)
+    resist_area = RESIST_ESPEC_AREA_OHM_CM2 * (1.0 + 0.1 * (100 - umidade) / 100)
+    queda_ohmica = corrente * resist_area
+    perda_concentracao = -(MASSA_MOLAR_H2_KG_MOL * temp_kelvin / (2 * FARADAY_C_MOL)) * np.log(1 - corrente / CORRENTE_LIMITE_A_CM2)
+    tensao_total = tensao_reversivel + perda_ativacao + queda_ohmica + perda_concentracao
+
+    corrente_total = corrente * AREA_ATIVA_CM2
+    mols_h2_s = corrente_total / (2 * FARADAY_C_MOL)
+    massa_h2_s = mols_h2_s * MASSA_MOLAR_H2_KG_MOL
+    consumo_especifico = (tensao_total * corrente_total) / (massa_h2_s * 3.6e6)
+    eficiencia = (E0 / tensao_total) * 100
+
+    return tensao_total, eficiencia, massa_h2_s, consumo_especifico
+
+
+def generate_pem_dataset(n_samples=10000, random_seed=42):
+    """
+    Gera amostras do modelo físico nas faixas de operação do notebook
+
+    Args:
+        n_samples: Número de amostras
+        random_seed: Seed
+
+    Returns:
+        X (corrente, temperatura, pressão, umidade), Y (tensão, eficiência, CES)
+    """
+    np.random.seed(random_seed)
+    X = np.column_stack([
+        np.random.uniform(0.5, 2.0, n_samples),
+        np.random.uniform(50, 80, n_samples),
+        np.random.uniform(1, 30, n_samples),
+        np.random.uniform(80, 100, n_samples),
+    ])
+    tensao, eficiencia, _, consumo = pem_physics_model(X[:, 0], X[:, 1], X[:, 2], X[:, 3])
+    Y = np.column_stack([tensao, eficiencia, consumo])
+    return X, Y
+
+
+def _throughput(fn, n_calls, n_repeats=3):
+    """Melhor vazão (chamadas/s) entre n_repeats execuções"""
+    best = np.inf
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return n_calls / best
+
+
+def benchmark_surrogate(model, scaler, X, n_scalar=2000):
+    """
+    Compara a vazão do surrogate com o modelo físico
+
+    Args:
+        model: MLPRegressor treinado
+        scaler: StandardScaler ajustado nas entradas
+        X: Pontos de operação (n_samples, 4)
+        n_scalar: Número de pontos na medição chamada-a-chamada
+
+    Returns:
+        Dict com predições/s para cada forma de avaliação
+    """
+    X_small = X[:n_scalar]
+
+    def physics_scalar():
+        for row in X_small:
+            pem_physics_model(row[0], row[1], row[2], row[3])
+
+    def surrogate_scalar():
+        for row in X_small:
+            model.predict(scaler.transform(row[None, :]))
+
+    return {
+        'physics_scalar': _throughput(physics_scalar, len(X_small)),
+        'surrogate_scalar': _throughput(surrogate_scalar, len(X_small)),
+        'physics_vectorized': _throughput(
+            lambda: pem_physics_model(X[:, 0], X[:, 1], X[:, 2], X[:, 3]), len(X)),
+        'surrogate_vectorized': _throughput(
+            lambda: model.predict(scaler.transform(X)), len(X)),
+    }
+
+
+def main():
+    """
+    Treina o surrogate PEM e mede vazão contra o modelo físico
+    """
+    print("=" * 60)
+    print("SURROGATE PEM - MLPRegressor")
+    print("=" * 60)
+
+    X, Y = generate_pem_dataset(n_samples=10000)
+    X_train, X_test, Y_train, Y_test = train_test_split_manual(X, Y, test_size=0.2)
+
+    scaler = StandardScaler()
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    model = MLPRegressor(input_size=4, hidden_sizes=[128, 128, 64], output_size=3,
+                         learning_rate=0.01, n_epochs=100, activation='relu',
+                         batch_size=64)
+
+    start = time.perf_counter()
+    model.fit(X_train_scaled, Y_train)
+    print(f"Treino: {time.perf_counter() - start:.2f}s "
+          f"(loss final {model.loss_history[-1]:.6f})")
+
+    Y_pred = model.predict(X_test_scaled)
+    print("\nDesempenho no conjunto de teste:")
+    for i, name in enumerate(TARGET_NAMES):
+        mse = mean_squared_error(Y_test[:, i], Y_pred[:, i])
+        r2 = r2_score(Y_test[:, i], Y_pred[:, i])
+        print(f"  {name:<16} RMSE: {np.sqrt(mse):.4f} | R²: {r2:.4f}")
+
+    print("\nVazão (predições/s):")
+    X_bench, _ = generate_pem_dataset(n_samples=100000, random_seed=0)
+    rates = benchmark_surrogate(model, scaler, X_bench)
+    for key, rate in rates.items():
+        print(f"  {key:<22} {rate:>14,.0f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+"""
+Armazenamento colunar em blocos para datasets maiores que a memória
+SEM uso de pandas/pyarrow
+"""
+import bz2
+import json
+import lzma
+import os
+import zlib
+
+import numpy as np
+
+from .data_loader import CSVBlockReader, file_fingerprint
+
+
+# Versão do formato (gravada em meta.json)
+_STORE_FORMAT = 1
+
+# Compressores da biblioteca padrão: (comprimir(bytes, nível), descomprimir)
+_CODECS = {
+    None: (lambda data, level: data, lambda data: data),
+    'zlib': (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    'bz2': (lambda data, level: bz2.compress(data, level), bz2.decompress),
+    'lzma': (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+
+def _column_stats(values):
+    """min, max e contagem de valores não-NaN de um bloco de uma coluna"""
+    finite = values[~np.isnan(values)] if values.dtype.kind == 'f' else values
+    if len(finite) == 0:
+        return {'min': None, 'max': None, 'count': 0}
+    return {'min': finite.min().item(), 'max': finite.max().item(), 'count': int(len(finite))}
+
+
+def _write_meta(path, meta):
+    """Grava meta.json de forma atômica"""
+    tmp = os.path.join(path, '.meta.json.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(path, 'meta.json'))
+
+
+class ColumnStoreWriter:
+    """
+    Grava um dataset em blocos colunares
+
+    As linhas recebidas em append são acumuladas até chunk_rows; cada bloco
+    completo é gravado coluna a coluna (cada coluna de cada bloco é um
+    trecho contíguo, opcionalmente comprimido) em data.bin, com min, max e
+    contagem por coluna guardados em meta.json ao fechar. Enquanto a
+    gravação não termina (ou se ela falhar) o diretório não tem meta.json
+    e não é aberto como store.
+    """
+
+    def __init__(self, path, columns, dtype=np.float64, chunk_rows=65536,
+                 compression='zlib', level=1, source=None):
+        """
+        Cria o diretório do store
+
+        Args:
+            path: Diretório do store
+            columns: Nomes das colunas
+            dtype: Tipo de todas as colunas
+            chunk_rows: Linhas por bloco
+            compression: None, 'zlib', 'bz2' ou 'lzma' (biblioteca padrão;
+                zlib nível 1 é a opção rápida, no papel do lz4)
+            level: Nível de compressão
+            source: Dict JSON opcional sobre a origem dos dados (gravado
+                em meta.json; ver column_store_for_csv)
+        """
+        if compression not in _CODECS:
+            raise ValueError(f"Compressão {compression} não suportada")
+        self.path = path
+        self.columns = list(columns)
+        self.dtype = np.dtype(dtype)
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        self.level = level
+        self.source = source
+        self._compress = _CODECS[compression][0]
+
+        os.makedirs(path, exist_ok=True)
+        # Um meta.json anterior apontaria para o data.bin sendo reescrito
+        meta_path = os.path.join(path, 'meta.json')
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        self._file = open(os.path.join(path, 'data.bin'), 'wb')
+        self._offset = 0
+        self._chunks = []
+        self._pending = []
+        self._n_pending = 0
+        self.n_rows = 0
+
+    def append(self, X):
+        """
+        Acrescenta linhas
+
+        Args:
+            X: Array (n_linhas, n_colunas)
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        if X.ndim != 2 or X.shape[1] != len(self.columns):
+            raise ValueError(f"esperadas {len(self.columns)} colunas, recebido {X.shape}")
+        self._pending.append(X)
+        self._n_pending += len(X)
+        if self._n_pending >= self.chunk_rows:
+            pending = np.concatenate(self._pending)
+            n_full = len(pending) // self.chunk_rows * self.chunk_rows
+            for start in range(0, n_full, self.chunk_rows):
+                self._write_chunk(pending[start:start + self.chunk_rows])
+            self._pending = [pending[n_full:]]
+            self._n_pending = len(pending) - n_full
+        return self
+
+    def _write_chunk(self, block):
+        """Grava um bloco, coluna a coluna"""
+        entries = []
+        for j in range(block.shape[1]):
+            values = np.ascontiguousarray(block[:, j])
+            payload = self._compress(values.tobytes(), self.level)
+            self._file.write(payload)
+            entries.append(dict(_column_stats(values), offset=self._offset,
+                                nbytes=len(payload)))
+            self._offset += len(payload)
+        self._chunks.append({'start': self.n_rows, 'stop': self.n_rows + len(block),
+                             'columns': entries})
+        self.n_rows += len(block)
+
+    def close(self):
+        """Grava o último bloco (parcial) e os metadados"""
+        if self._file is None:
+            return
+        if self._n_pending:
+            self._write_chunk(np.concatenate(self._pending))
+            self._pending, self._n_pending = [], 0
+        self._file.close()
+        self._file = None
+
+        meta = {
+            'format': _STORE_FORMAT,
+            'columns': self.columns,
+            'dtype': self.dtype.str,
+            'chunk_rows': self.chunk_rows,
+            'compression': self.compression,
+            'n_rows': self.n_rows,
+            'source': self.source,
+            'chunks': self._chunks
+        }
+        _write_meta(self.path, meta)
+
+    def abort(self):
+        """Fecha o arquivo sem gravar meta.json (store incompleto)"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+def write_column_store(path, X, columns=None, **kwargs):
+    """
+    Grava um array inteiro como store colunar
+
+    Args:
+        path: Diretório do store
+        X: Array (n_linhas, n_colunas)
+        columns: Nomes das colunas (padrão: col_0, col_1, ...)
+        **kwargs: Opções de ColumnStoreWriter
+
+    Returns:
+        ColumnStore aberto
+    """
+    X = np.asarray(X)
+    columns = columns or [f'col_{j}' for j in range(X.shape[1])]
+    with ColumnStoreWriter(path, columns, dtype=kwargs.pop('dtype', X.dtype), **kwargs) as writer:
+        writer.append(X)
+    return ColumnStore(path)
+
+
+def csv_to_column_store(csv_path, store_path, delimiter=',', dtype=np.float64,
+                        chunk_rows=65536, compression='zlib', level=1,
+                        block_bytes=8 * 1024 ** 2, source=None):
+    """
+    Converte um CSV numérico em store colunar, bloco a bloco (sem carregar
+    o arquivo inteiro)
+
+    Args:
+        csv_path: Caminho do CSV (com cabeçalho)
+        store_path: Diretório do store
+        delimiter: Separador de colunas
+        dtype: Tipo das colunas
+        chunk_rows, compression, level: Opções de ColumnStoreWriter
+        block_bytes: Tamanho dos blocos lidos do CSV
+        source: Dict JSON sobre a origem, gravado em meta.json
+
+    Returns:
+        ColumnStore aberto, número de linhas descartadas
+    """
+    reader = CSVBlockReader(csv_path, delimiter=delimiter, dtype=dtype,
+                            block_bytes=block_bytes)
+    writer = None
+    try:
+        for block in reader:
+            if writer is None:
+                columns = reader.header if reader.header and len(reader.header) == block.shape[1] \
+                    else [f'col_{j}' for j in range(block.shape[1])]
+                writer = ColumnStoreWriter(store_path, columns, dtype=dtype, chunk_rows=chunk_rows,
+                                           compression=compression, level=level, source=source)
+            writer.append(block)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+    if writer is None:
+        writer = ColumnStoreWriter(store_path, reader.header or [], dtype=dtype,
+                                   chunk_rows=chunk_rows, compression=compression, level=level,
+                                   source=source)
+    writer.close()
+    return ColumnStore(store_path), reader.n_skipped
+
+
+def column_store_for_csv(csv_path, store_path=None, delimiter=',', dtype=np.float64,
+                        chunk_rows=65536, compression='zlib', level=1,
+                        block_bytes=8 * 1024 ** 2):
+    """
+    Store colunar de um CSV, convertido só quando necessário
+
+    meta.json guarda os parâmetros da conversão e a identidade do CSV
+    (tamanho, mtime e SHA-256), como o cache de load_dataset_cached: com
+    outros parâmetros o store é reconstruído; se tamanho ou mtime mudaram,
+    o SHA-256 decide (igual reaproveita o store, diferente o reconstrói).
+
+    Args:
+        csv_path: Caminho do CSV
+        store_path: Diretório do store (padrão: <nome>.colstore ao lado do CSV)
+        delimiter, dtype, chunk_rows, compression, level, block_bytes:
+            Opções de csv_to_column_store
+
+    Returns:
+        ColumnStore aberto
+    """
+    store_path = store_path or os.path.splitext(csv_path)[0] + '.colstore'
+    stat = os.stat(csv_path)
+    identity = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    params = {'format': _STORE_FORMAT, 'delimiter': delimiter, 'dtype': np.dtype(dtype).str,
+              'chunk_rows': chunk_rows, 'compression': compression, 'level': level}
+
+    try:
+        store = ColumnStore(store_path)
+    except (OSError, ValueError, KeyError):
+        store = None
+    source = (store.source or {}) if store is not None else {}
+    if store is not None and source.get('params') == params:
+        if all(source.get(key) == value for key, value in identity.items()):
+            return store
+        # Tamanho ou mtime mudaram: o conteúdo decide
+        content_hash = file_fingerprint(csv_path)
+        if source.get('sha256') == content_hash:
+            store.source = dict(source, sha256=content_hash, **identity)
+            try:
+                store.save_meta()
+            except OSError:
+                pass
+            return store
+
+    source = dict(identity, params=params, sha256=file_fingerprint(csv_path))
+    return csv_to_column_store(csv_path, store_path, delimiter=delimiter, dtype=dtype,
+                               chunk_rows=chunk_rows, compression=compression, level=level,
+                               block_bytes=block_bytes, source=source)[0]
+
+
+class ColumnStore:
+    """
+    Leitura de um store colunar com projeção de colunas e poda de blocos
+
+    Só os trechos das colunas pedidas são lidos do disco. Blocos fora do
+    intervalo de linhas pedido, ou cujo [min, max] não intersecta os
+    intervalos de valores de `where`, são pulados sem leitura.
+    """
+
+    def __init__(self, path):
+        """
+        Abre o store (lê apenas meta.json)
+
+        Args:
+            path: Diretório do store
+        """
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+        if meta.get('format') != _STORE_FORMAT:
+            raise ValueError(f"formato de store {meta.get('format')} não suportado")
+        self.columns = meta['columns']
+        self.dtype = np.dtype(meta['dtype'])
+        self.chunk_rows = meta['chunk_rows']
+        self.compression = meta['compression']
+        self.n_rows = meta['n_rows']
+        self.source = meta.get('source')
+        self.chunks = meta['chunks']
+        self._meta = meta
+        self._decompress = _CODECS[self.compression][1]
+        self._index = {name: j for j, name in enumerate(self.columns)}
+
+    def __len__(self):
+        return self.n_rows
+
+    def save_meta(self):
+        """Regrava meta.json (após atualizar source)"""
+        _write_meta(self.path, dict(self._meta, source=self.source))
+
+    @property
+    def shape(self):
+        """(n_linhas, n_colunas)"""
+        return (self.n_rows, len(self.columns))
+
+    def _column_indices(self, columns):
+        """Índices das colunas pedidas (nomes ou índices; None = todas)"""
+        if columns is None:
+            return list(range(len(self.columns)))
+        return [self._index[c] if isinstance(c, str) else int(c) for c in columns]
+
+    def _chunk_matches(self, chunk, row_range, where):
+        """Se o bloco pode conter linhas que satisfazem os predicados"""
+        if row_range is not None:
+            start, stop = row_range
+            if chunk['stop'] <= start or (stop is not None and chunk['start'] >= stop):
+                return False
+        for j, (low, high) in where:
+            stats = chunk['columns'][j]
+            if stats['count'] == 0:
+                return False
+            if (low is not None and stats['max'] < low) or \
+                    (high is not None and stats['min'] > high):
+                return False
+        return True
+
+    def chunk_stats(self, column):
+        """
+        Estatísticas de uma coluna em cada bloco
+
+        Args:
+            column: Nome ou índice
+
+        Returns:
+            Lista de dicts {'start', 'stop', 'min', 'max', 'count'}
+        """
+        j = self._column_indices([column])[0]
+        return [{'start': chunk['start'], 'stop': chunk['stop'],
+                 'min': chunk['columns'][j]['min'], 'max': chunk['columns'][j]['max'],
+                 'count': chunk['columns'][j]['count']} for chunk in self.chunks]
+
+    def iter_chunks(self, columns=None, row_range=None, where=None, with_index=False):
+        """
+        Itera sobre os blocos, lendo só as colunas pedidas
+
+        Args:
+            columns: Colunas (nomes ou índices; None = todas)
+            row_range: (início, fim) de linhas; fim None = até o final
+            where: Dict {coluna: (mínimo, máximo)} com limites inclusivos
+                (None = aberto); blocos sem valores no intervalo são
+                pulados e as linhas fora dele, removidas
+            with_index: Se True, também produz os índices globais das linhas
+
+        Yields:
+            Array (n_linhas, n_colunas_pedidas) de cada bloco (e os
+            índices, se with_index)
+        """
+        selected = self._column_indices(columns)
+        where = [(self._column_indices([column])[0], bounds)
+                 for column, bounds in (where or {}).items()]
+        filters = [j for j, _ in where]
+
+        with open(os.path.join(self.path, 'data.bin'), 'rb') as f:
+            for chunk in self.chunks:
+                if not self._chunk_matches(chunk, row_range, where):
+                    continue
+
+                needed = list(dict.fromkeys(selected + filters))
+                block = {}
+                for j in needed:
+                    entry = chunk['columns'][j]
+                    f.seek(entry['offset'])
+                    block[j] = np.frombuffer(self._decompress(f.read(entry['nbytes'])),
+                                             dtype=self.dtype)
+
+                rows = slice(None)
+                if row_range is not None:
+                    start, stop = row_range
+                    stop = chunk['stop'] if stop is None else min(stop, chunk['stop'])
+                    rows = slice(max(start, chunk['start']) - chunk['start'],
+                                 stop - chunk['start'])
+                out = np.column_stack([block[j][rows] for j in selected])
+                index = np.arange(chunk['start'], chunk['stop'])[rows] if with_index else None
+
+                if where:
+                    mask = np.ones(len(out), dtype=bool)
+                    for j, (low, high) in where:
+                        values = block[j][rows]
+                        if low is not None:
+                            mask &= values >= low
+                        if high is not None:
+                            mask &= values <= high
+                    out = out[mask]
+                    index = index[mask] if with_index else None
+                if len(out):
+                    yield (out, index) if with_index else out
+
+    def read(self, columns=None, row_range=None, where=None):
+        """
+        Lê as linhas/colunas pedidas em um único array
+
+        Args:
+            columns, row_range, where: Como em iter_chunks
+
+        Returns:
+            Array (n_linhas, n_colunas_pedidas)
+        """
+        blocks = list(self.iter_chunks(columns, row_range, where))
+        if not blocks:
+            return np.empty((0, len(self._column_indices(columns))), dtype=self.dtype)
+        return np.concatenate(blocks)
+
+    def unique(self, column):
+        """Valores distintos de uma coluna (lê só essa coluna)"""
+        values = [np.unique(block[:, 0]) for block in self.iter_chunks([column])]
+        return np.unique(np.concatenate(values)) if values else np.empty(0, self.dtype)
+
+
+def partial_fit_store(estimator, store, columns=None, target=None, where=None,
+                      classes=None):
+    """
+    Ajusta um estimador bloco a bloco com partial_fit
+
+    Transformadores recebem cada bloco uma vez; modelos são ajustados por
+    dataset.fit_dataset (modelos com épocas: uma época de partial_fit por
+    lote, n_epochs passadas pelo store).
+
+    Args:
+        estimator: Scaler (partial_fit(X)) ou modelo (partial_fit(X, y, classes))
+        store: ColumnStore
+        columns: Colunas de features (None = todas menos target)
+        target: Coluna alvo (None para transformadores)
+        where: Predicados de valor, como em ColumnStore.iter_chunks
+        classes: Classes do alvo (padrão: valores distintos da coluna alvo)
+
+    Returns:
+        estimator
+    """
+    if columns is None:
+        target_index = store._column_indices([target])[0] if target is not None else None
+        columns = [c for j, c in enumerate(store.columns) if j != target_index]
+    if target is None:
+        for block in store.iter_chunks(columns, where=where):
+            estimator.partial_fit(block)
+        return estimator
+
+    from .dataset import ColumnStoreDataset, fit_dataset
+    return fit_dataset(estimator, ColumnStoreDataset(store, target, columns=columns, where=where),
+                       classes=classes)
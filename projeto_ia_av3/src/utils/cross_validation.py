@@ -3,170 +3,663 @@ Validação cruzada implementada manualmente
 SEM uso de scikit-learn
 """
 import numpy as np
+import os
+import pickle
+import threading
 import time
-from .metrics import accuracy_score, precision_score, f1_score
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from .metrics import MetricsReport, bootstrap_metrics
 
 
-def k_fold_split(X, y, n_folds=5, shuffle=True, random_seed=42):
+RESULT_KEYS = ['accuracy', 'precision', 'f1_score', 'train_time', 'test_time',
+               'train_cpu_time', 'test_cpu_time', 'train_peak_mem', 'test_peak_mem',
+               'fit_rows_per_s', 'predict_rows_per_s']
+
+# Dados compartilhados do processo worker (preenchidos por _init_worker)
+_WORKER_DATA = {}
+
+
+def _to_shared(array):
     """
-    Divide dados em K folds para validação cruzada
-    Implementação manual SEM sklearn
+    Copia um array para um bloco de memória compartilhada
 
     Args:
-        X: Features
-        y: Target
-        n_folds: Número de folds
-        shuffle: Se True, embaralha antes de dividir
-        random_seed: Seed para reprodutibilidade
+        array: Array numpy
 
-    Yields:
-        train_indices, val_indices para cada fold
+    Returns:
+        shm: Bloco SharedMemory (o chamador deve fechar e liberar)
+        spec: Tupla (nome, shape, dtype) para reabrir o bloco nos workers
     """
-    n_samples = len(X)
-    indices = np.arange(n_samples)
+    array = np.ascontiguousarray(array)
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    view = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+    view[...] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
 
-    if shuffle:
-        np.random.seed(random_seed)
-        np.random.shuffle(indices)
 
-    fold_sizes = np.full(n_folds, n_samples // n_folds, dtype=int)
-    fold_sizes[:n_samples % n_folds] += 1
+def _init_worker(x_spec, y_spec):
+    """
+    Inicializa o worker: anexa X e y compartilhados (sem cópia)
+    """
+    for key, (name, shape, dtype) in (('X', x_spec), ('y', y_spec)):
+        shm = shared_memory.SharedMemory(name=name)
+        _WORKER_DATA[key + '_shm'] = shm
+        _WORKER_DATA[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
 
-    current = 0
-    for fold_size in fold_sizes:
-        start, stop = current, current + fold_size
-        val_indices = indices[start:stop]
-        train_indices = np.concatenate([indices[:start], indices[stop:]])
-        yield train_indices, val_indices
-        current = stop
 
+def _read_rss():
+    """RSS atual do processo em bytes (Linux), ou None"""
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return None
 
-def cross_validate(model, X, y, n_folds=5, metrics=['accuracy', 'f1'], verbose=True):
+
+class _PeakRSS:
     """
-    Realiza validação cruzada k-fold manualmente
+    Amostra o RSS do processo em uma thread durante um bloco
+
+    Reporta o crescimento do RSS sobre o início do bloco (em `peak`), e
+    não o pico de alocações: memória que o alocador já retinha de blocos
+    anteriores é reaproveitada sem aumentar o RSS, então a partir do
+    segundo fold o valor tende a 0. Para o pico real use 'tracemalloc'.
+    O tempo de CPU da própria thread fica em cpu_time, para ser
+    descontado do tempo de CPU do processo.
+    """
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = np.nan
+        self.cpu_time = 0.0
+
+    def _update(self):
+        rss = _read_rss()
+        if rss is not None:
+            self._max = max(self._max, rss)
+
+    def _sample(self):
+        start_cpu = time.thread_time_ns()
+        while not self._stop.wait(self.interval):
+            self._update()
+        self.cpu_time = (time.thread_time_ns() - start_cpu) / 1e9
+
+    def __enter__(self):
+        self._start = _read_rss()
+        if self._start is not None:
+            self._max = self._start
+            self._stop = threading.Event()
+            self._thread = threading.Thread(target=self._sample, daemon=True)
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if self._start is not None:
+            self._stop.set()
+            self._thread.join()
+            self._update()
+            self.peak = float(self._max - self._start)
+        return False
+
+
+def _measure(fn, memory):
+    """
+    Executa fn medindo tempo de parede, tempo de CPU e pico de memória
 
     Args:
-        model: Modelo com métodos fit() e predict()
-        X: Features
-        y: Target
-        n_folds: Número de folds
-        metrics: Lista de métricas a calcular
-        verbose: Se True, imprime progresso
+        fn: Função sem argumentos
+        memory: 'rss' (crescimento do RSS amostrado, baixo custo; não é o
+            pico, ver _PeakRSS), 'tracemalloc' (pico exato das alocações
+            Python/NumPy, porém deixa o código mais lento) ou None
 
     Returns:
-        Dictionary com resultados: médias, desvios padrão e tempos
+        resultado de fn, tempo (s), tempo de CPU (s), memória (bytes: pico
+        com 'tracemalloc', crescimento do RSS com 'rss')
+    """
+    peak = np.nan
+    start_cpu = time.process_time_ns()
+    if memory == 'tracemalloc':
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    elif memory == 'rss':
+        sampler = _PeakRSS().__enter__()
+
+    start = time.perf_counter_ns()
+    result = fn()
+    elapsed = (time.perf_counter_ns() - start) / 1e9
+
+    if memory == 'tracemalloc':
+        peak = float(tracemalloc.get_traced_memory()[1] - base)
+        if not was_tracing:
+            tracemalloc.stop()
+    elif memory == 'rss':
+        sampler.__exit__(None, None, None)
+        peak = sampler.peak
+
+    # A thread de amostragem do RSS não é custo do modelo
+    cpu = (time.process_time_ns() - start_cpu) / 1e9
+    if memory == 'rss':
+        cpu = max(cpu - sampler.cpu_time, 0.0)
+
+    return result, elapsed, cpu, peak
+
+
+def evaluate_fold(model, X_train, y_train, X_val, y_val, keep_predictions=False,
+                  memory='rss'):
+    """
+    Treina e avalia um fold
+
+    Tempos de parede vêm de perf_counter_ns e tempos de CPU do processo de
+    process_time_ns; com vários processos, compare o tempo de CPU com o de
+    parede para detectar disputa por núcleos. O pré-processamento
+    compartilhado entre modelos (prepare_fold do Pipeline) roda antes da
+    medição: sem isso, o primeiro modelo do fold pagaria sozinho o ajuste
+    que os demais recebem do cache.
+
+    Args:
+        model: Modelo não treinado
+        X_train, y_train: Dados de treino
+        X_val, y_val: Dados de validação
+        keep_predictions: Se True, inclui as predições de validação
+            ('y_pred'); com 'proba', inclui também predict_proba em float32
+            ('y_proba', calculado fora da medição de tempo)
+        memory: Medição do pico de memória: 'rss', 'tracemalloc' ou None
+
+    Returns:
+        Dict com métricas, tempos, pico de memória (bytes) e vazão
+        (linhas/s) do fold
+    """
+    if hasattr(model, 'prepare_fold'):
+        model.prepare_fold(X_train, X_val)
+
+    # Treina
+    _, train_time, train_cpu, train_mem = _measure(
+        lambda: model.fit(X_train, y_train), memory)
+
+    # Testa
+    y_pred, test_time, test_cpu, test_mem = _measure(
+        lambda: model.predict(X_val), memory)
+
+    fold_result = _fold_result(y_val, y_pred, len(X_train),
+                               (train_time, train_cpu, train_mem),
+                               (test_time, test_cpu, test_mem), keep_predictions)
+    if keep_predictions == 'proba':
+        fold_result['y_proba'] = np.asarray(model.predict_proba(X_val), dtype=np.float32)
+    return fold_result
+
+
+def _fold_result(y_val, y_pred, n_train, train_stats, test_stats, keep_predictions):
+    """
+    Monta o dict de resultado de um fold
+
+    Args:
+        y_val: Labels de validação
+        y_pred: Predições
+        n_train: Número de linhas usadas no treino
+        train_stats: (tempo, tempo de CPU, pico de memória) do treino
+        test_stats: (tempo, tempo de CPU, pico de memória) da predição
+        keep_predictions: Se True, inclui 'y_pred'
+
+    Returns:
+        Dict com métricas, tempos, memória e vazão
     """
-    results = {
-        'accuracy': [],
-        'precision': [],
-        'f1_score': [],
-        'train_time': [],
-        'test_time': []
+    train_time, train_cpu, train_mem = train_stats
+    test_time, test_cpu, test_mem = test_stats
+
+    # Métricas (uma única matriz de confusão)
+    report = MetricsReport(y_val, y_pred, zero_division=0)
+    fold_result = {
+        'accuracy': report.accuracy(),
+        'precision': report.precision('macro'),
+        'f1_score': report.f1('macro'),
+        'train_time': train_time,
+        'test_time': test_time,
+        'train_cpu_time': train_cpu,
+        'test_cpu_time': test_cpu,
+        'train_peak_mem': train_mem,
+        'test_peak_mem': test_mem,
+        'fit_rows_per_s': n_train / train_time if train_time > 0 else np.inf,
+        'predict_rows_per_s': len(y_val) / test_time if test_time > 0 else np.inf
     }
+    if keep_predictions:
+        fold_result['y_pred'] = np.asarray(y_pred)
+    return fold_result
 
-    fold_num = 0
-    for train_idx, val_idx in k_fold_split(X, y, n_folds=n_folds):
-        fold_num += 1
 
-        if verbose:
-            print(f"  Fold {fold_num}/{n_folds}...", end=' ')
+def run_fold_worker(model_bytes, train_idx, val_idx, keep_predictions=False,
+                    memory='rss'):
+    """
+    Executa um fold no processo worker a partir dos índices
+    (X e y vêm da memória compartilhada anexada em shared_pool)
+    """
+    model = pickle.loads(model_bytes)
+    X, y = _WORKER_DATA['X'], _WORKER_DATA['y']
+    return evaluate_fold(model, X[train_idx], y[train_idx], X[val_idx], y[val_idx],
+                         keep_predictions=keep_predictions, memory=memory)
 
-        # Separa dados
-        X_train, X_val = X[train_idx], X[val_idx]
-        y_train, y_val = y[train_idx], y[val_idx]
 
-        # Treina modelo
-        start_time = time.time()
-        model.fit(X_train, y_train)
-        train_time = time.time() - start_time
+@contextmanager
+def shared_pool(X, y, n_jobs):
+    """
+    Pool de processos com X e y publicados em memória compartilhada
 
-        # Testa modelo
-        start_time = time.time()
-        y_pred = model.predict(X_val)
-        test_time = time.time() - start_time
+    Tarefas submetidas devem usar run_fold_worker, que lê X e y do bloco
+    compartilhado; a memória é liberada ao sair do contexto.
 
-        # Calcula métricas
-        acc = accuracy_score(y_val, y_pred)
-        prec = precision_score(y_val, y_pred, average='macro', zero_division=0)
-        f1 = f1_score(y_val, y_pred, average='macro', zero_division=0)
+    Args:
+        X: Features
+        y: Target
+        n_jobs: Número de processos
 
-        results['accuracy'].append(acc)
-        results['precision'].append(prec)
-        results['f1_score'].append(f1)
-        results['train_time'].append(train_time)
-        results['test_time'].append(test_time)
+    Yields:
+        ProcessPoolExecutor
+    """
+    x_shm, x_spec = _to_shared(X)
+    y_shm, y_spec = _to_shared(y)
+
+    try:
+        with ProcessPoolExecutor(max_workers=n_jobs,
+                                 initializer=_init_worker,
+                                 initargs=(x_spec, y_spec)) as executor:
+            yield executor
+    finally:
+        for shm in (x_shm, y_shm):
+            shm.close()
+            shm.unlink()
 
-        if verbose:
-            print(f"Acc: {acc:.4f}, F1: {f1:.4f}")
 
-    # Calcula estatísticas finais
+def summarize_folds(fold_results):
+    """
+    Agrega uma lista de resultados por fold (na ordem dos folds)
+
+    Args:
+        fold_results: Lista de dicts retornados por evaluate_fold
+
+    Returns:
+        Dictionary com média, desvio padrão e valores de cada métrica;
+        valores por fold que são arrays (ex.: 'y_pred') ficam em
+        '<chave>_folds'
+    """
+    first = fold_results[0]
+    array_keys = [key for key in first if np.ndim(first[key]) > 0]
+    keys = [key for key in RESULT_KEYS if key in first]
+    keys += [key for key in first if key not in keys and key not in array_keys]
+
+    summary = _summarize({key: [fold[key] for fold in fold_results] for key in keys})
+    for key in array_keys:
+        summary[f'{key}_folds'] = [fold[key] for fold in fold_results]
+    return summary
+
+
+def _summarize(results):
+    """
+    Calcula média, desvio padrão e valores de cada métrica
+    """
     summary = {}
     for key in results:
         values = np.array(results[key])
         summary[f'{key}_mean'] = np.mean(values)
         summary[f'{key}_std'] = np.std(values)
         summary[f'{key}_all'] = values
+    return summary
+
+
+def _print_fold(fold_num, n_folds, fold_result):
+    """Imprime o resultado de um fold"""
+    print(f"  Fold {fold_num}/{n_folds}... "
+          f"Acc: {fold_result['accuracy']:.4f}, F1: {fold_result['f1_score']:.4f}")
+
+
+def resolve_n_jobs(n_jobs, n_tasks):
+    """
+    Número efetivo de processos
+
+    Limitado ao número de CPUs (evita que a disputa por núcleos infle os
+    tempos medidos em cada fold) e ao número de tarefas.
+
+    Args:
+        n_jobs: Processos pedidos (None ou 1 = serial, -1 = todas as CPUs)
+        n_tasks: Número de tarefas a executar
+
+    Returns:
+        Inteiro >= 1
+    """
+    n_cpus = os.cpu_count() or 1
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        n_jobs = n_cpus
+    return max(1, min(n_jobs, n_cpus, n_tasks))
+
+
+def run_folds(model, X, y, folds, n_jobs=1, verbose=True, memory='rss',
+              keep_predictions=False):
+    """
+    Avalia um modelo em uma lista de folds, em série ou em paralelo
+
+    Com n_jobs > 1, X e y são publicados uma única vez em memória
+    compartilhada; cada worker recebe apenas os índices do fold e o
+    modelo (não treinado) serializado. Os tempos de treino/teste são
+    medidos dentro do worker. Em ambos os modos cada fold treina uma cópia
+    nova do modelo.
+
+    Args:
+        model: Modelo com métodos fit() e predict()
+        X: Features
+        y: Target
+        folds: Lista de pares (train, val): arrays de índices ou slices
+            (ex.: FoldLayout.folds, que evita cópias por fold)
+        n_jobs: Número de processos (1 = serial, -1 = todas as CPUs)
+        verbose: Se True, imprime progresso
+        memory: Medição do pico de memória por fold ('rss', 'tracemalloc' ou None)
+        keep_predictions: Se True, guarda as predições de cada fold ('y_pred_folds')
+
+    Returns:
+        Dictionary com médias, desvios padrão, tempos, tempo de parede
+        ('wall_time') e a razão soma dos tempos dos folds / tempo de parede
+        ('task_time_ratio'; não é um speed-up: com processos disputando a
+        CPU cada fold fica mais lento e a razão cresce)
+    """
+    n_folds = len(folds)
+    n_jobs = resolve_n_jobs(n_jobs, n_folds)
+    fold_results = [None] * n_folds
+    model_bytes = pickle.dumps(model)
+    start_wall = time.time()
+
+    if n_jobs == 1:
+        for fold_num, (train_idx, val_idx) in enumerate(folds, 1):
+            if verbose:
+                print(f"  Fold {fold_num}/{n_folds}...", end=' ')
+
+            # Cópia não treinada por fold (evita aproveitar pesos do fold anterior)
+            fold_result = evaluate_fold(pickle.loads(model_bytes),
+                                        X[train_idx], y[train_idx],
+                                        X[val_idx], y[val_idx],
+                                        keep_predictions=keep_predictions, memory=memory)
+            fold_results[fold_num - 1] = fold_result
+
+            if verbose:
+                print(f"Acc: {fold_result['accuracy']:.4f}, F1: {fold_result['f1_score']:.4f}")
+    else:
+        with shared_pool(X, y, n_jobs) as executor:
+            futures = {
+                executor.submit(run_fold_worker, model_bytes, train_idx, val_idx,
+                                keep_predictions, memory): i
+                for i, (train_idx, val_idx) in enumerate(folds)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                fold_results[i] = future.result()
+                if verbose:
+                    _print_fold(i + 1, n_folds, fold_results[i])
+
+    wall_time = time.time() - start_wall
+
+    # Agrega na ordem dos folds
+    summary = summarize_folds(fold_results)
+
+    serial_time = np.sum(summary['train_time_all']) + np.sum(summary['test_time_all'])
+    summary['wall_time'] = wall_time
+    summary['task_time_ratio'] = serial_time / wall_time if wall_time > 0 else 1.0
 
     return summary
 
 
-def stratified_k_fold_split(X, y, n_folds=5, random_seed=42):
+def _rank_to_fold(rank, n_group, n_folds):
+    """
+    Fold de cada posição dentro de um grupo de n_group amostras
+
+    Reproduz a divisão usual: os primeiros n_group % n_folds folds têm
+    uma amostra a mais.
+    """
+    q, r = n_group // n_folds, n_group % n_folds
+    big = r * (q + 1)
+    return np.where(rank < big,
+                    rank // (q + 1),
+                    r + (rank - big) // np.maximum(q, 1))
+
+
+class FoldPlan:
+    """
+    Plano de folds calculado uma única vez por dataset e seed
+
+    Guarda, para cada amostra, o fold em que ela é validação, e deriva
+    (de forma vetorizada, com cache) os índices de treino/validação e as
+    máscaras booleanas. O mesmo plano pode ser compartilhado por todos os
+    modelos de um experimento.
     """
-    Validação cruzada estratificada (mantém proporção de classes)
-    Implementação manual
+
+    def __init__(self, y, n_folds=5, stratified=True, shuffle=True, random_seed=42):
+        """
+        Calcula o plano
+
+        Args:
+            y: Target
+            n_folds: Número de folds
+            stratified: Se True, mantém a proporção de classes em cada fold
+            shuffle: Se True, embaralha antes de dividir
+            random_seed: Seed para reprodutibilidade
+        """
+        y = np.asarray(y)
+        self.n_folds = n_folds
+        self.n_samples = len(y)
+        self.stratified = stratified
+        self.shuffle = shuffle
+        self.random_seed = random_seed
+        self._layout = None
+
+        # Só semeia o RNG global quando vai embaralhar
+        if stratified or shuffle:
+            np.random.seed(random_seed)
+
+        if stratified:
+            # Índices agrupados por classe, embaralhados dentro da classe
+            groups = []
+            for cls in np.unique(y):
+                cls_indices = np.where(y == cls)[0]
+                np.random.shuffle(cls_indices)
+                groups.append(cls_indices)
+        else:
+            indices = np.arange(self.n_samples)
+            if shuffle:
+                np.random.shuffle(indices)
+            groups = [indices]
+
+        # order: amostras na ordem dos grupos; fold_of_order: fold de cada posição
+        self.order = np.concatenate(groups)
+        self.fold_of_order = np.concatenate([
+            _rank_to_fold(np.arange(len(g)), len(g), n_folds) for g in groups
+        ])
+
+        # Fold de validação de cada amostra (na indexação original)
+        self.fold_of = np.empty(self.n_samples, dtype=np.intp)
+        self.fold_of[self.order] = self.fold_of_order
+        self.fold_sizes = np.bincount(self.fold_of, minlength=n_folds)
+
+        self._indices = [None] * n_folds
+
+    def __len__(self):
+        return self.n_folds
+
+    def __getstate__(self):
+        # O layout é uma cópia de X: não vai junto com o plano
+        state = self.__dict__.copy()
+        state['_layout'] = None
+        return state
+
+    def __iter__(self):
+        for fold in range(self.n_folds):
+            yield self.indices(fold)
+
+    def indices(self, fold):
+        """
+        Índices de treino e validação de um fold (com cache)
+
+        Args:
+            fold: Índice do fold
+
+        Returns:
+            train_indices, val_indices
+        """
+        if self._indices[fold] is None:
+            in_fold = self.fold_of_order == fold
+            self._indices[fold] = (self.order[~in_fold], self.order[in_fold])
+        return self._indices[fold]
+
+    def val_mask(self, fold):
+        """
+        Máscara booleana das amostras de validação de um fold
+
+        Args:
+            fold: Índice do fold
+
+        Returns:
+            Array booleano (n_samples,)
+        """
+        return self.fold_of == fold
+
+    def layout(self, X, y):
+        """
+        Cópia de X e y permutada e contígua por fold (com cache)
+
+        A cópia é construída uma vez por plano e reaproveitada enquanto X e
+        y forem os mesmos objetos (que não devem ser alterados in place);
+        ela vive enquanto o plano viver.
+
+        Args:
+            X: Features
+            y: Target
+
+        Returns:
+            FoldLayout
+        """
+        if self._layout is None or self._layout[0] is not X or self._layout[1] is not y:
+            self._layout = (X, y, FoldLayout(self, X, y))
+        return self._layout[2]
+
+
+class FoldLayout:
+    """
+    X e y reordenados de modo que cada fold seja um bloco contíguo
+
+    A validação do fold k é a fatia [start_k, stop_k). O treino são os
+    dois blocos vizinhos [stop_k, n) e [0, start_k); para que eles formem
+    uma única view, o início da cópia permutada é repetido ao final
+    (ordem circular). Assim nenhum fold faz cópia por indexação avançada:
+    `folds` contém apenas objetos slice.
+    """
+
+    def __init__(self, plan, X, y):
+        """
+        Constrói a cópia permutada
+
+        Args:
+            plan: FoldPlan
+            X: Features
+            y: Target
+        """
+        n = plan.n_samples
+        bounds = np.concatenate([[0], np.cumsum(plan.fold_sizes)])
+
+        # Amostras ordenadas por fold de validação
+        perm = np.argsort(plan.fold_of, kind='stable')
+        tail = bounds[-2]  # início do último fold
+
+        self.X = np.concatenate([X[perm], X[perm[:tail]]])
+        self.y = np.concatenate([y[perm], y[perm[:tail]]])
+        self.perm = perm
+        self.bounds = bounds
+        self.folds = [
+            (slice(bounds[k + 1], bounds[k] + n), slice(bounds[k], bounds[k + 1]))
+            for k in range(plan.n_folds)
+        ]
+
+    def fold(self, fold):
+        """
+        Views de treino e validação de um fold
+
+        Args:
+            fold: Índice do fold
+
+        Returns:
+            X_train, y_train, X_val, y_val (views, sem cópia)
+        """
+        train, val = self.folds[fold]
+        return self.X[train], self.y[train], self.X[val], self.y[val]
+
+
+def k_fold_split(X, y, n_folds=5, shuffle=True, random_seed=42):
+    """
+    Divide dados em K folds para validação cruzada
+    Implementação manual SEM sklearn
 
     Args:
         X: Features
         y: Target
         n_folds: Número de folds
-        random_seed: Seed
+        shuffle: Se True, embaralha antes de dividir
+        random_seed: Seed para reprodutibilidade
 
     Yields:
         train_indices, val_indices para cada fold
     """
-    np.random.seed(random_seed)
-    n_samples = len(y)
-    unique_classes = np.unique(y)
+    yield from FoldPlan(np.arange(len(X)), n_folds=n_folds, stratified=False,
+                        shuffle=shuffle, random_seed=random_seed)
 
-    # Separa índices por classe
-    class_indices = {}
-    for cls in unique_classes:
-        class_indices[cls] = np.where(y == cls)[0]
-        np.random.shuffle(class_indices[cls])
 
-    # Divide cada classe em folds
-    class_folds = {}
-    for cls in unique_classes:
-        indices = class_indices[cls]
-        n_class_samples = len(indices)
-        fold_sizes = np.full(n_folds, n_class_samples // n_folds, dtype=int)
-        fold_sizes[:n_class_samples % n_folds] += 1
+def cross_validate(model, X, y, n_folds=5, metrics=['accuracy', 'f1'], verbose=True,
+                   n_jobs=1, memory='rss', plan=None):
+    """
+    Realiza validação cruzada k-fold manualmente
 
-        folds = []
-        current = 0
-        for fold_size in fold_sizes:
-            folds.append(indices[current:current + fold_size])
-            current += fold_size
-        class_folds[cls] = folds
+    Args:
+        model: Modelo com métodos fit() e predict()
+        X: Features
+        y: Target
+        n_folds: Número de folds
+        metrics: Lista de métricas a calcular
+        verbose: Se True, imprime progresso
+        n_jobs: Número de processos para rodar os folds em paralelo
+        memory: Medição do pico de memória por fold ('rss', 'tracemalloc' ou None)
+        plan: FoldPlan a reaproveitar entre chamadas (padrão: um novo, de n_folds);
+            a cópia permutada de X é construída uma vez por plano
 
-    # Combina folds de todas as classes
-    for fold_idx in range(n_folds):
-        val_indices = []
-        train_indices = []
+    Returns:
+        Dictionary com resultados: médias, desvios padrão e tempos
+    """
+    if plan is None:
+        plan = FoldPlan(y, n_folds=n_folds, stratified=False)
+    layout = plan.layout(X, y)
+    return run_folds(model, layout.X, layout.y, layout.folds, n_jobs=n_jobs,
+                     verbose=verbose, memory=memory)
 
-        for cls in unique_classes:
-            # Fold atual é validação
-            val_indices.extend(class_folds[cls][fold_idx])
 
-            # Outros folds são treino
-            for other_fold in range(n_folds):
-                if other_fold != fold_idx:
-                    train_indices.extend(class_folds[cls][other_fold])
+def stratified_k_fold_split(X, y, n_folds=5, random_seed=42):
+    """
+    Validação cruzada estratificada (mantém proporção de classes)
+    Implementação manual
 
-        yield np.array(train_indices), np.array(val_indices)
+    Args:
+        X: Features
+        y: Target
+        n_folds: Número de folds
+        random_seed: Seed
+
+    Yields:
+        train_indices, val_indices para cada fold
+    """
+    yield from FoldPlan(y, n_folds=n_folds, stratified=True, random_seed=random_seed)
 
 
-def cross_validate_stratified(model, X, y, n_folds=5, verbose=True):
+def cross_validate_stratified(model, X, y, n_folds=5, verbose=True, n_jobs=1,
+                              memory='rss', n_boot=0, bootstrap_method='percentile',
+                              plan=None):
     """
     Validação cruzada estratificada
 
@@ -176,60 +669,138 @@ def cross_validate_stratified(model, X, y, n_folds=5, verbose=True):
         y: Target
         n_folds: Número de folds
         verbose: Se True, imprime progresso
+        n_jobs: Número de processos para rodar os folds em paralelo
+        memory: Medição do pico de memória por fold ('rss', 'tracemalloc' ou None)
+        n_boot: Se > 0, réplicas bootstrap sobre as predições fora do fold
+            de todos os folds juntas (intervalos em 'bootstrap')
+        bootstrap_method: 'percentile' ou 'bca'
+        plan: FoldPlan a reaproveitar entre chamadas (padrão: um novo, de n_folds);
+            a cópia permutada de X é construída uma vez por plano
 
     Returns:
         Dictionary com resultados
     """
-    results = {
-        'accuracy': [],
-        'precision': [],
-        'f1_score': [],
-        'train_time': [],
-        'test_time': []
-    }
+    if plan is None:
+        plan = FoldPlan(y, n_folds=n_folds, stratified=True)
+    layout = plan.layout(X, y)
+    results = run_folds(model, layout.X, layout.y, layout.folds, n_jobs=n_jobs,
+                        verbose=verbose, memory=memory, keep_predictions=n_boot > 0)
+    if n_boot > 0:
+        y_pred = np.concatenate(results.pop('y_pred_folds'))
+        y_true = np.concatenate([layout.y[val] for _, val in layout.folds])
+        results['bootstrap'] = bootstrap_metrics(y_true, y_pred, n_boot=n_boot,
+                                                 method=bootstrap_method)
+    return results
+
+
+def time_series_split(X, y=None, n_splits=5, window='expanding', max_train_size=None,
+                      test_size=None, gap=0):
+    """
+    Divisão temporal (walk-forward): o treino sempre precede a validação
 
-    fold_num = 0
-    for train_idx, val_idx in stratified_k_fold_split(X, y, n_folds=n_folds):
-        fold_num += 1
+    As amostras devem estar em ordem cronológica. Os blocos de validação
+    são consecutivos e cobrem o final da série; o treino usa tudo o que
+    vem antes ('expanding') ou apenas as últimas max_train_size amostras
+    ('sliding').
 
-        if verbose:
-            print(f"  Fold {fold_num}/{n_folds}...", end=' ')
+    Args:
+        X: Features (em ordem temporal)
+        y: Target (não usado; mantido pela simetria com os outros splits)
+        n_splits: Número de divisões
+        window: 'expanding' ou 'sliding'
+        max_train_size: Tamanho máximo do treino (padrão em 'sliding':
+            tamanho do primeiro treino)
+        test_size: Tamanho de cada bloco de validação
+            (padrão: n_samples // (n_splits + 1))
+        gap: Amostras descartadas entre treino e validação
 
-        X_train, X_val = X[train_idx], X[val_idx]
-        y_train, y_val = y[train_idx], y[val_idx]
+    Yields:
+        train_slice, val_slice para cada divisão (slices, sem cópia)
+    """
+    if window not in ('expanding', 'sliding'):
+        raise ValueError(f"window '{window}' não suportada")
 
-        # Treina
-        start_time = time.time()
-        model.fit(X_train, y_train)
-        train_time = time.time() - start_time
+    n_samples = len(X)
+    test_size = test_size or n_samples // (n_splits + 1)
+    first_test = n_samples - n_splits * test_size
+    if first_test - gap <= 0:
+        raise ValueError("Amostras insuficientes para n_splits, test_size e gap")
+
+    if window == 'sliding' and max_train_size is None:
+        max_train_size = first_test - gap
+
+    for k in range(n_splits):
+        test_start = first_test + k * test_size
+        train_stop = test_start - gap
+        train_start = 0
+        if max_train_size is not None:
+            train_start = max(0, train_stop - max_train_size)
+        yield slice(train_start, train_stop), slice(test_start, test_start + test_size)
+
+
+def walk_forward_validate(model, X, y, n_splits=5, window='expanding', max_train_size=None,
+                          test_size=None, gap=0, incremental=True, verbose=True,
+                          memory='rss'):
+    """
+    Validação walk-forward com treino incremental
 
-        # Testa
-        start_time = time.time()
-        y_pred = model.predict(X_val)
-        test_time = time.time() - start_time
+    Com janela expansível e um modelo que tenha partial_fit, o mesmo
+    modelo cresce de um fold para o seguinte recebendo apenas as linhas
+    novas do treino; assim o custo total se aproxima de um único treino
+    sobre a série. Nos demais casos (janela deslizante, incremental=False
+    ou modelo sem partial_fit) cada fold treina uma cópia nova com fit().
 
-        # Métricas
-        acc = accuracy_score(y_val, y_pred)
-        prec = precision_score(y_val, y_pred, average='macro', zero_division=0)
-        f1 = f1_score(y_val, y_pred, average='macro', zero_division=0)
+    Args:
+        model: Modelo com fit() e predict() (e, opcionalmente, partial_fit)
+        X: Features (em ordem temporal)
+        y: Target
+        n_splits, window, max_train_size, test_size, gap: Ver time_series_split
+        incremental: Se False, força o refit completo em cada fold
+        verbose: Se True, imprime progresso
+        memory: Medição do pico de memória por fold ('rss', 'tracemalloc' ou None)
 
-        results['accuracy'].append(acc)
-        results['precision'].append(prec)
-        results['f1_score'].append(f1)
-        results['train_time'].append(train_time)
-        results['test_time'].append(test_time)
+    Returns:
+        Dictionary com resultados (como cross_validate), mais 'n_train_all'
+        (tamanho do treino em cada fold), 'incremental' e 'wall_time'
+    """
+    folds = list(time_series_split(X, y, n_splits=n_splits, window=window,
+                                   max_train_size=max_train_size,
+                                   test_size=test_size, gap=gap))
+    incremental = (incremental and window == 'expanding'
+                   and hasattr(model, 'partial_fit'))
+    model_bytes = pickle.dumps(model)
+    classes = np.unique(y)
+
+    start_wall = time.time()
+    fold_results = []
+    current = pickle.loads(model_bytes) if incremental else None
+    seen = 0
+
+    for fold_idx, (train, val) in enumerate(folds):
+        if incremental:
+            # Apenas as linhas que ainda não foram vistas pelo modelo
+            new = slice(seen, train.stop)
+            seen = train.stop
+            _, *train_stats = _measure(
+                lambda: current.partial_fit(X[new], y[new], classes=classes), memory)
+            fitted = current
+            n_fit = new.stop - new.start
+        else:
+            fitted = pickle.loads(model_bytes)
+            _, *train_stats = _measure(lambda: fitted.fit(X[train], y[train]), memory)
+            n_fit = train.stop - train.start
+
+        y_pred, *test_stats = _measure(lambda: fitted.predict(X[val]), memory)
+        fold_result = _fold_result(y[val], y_pred, n_fit, train_stats, test_stats, False)
+        fold_result['n_train'] = train.stop - train.start
+        fold_results.append(fold_result)
 
         if verbose:
-            print(f"Acc: {acc:.4f}, F1: {f1:.4f}")
-
-    # Estatísticas
-    summary = {}
-    for key in results:
-        values = np.array(results[key])
-        summary[f'{key}_mean'] = np.mean(values)
-        summary[f'{key}_std'] = np.std(values)
-        summary[f'{key}_all'] = values
+            _print_fold(fold_idx + 1, len(folds), fold_result)
 
+    summary = summarize_folds(fold_results)
+    summary['incremental'] = incremental
+    summary['wall_time'] = time.time() - start_wall
     return summary
 
 
@@ -273,9 +844,10 @@ def leave_one_out_cv(model, X, y, verbose=False):
     predictions = np.array(predictions)
     y_true_list = np.array(y_true_list)
 
-    acc = accuracy_score(y_true_list, predictions)
-    prec = precision_score(y_true_list, predictions, average='macro', zero_division=0)
-    f1 = f1_score(y_true_list, predictions, average='macro', zero_division=0)
+    report = MetricsReport(y_true_list, predictions, zero_division=0)
+    acc = report.accuracy()
+    prec = report.precision('macro')
+    f1 = report.f1('macro')
 
     return {
         'accuracy': acc,
@@ -3,9 +3,211 @@ Carregamento de dados SEM pandas
 Implementação manual de leitura CSV e splits
 """
 import csv
+import hashlib
+import io
+import json
+import os
+
 import numpy as np
 
 
+def _parse_rows_slow(lines, n_cols, dtype):
+    """
+    Conversão linha a linha com as regras originais (csv.reader, float(),
+    campo vazio = 0.0); linhas inválidas ou com largura diferente são
+    descartadas
+
+    Returns:
+        values, n_cols, n_skipped
+    """
+    rows = []
+    n_skipped = 0
+    for line in lines:
+        text = line.decode('utf-8', errors='replace').strip('\r\n')
+        if not text.strip():
+            continue
+        try:
+            row = next(csv.reader([text]))
+            numeric_row = [float(val) if val != '' else 0.0 for val in row]
+        except (ValueError, StopIteration, csv.Error):
+            n_skipped += 1
+            continue
+        if n_cols is None:
+            n_cols = len(numeric_row)
+        if len(numeric_row) != n_cols:
+            n_skipped += 1
+            continue
+        rows.append(numeric_row)
+    values = np.array(rows, dtype=dtype).reshape(-1, n_cols or 0)
+    return values, n_cols, n_skipped
+
+
+def _fill_empty_fields(block, delimiter):
+    """
+    Preenche com 0 os campos vazios de um bloco (regra de _parse_rows_slow)
+
+    Um campo é vazio quando fica entre dois separadores ou entre um
+    separador e o início/fim da linha; linhas em branco não mudam.
+
+    Returns:
+        Bloco com os campos vazios trocados por b'0'
+    """
+    sep = delimiter.encode()
+    if sep + sep in block:
+        # Duas passadas: em ',,,' a primeira troca só pares disjuntos
+        block = block.replace(sep + sep, sep + b'0' + sep).replace(sep + sep, sep + b'0' + sep)
+    block = (block.replace(b'\n' + sep, b'\n0' + sep)
+             .replace(sep + b'\n', sep + b'0\n').replace(sep + b'\r', sep + b'0\r'))
+    if block.startswith(sep):
+        block = b'0' + block
+    if block.endswith(sep):
+        block += b'0'
+    return block
+
+
+def _parse_block(block, n_cols, delimiter, dtype):
+    """
+    Converte um bloco de linhas completas
+
+    Tenta o parser em C de np.loadtxt no bloco inteiro, com os campos
+    vazios já preenchidos com 0; se ele falhar (linha malformada, aspas),
+    divide o bloco ao meio recursivamente e só as partes pequenas com
+    problema usam a conversão linha a linha.
+
+    Returns:
+        values, n_cols, n_skipped
+    """
+    try:
+        values = np.loadtxt(io.BytesIO(_fill_empty_fields(block, delimiter)),
+                            delimiter=delimiter, dtype=dtype,
+                            ndmin=2, comments=None, encoding='latin1')
+        if len(values) == 0:
+            return np.empty((0, n_cols or 0), dtype=dtype), n_cols, 0
+        if n_cols is None or values.shape[1] == n_cols:
+            return values, values.shape[1], 0
+    except ValueError:
+        pass
+
+    lines = block.split(b'\n')
+    half = block.find(b'\n', len(block) // 2)
+    if len(lines) <= 32 or half < 0 or half + 1 >= len(block):
+        return _parse_rows_slow(lines, n_cols, dtype)
+    first, n_cols, skipped_first = _parse_block(block[:half + 1], n_cols, delimiter, dtype)
+    second, n_cols, skipped_second = _parse_block(block[half + 1:], n_cols, delimiter, dtype)
+    width = n_cols or 0
+    return (np.concatenate([first.reshape(-1, width), second.reshape(-1, width)]),
+            n_cols, skipped_first + skipped_second)
+
+
+class CSVBlockReader:
+    """
+    Iterador sobre os blocos de linhas convertidas de um CSV numérico
+
+    Lê blocos grandes de bytes (cortados no fim de uma linha) e converte
+    cada um com _parse_block; serve para processar arquivos maiores que a
+    memória bloco a bloco. Após a iteração, n_skipped tem o número de
+    linhas malformadas descartadas.
+    """
+
+    def __init__(self, filepath, delimiter=',', has_header=True, dtype=np.float64,
+                 block_bytes=8 * 1024 ** 2):
+        """
+        Abre o arquivo e lê o cabeçalho
+
+        Args:
+            filepath: Caminho do arquivo CSV
+            delimiter: Separador de colunas
+            has_header: Se True, a primeira linha é o cabeçalho
+            dtype: Tipo dos blocos (ex.: np.float32)
+            block_bytes: Tamanho aproximado de cada bloco lido
+        """
+        self.filepath = filepath
+        self.delimiter = delimiter
+        self.dtype = dtype
+        self.block_bytes = block_bytes
+        self.header = None
+        self.n_cols = None
+        self.n_skipped = 0
+        self.bytes_read = 0
+        if has_header:
+            with open(filepath, 'rb') as f:
+                first_line = f.readline()
+            self._start = len(first_line)
+            first_line = first_line.decode('utf-8', errors='replace').strip('\r\n')
+            self.header = next(csv.reader([first_line], delimiter=delimiter), [])
+        else:
+            self._start = 0
+
+    def __iter__(self):
+        """
+        Yields:
+            Array (n_linhas_do_bloco, n_colunas) de cada bloco não vazio
+        """
+        with open(self.filepath, 'rb') as f:
+            f.seek(self._start)
+            while True:
+                block = f.read(self.block_bytes)
+                if not block:
+                    break
+                block += f.readline()  # completa a última linha do bloco
+                self.bytes_read += len(block)
+
+                values, self.n_cols, skipped = _parse_block(block, self.n_cols,
+                                                             self.delimiter, self.dtype)
+                self.n_skipped += skipped
+                if len(values):
+                    yield values
+
+
+def read_numeric_csv(filepath, delimiter=',', has_header=True, dtype=np.float64,
+                     block_bytes=8 * 1024 ** 2):
+    """
+    Lê um CSV numérico em blocos grandes de bytes
+
+    Cada bloco (cortado no fim de uma linha) é convertido de uma vez pelo
+    parser em C de np.loadtxt e copiado para um array pré-alocado que
+    cresce por duplicação; a memória de pico é o resultado mais um bloco,
+    em vez das listas de listas de floats Python. Linhas malformadas
+    (valor não numérico, número de colunas diferente) são descartadas e
+    contadas; campos vazios valem 0.0 e linhas em branco são ignoradas,
+    como no carregamento original com csv.reader.
+
+    Args:
+        filepath: Caminho do arquivo CSV
+        delimiter: Separador de colunas
+        has_header: Se True, a primeira linha é o cabeçalho
+        dtype: Tipo do array de saída (ex.: np.float32)
+        block_bytes: Tamanho aproximado de cada bloco lido
+
+    Returns:
+        data: Array (n_linhas, n_colunas)
+        header: Lista com os nomes das colunas (ou None)
+        n_skipped: Número de linhas malformadas descartadas
+    """
+    file_size = os.path.getsize(filepath)
+    reader = CSVBlockReader(filepath, delimiter=delimiter, has_header=has_header,
+                            dtype=dtype, block_bytes=block_bytes)
+    n_rows = 0
+    data = None
+
+    for values in reader:
+        n_cols = values.shape[1]
+        if data is None:
+            # Capacidade estimada pela densidade de linhas do primeiro bloco
+            capacity = int(len(values) * file_size / reader.bytes_read * 1.05) + 1
+            data = np.empty((max(capacity, len(values)), n_cols), dtype=dtype)
+        elif n_rows + len(values) > len(data):
+            data.resize((max(2 * len(data), n_rows + len(values)), n_cols),
+                        refcheck=False)
+        data[n_rows:n_rows + len(values)] = values
+        n_rows += len(values)
+
+    if data is None:
+        return np.empty((0, reader.n_cols or 0), dtype=dtype), reader.header, reader.n_skipped
+    data.resize((n_rows, data.shape[1]), refcheck=False)
+    return data, reader.header, reader.n_skipped
+
+
 def load_csv_manual(filepath):
     """
     Carrega arquivo CSV sem usar pandas
@@ -17,21 +219,140 @@ def load_csv_manual(filepath):
         data: Array numpy com os dados
         header: Lista com os nomes das colunas
     """
-    data = []
-    with open(filepath, 'r') as file:
-        csv_reader = csv.reader(file)
-        header = next(csv_reader)
+    data, header, _ = read_numeric_csv(filepath)
+    return data, header
+
+
+# Versão do formato do cache binário (mudar invalida caches antigos)
+_CACHE_FORMAT = 1
+
+
+def file_fingerprint(filepath, chunk_bytes=8 * 1024 ** 2):
+    """
+    SHA-256 do conteúdo de um arquivo, lido em blocos
+
+    Args:
+        filepath: Caminho do arquivo
+        chunk_bytes: Tamanho de cada leitura
+
+    Returns:
+        String hexadecimal
+    """
+    h = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_bytes), b''):
+            h.update(chunk)
+    return h.hexdigest()
 
-        for row in csv_reader:
+
+def _cache_dir_for(filepath):
+    """Diretório do cache ao lado do arquivo (<nome>.npycache)"""
+    root, _ = os.path.splitext(filepath)
+    return root + '.npycache'
+
+
+def _read_cache_meta(cache_dir):
+    """JSON de metadados do cache, ou None se ausente/corrompido"""
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_cache(cache_dir, X, y, meta):
+    """
+    Grava X.npy, y.npy e meta.json; o meta.json é gravado por último (e
+    cada arquivo por os.replace), então um cache incompleto nunca é lido
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    for name, array in (('X.npy', X), ('y.npy', y)):
+        tmp = os.path.join(cache_dir, f'.{name}.tmp')
+        with open(tmp, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp, os.path.join(cache_dir, name))
+    _write_cache_meta(cache_dir, meta)
+
+
+def _write_cache_meta(cache_dir, meta):
+    """Grava meta.json de forma atômica"""
+    tmp = os.path.join(cache_dir, '.meta.json.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(cache_dir, 'meta.json'))
+
+
+def load_dataset_cached(filepath, target_column=-1, dtype=np.float64, cache_dir=None,
+                        mmap=True):
+    """
+    Carrega X e y de um CSV numérico com cache binário ao lado do arquivo
+
+    Na primeira leitura o CSV é convertido (read_numeric_csv) e salvo como
+    X.npy, y.npy e meta.json (colunas, dtype, linhas descartadas e a
+    identidade do arquivo de origem). Nas seguintes, os .npy são abertos
+    com np.load(mmap_mode='r'): sem conversão e sem cópia.
+
+    O cache vale enquanto tamanho e mtime do CSV não mudarem; se mudarem,
+    o SHA-256 do conteúdo decide: igual (arquivo apenas tocado/copiado)
+    reaproveita o cache, diferente o reconstrói.
+
+    Args:
+        filepath: Caminho do CSV
+        target_column: Índice da coluna alvo
+        dtype: Tipo dos arrays
+        cache_dir: Diretório do cache (padrão: <nome>.npycache ao lado do CSV)
+        mmap: Se True, retorna memmaps somente leitura
+
+    Returns:
+        X, y, info (dict com 'header', 'n_skipped' e 'from_cache')
+    """
+    cache_dir = cache_dir or _cache_dir_for(filepath)
+    stat = os.stat(filepath)
+    source = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    params = {'format': _CACHE_FORMAT, 'target_column': target_column,
+              'dtype': np.dtype(dtype).str}
+
+    meta = _read_cache_meta(cache_dir)
+    valid = meta is not None and meta.get('params') == params
+    if valid and any(meta['source'].get(key) != value for key, value in source.items()):
+        # Tamanho ou mtime mudaram: o conteúdo decide
+        content_hash = file_fingerprint(filepath)
+        valid = meta['source'].get('sha256') == content_hash
+        if valid:
+            meta['source'] = dict(source, sha256=content_hash)
             try:
-                # Converte cada valor para float
-                numeric_row = [float(val) if val != '' else 0.0 for val in row]
-                data.append(numeric_row)
-            except ValueError:
-                # Ignora linhas com problemas
-                continue
-
-    return np.array(data), header
+                _write_cache_meta(cache_dir, meta)
+            except OSError:
+                pass
+
+    if valid:
+        mode = 'r' if mmap else None
+        try:
+            X = np.load(os.path.join(cache_dir, 'X.npy'), mmap_mode=mode)
+            y = np.load(os.path.join(cache_dir, 'y.npy'), mmap_mode=mode)
+            return X, y, {'header': meta['header'], 'n_skipped': meta['n_skipped'],
+                          'from_cache': True}
+        except (OSError, ValueError):
+            pass
+
+    data, header, n_skipped = read_numeric_csv(filepath, dtype=dtype)
+    target = target_column % data.shape[1]
+    X = np.ascontiguousarray(np.delete(data, target, axis=1))
+    y = np.ascontiguousarray(data[:, target])
+    del data
+
+    meta = {
+        'params': params,
+        'source': dict(source, sha256=file_fingerprint(filepath)),
+        'header': header,
+        'n_skipped': n_skipped,
+        'shape': list(X.shape)
+    }
+    try:
+        _write_cache(cache_dir, X, y, meta)
+    except OSError:
+        pass  # diretório sem permissão de escrita: segue sem cache
+    return X, y, {'header': header, 'n_skipped': n_skipped, 'from_cache': False}
 
 
 def load_from_openml(dataset_id=46283):
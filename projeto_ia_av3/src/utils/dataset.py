@@ -0,0 +1,405 @@
+"""
+Datasets em streaming: lotes (X, y) lidos de arrays/memmaps, CSV ou store
+colunar, para treino e avaliação fora da memória
+SEM uso de pandas ou frameworks de deep learning
+"""
+import numpy as np
+
+from .column_store import ColumnStore
+from .data_loader import CSVBlockReader
+
+
+# Linhas por bloco lido de arrays e memmaps
+_CHUNK_ROWS = 65536
+
+
+def is_dataset(obj):
+    """Se obj é um Dataset (ou expõe iter_batches/iter_chunks)"""
+    return hasattr(obj, 'iter_batches') and hasattr(obj, 'iter_chunks')
+
+
+def _row_hash(index, random_seed):
+    """
+    Número em [0, 1) determinístico por linha (splitmix64 do índice global)
+
+    Define a qual parte de um split cada linha pertence sem guardar
+    índices: o mesmo em todas as passadas e em qualquer ordem de leitura.
+    """
+    h = index.astype(np.uint64) + np.uint64(random_seed * 0x9E3779B97F4A7C15 % 2 ** 64)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    h ^= h >> np.uint64(31)
+    return (h >> np.uint64(11)).astype(np.float64) / float(2 ** 53)
+
+
+def _batches(chunks, batch_size, shuffle_buffer=0, rng=None):
+    """
+    Reagrupa blocos (X, y) em lotes de batch_size linhas
+
+    Com shuffle_buffer > 0 as linhas passam por um buffer de tamanho
+    limitado: a cada bloco, buffer + bloco são permutados, os lotes
+    completos que excedem o buffer saem e o restante fica no buffer
+    (embaralhamento aproximado com memória O(shuffle_buffer + bloco)).
+
+    Yields:
+        X_batch, y_batch (o último lote pode ser menor)
+    """
+    pool_X = pool_y = None
+    for X, y in chunks:
+        if pool_X is not None and len(pool_X):
+            X = np.concatenate([pool_X, X])
+            y = np.concatenate([pool_y, y])
+        n_out = max(len(X) - shuffle_buffer, 0) // batch_size * batch_size
+        if shuffle_buffer > 0 and n_out:
+            order = rng.permutation(len(X))
+            X, y = X[order], y[order]
+        for start in range(0, n_out, batch_size):
+            yield X[start:start + batch_size], y[start:start + batch_size]
+        pool_X, pool_y = X[n_out:], y[n_out:]
+
+    if pool_X is not None and len(pool_X):
+        if shuffle_buffer > 0:
+            order = rng.permutation(len(pool_X))
+            pool_X, pool_y = pool_X[order], pool_y[order]
+        for start in range(0, len(pool_X), batch_size):
+            yield pool_X[start:start + batch_size], pool_y[start:start + batch_size]
+
+
+class Dataset:
+    """
+    Fonte de lotes (X, y) que não precisa caber na memória
+
+    Subclasses implementam _chunks, que produz blocos (X, y, índices
+    globais das linhas); a partir deles o Dataset oferece iteração por
+    blocos (iter_chunks), lotes com embaralhamento aproximado
+    (iter_batches), transformações preguiçosas (map) e split
+    treino/teste determinístico por linha (split).
+    """
+
+    def _chunks(self, rng=None):
+        """
+        Args:
+            rng: Generator para embaralhar a ordem dos blocos (se a fonte
+                permitir acesso aleatório); None = ordem original
+
+        Yields:
+            X, y, índices globais das linhas do bloco
+        """
+        raise NotImplementedError
+
+    def iter_chunks(self):
+        """
+        Itera sobre os blocos na ordem original
+
+        Yields:
+            X_chunk, y_chunk
+        """
+        for X, y, _ in self._chunks():
+            yield X, y
+
+    def iter_batches(self, batch_size=1024, shuffle_buffer=0, random_seed=None):
+        """
+        Itera em lotes de tamanho fixo
+
+        Args:
+            batch_size: Linhas por lote
+            shuffle_buffer: Linhas mantidas no buffer de embaralhamento
+                (0 = ordem original)
+            random_seed: Seed do embaralhamento
+
+        Yields:
+            X_batch, y_batch
+        """
+        rng = np.random.default_rng(random_seed) if shuffle_buffer > 0 else None
+        chunks = ((X, y) for X, y, _ in self._chunks(rng))
+        return _batches(chunks, batch_size, shuffle_buffer, rng)
+
+    def __iter__(self):
+        return self.iter_chunks()
+
+    @property
+    def n_features(self):
+        """Número de features (lido do primeiro bloco)"""
+        if getattr(self, '_n_features', None) is None:
+            X, _ = next(iter(self.iter_chunks()))
+            self._n_features = X.shape[1]
+        return self._n_features
+
+    def classes(self):
+        """
+        Labels distintas do alvo (uma passada, lendo só y; memoizado)
+
+        Returns:
+            Array ordenado de classes
+        """
+        if getattr(self, '_classes', None) is None:
+            classes = None
+            for _, y in self.iter_chunks():
+                classes = np.unique(y) if classes is None else np.union1d(classes, y)
+            self._classes = classes
+        return self._classes
+
+    def n_rows(self):
+        """Número de linhas (uma passada)"""
+        return sum(len(y) for _, y in self.iter_chunks())
+
+    def sample_targets(self, max_rows=1000000, random_seed=42):
+        """
+        Amostra uniforme de até max_rows valores do alvo (reservoir)
+
+        Args:
+            max_rows: Tamanho máximo da amostra
+            random_seed: Seed
+
+        Returns:
+            Array com a amostra
+        """
+        rng = np.random.default_rng(random_seed)
+        keys, values, n_buffered = [], [], 0
+
+        def _trim():
+            all_keys, all_values = np.concatenate(keys), np.concatenate(values)
+            if len(all_keys) > max_rows:
+                keep = np.argpartition(all_keys, max_rows)[:max_rows]
+                all_keys, all_values = all_keys[keep], all_values[keep]
+            return [all_keys], [all_values], len(all_keys)
+
+        for _, y in self.iter_chunks():
+            keys.append(rng.random(len(y)))
+            values.append(np.asarray(y, dtype=np.float64))
+            n_buffered += len(y)
+            # Concatena só quando o buffer dobra (custo amortizado linear)
+            if n_buffered > 2 * max_rows:
+                keys, values, n_buffered = _trim()
+        if not keys:
+            return np.empty(0)
+        return _trim()[1][0]
+
+    def map(self, X_fn=None, y_fn=None):
+        """
+        Dataset com funções aplicadas a cada bloco (preguiçoso)
+
+        Args:
+            X_fn: Função sobre o bloco de features (ex.: scaler.transform)
+            y_fn: Função sobre o bloco do alvo (ex.: binarização)
+
+        Returns:
+            MappedDataset
+        """
+        return MappedDataset(self, X_fn, y_fn)
+
+    def split(self, test_size=0.2, random_seed=42):
+        """
+        Divide em treino e teste pelo hash do índice de cada linha
+
+        Args:
+            test_size: Fração aproximada das linhas no teste
+            random_seed: Seed
+
+        Returns:
+            train, test (Datasets)
+        """
+        return (FilteredDataset(self, lambda u: u >= test_size, random_seed),
+                FilteredDataset(self, lambda u: u < test_size, random_seed))
+
+    @staticmethod
+    def from_arrays(X, y, chunk_rows=_CHUNK_ROWS):
+        """Dataset sobre arrays ou memmaps"""
+        return ArrayDataset(X, y, chunk_rows=chunk_rows)
+
+    @staticmethod
+    def from_npy(x_path, y_path, chunk_rows=_CHUNK_ROWS):
+        """Dataset sobre arquivos .npy abertos como memmap (sem carregá-los)"""
+        return ArrayDataset(np.load(x_path, mmap_mode='r'), np.load(y_path, mmap_mode='r'),
+                            chunk_rows=chunk_rows)
+
+    @staticmethod
+    def from_csv(filepath, target_column=-1, **kwargs):
+        """Dataset lido do CSV bloco a bloco (opções de CSVDataset)"""
+        return CSVDataset(filepath, target_column=target_column, **kwargs)
+
+    @staticmethod
+    def from_column_store(store, target, columns=None, where=None):
+        """Dataset sobre um ColumnStore (ou o caminho dele)"""
+        return ColumnStoreDataset(store, target, columns=columns, where=where)
+
+
+class ArrayDataset(Dataset):
+    """
+    Dataset sobre X e y em memória ou memmap (.npy)
+
+    Os blocos são fatias contíguas (views, sem cópia); ao embaralhar, a
+    ordem dos blocos também é sorteada, já que o acesso é aleatório.
+    """
+
+    def __init__(self, X, y, chunk_rows=_CHUNK_ROWS):
+        """
+        Args:
+            X: Features (n_samples, n_features)
+            y: Alvo (n_samples,)
+            chunk_rows: Linhas por bloco
+        """
+        if len(X) != len(y):
+            raise ValueError("X e y com números de linhas diferentes")
+        self.X = X
+        self.y = y
+        self.chunk_rows = chunk_rows
+
+    def _chunks(self, rng=None):
+        starts = np.arange(0, len(self.X), self.chunk_rows)
+        if rng is not None:
+            starts = rng.permutation(starts)
+        for start in starts:
+            stop = min(start + self.chunk_rows, len(self.X))
+            yield (np.asarray(self.X[start:stop]), np.asarray(self.y[start:stop]),
+                   np.arange(start, stop))
+
+    def n_rows(self):
+        return len(self.X)
+
+
+class CSVDataset(Dataset):
+    """
+    Dataset lido de um CSV numérico bloco a bloco (CSVBlockReader)
+
+    Cada passada relê o arquivo; a memória é a de um bloco.
+    """
+
+    def __init__(self, filepath, target_column=-1, delimiter=',', has_header=True,
+                 dtype=np.float64, block_bytes=8 * 1024 ** 2):
+        """
+        Args:
+            filepath: Caminho do CSV
+            target_column: Índice da coluna alvo
+            delimiter: Separador de colunas
+            has_header: Se True, a primeira linha é o cabeçalho
+            dtype: Tipo das features
+            block_bytes: Tamanho aproximado de cada bloco lido
+        """
+        self.filepath = filepath
+        self.target_column = target_column
+        self.delimiter = delimiter
+        self.has_header = has_header
+        self.dtype = dtype
+        self.block_bytes = block_bytes
+        self.n_skipped = 0
+
+    def _chunks(self, rng=None):
+        reader = CSVBlockReader(self.filepath, delimiter=self.delimiter,
+                                has_header=self.has_header, dtype=self.dtype,
+                                block_bytes=self.block_bytes)
+        n_seen = 0
+        for block in reader:
+            target = self.target_column % block.shape[1]
+            yield (np.delete(block, target, axis=1), block[:, target],
+                   np.arange(n_seen, n_seen + len(block)))
+            n_seen += len(block)
+        self.n_skipped = reader.n_skipped
+
+
+class ColumnStoreDataset(Dataset):
+    """
+    Dataset sobre um ColumnStore: lê só as colunas usadas e pula blocos
+    pelos predicados de `where`
+    """
+
+    def __init__(self, store, target, columns=None, where=None):
+        """
+        Args:
+            store: ColumnStore ou caminho do store
+            target: Coluna alvo
+            columns: Colunas de features (None = todas menos target)
+            where: Predicados de valor, como em ColumnStore.iter_chunks
+        """
+        self.store = ColumnStore(store) if isinstance(store, str) else store
+        self.target = target
+        if columns is None:
+            target_index = self.store._column_indices([target])[0]
+            columns = [c for j, c in enumerate(self.store.columns) if j != target_index]
+        self.columns = list(columns)
+        self.where = where
+        self._n_features = len(self.columns)
+
+    def _chunks(self, rng=None):
+        for block, index in self.store.iter_chunks(self.columns + [self.target],
+                                                   where=self.where, with_index=True):
+            yield block[:, :-1], block[:, -1], index
+
+
+class MappedDataset(Dataset):
+    """Dataset com funções aplicadas a X e/ou y de cada bloco"""
+
+    def __init__(self, source, X_fn=None, y_fn=None):
+        self.source = source
+        self.X_fn = X_fn
+        self.y_fn = y_fn
+
+    def _chunks(self, rng=None):
+        for X, y, index in self.source._chunks(rng):
+            yield (X if self.X_fn is None else self.X_fn(X),
+                   y if self.y_fn is None else self.y_fn(y), index)
+
+
+class FilteredDataset(Dataset):
+    """Linhas de um Dataset selecionadas pelo hash do índice (split)"""
+
+    def __init__(self, source, keep, random_seed):
+        self.source = source
+        self.keep = keep
+        self.random_seed = random_seed
+
+    def _chunks(self, rng=None):
+        for X, y, index in self.source._chunks(rng):
+            mask = self.keep(_row_hash(index, self.random_seed))
+            if np.any(mask):
+                yield X[mask], y[mask], index[mask]
+
+
+def fit_dataset(estimator, dataset, batch_size=8192, shuffle_buffer=65536, random_seed=42,
+                classes=None, **fit_params):
+    """
+    Ajusta um estimador sobre um Dataset
+
+    Estimadores com suporte a streaming (accepts_dataset = True) recebem o
+    Dataset em fit. Os demais são ajustados com partial_fit: em uma única
+    passada pelos blocos se não tiverem épocas (Naive Bayes, KNN, cujo
+    partial_fit é exato); se tiverem n_epochs, em n_epochs passadas por
+    lotes embaralhados com uma época de partial_fit por lote, como as
+    épocas de fit sobre o dataset inteiro (e não n_epochs sobre cada bloco
+    em sequência).
+
+    Args:
+        estimator: Estimador ou transformador
+        dataset: Dataset
+        batch_size: Linhas por lote (modelos com épocas)
+        shuffle_buffer: Linhas do buffer de embaralhamento (modelos com épocas)
+        random_seed: Seed do embaralhamento de cada época
+        classes: Classes do alvo para partial_fit (padrão: dataset.classes();
+            None para regressores, is_regressor = True)
+        **fit_params: Repassados a fit (estimadores com streaming)
+
+    Returns:
+        estimator
+    """
+    if getattr(estimator, 'accepts_dataset', False):
+        return estimator.fit(dataset, **fit_params)
+    if not hasattr(estimator, 'partial_fit'):
+        raise TypeError(f"{type(estimator).__name__} não tem partial_fit nem suporte a Dataset")
+
+    if classes is None and not getattr(estimator, 'is_regressor', False):
+        classes = dataset.classes()
+    n_epochs = (estimator.get_params() if hasattr(estimator, 'get_params') else {}).get('n_epochs')
+    if n_epochs is None:
+        for X, y in dataset.iter_chunks():
+            estimator.partial_fit(X, y, classes=classes)
+        return estimator
+
+    estimator.set_params(n_epochs=1)
+    try:
+        for epoch in range(n_epochs):
+            for X, y in dataset.iter_batches(batch_size, shuffle_buffer=shuffle_buffer,
+                                             random_seed=random_seed + epoch):
+                estimator.partial_fit(X, y, classes=classes)
+    finally:
+        estimator.set_params(n_epochs=n_epochs)
+    return estimator
@@ -2,12 +2,281 @@
 Métricas de avaliação implementadas manualmente
 SEM uso de scikit-learn
 """
+import math
+
 import numpy as np
 
 
+class LabelEncoder:
+    """
+    Mapeamento de labels arbitrárias para índices 0..n_classes-1
+
+    Labels inteiras usam uma tabela de consulta (O(n)); as demais,
+    busca binária sobre as classes ordenadas.
+    """
+
+    def __init__(self, classes):
+        """
+        Args:
+            classes: Classes ordenadas e sem repetição
+        """
+        self.classes_ = np.asarray(classes)
+        self._table = None
+        if self.classes_.dtype.kind in 'iu' and len(self.classes_):
+            self._offset = int(self.classes_[0])
+            span = int(self.classes_[-1]) - self._offset + 1
+            if span <= 4 * len(self.classes_) + 1024:
+                self._table = np.full(span, -1, dtype=np.intp)
+                self._table[self.classes_ - self._offset] = np.arange(len(self.classes_))
+
+    def transform(self, y):
+        """
+        Args:
+            y: Labels (todas presentes em classes_)
+
+        Returns:
+            Array de índices
+        """
+        y = np.asarray(y)
+        if self._table is not None:
+            return self._table[y - self._offset]
+        return np.searchsorted(self.classes_, y)
+
+
+# Encoders já construídos, por conjunto de classes
+_ENCODERS = {}
+
+
+def get_label_encoder(classes):
+    """
+    LabelEncoder (em cache) para um conjunto de classes
+
+    Args:
+        classes: Classes ordenadas e sem repetição
+
+    Returns:
+        LabelEncoder
+    """
+    classes = np.asarray(classes)
+    key = (classes.dtype.str, classes.tobytes())
+    encoder = _ENCODERS.get(key)
+    if encoder is None:
+        if len(_ENCODERS) >= 64:
+            _ENCODERS.clear()
+        encoder = _ENCODERS[key] = LabelEncoder(classes)
+    return encoder
+
+
+def _as_index_labels(y):
+    """
+    Retorna y como inteiros se as labels já forem índices (inteiros >= 0,
+    inclusive floats inteiros); caso contrário, None
+    """
+    y = np.asarray(y)
+    if y.dtype.kind in 'iu':
+        return y if len(y) == 0 or y.min() >= 0 else None
+    if y.dtype.kind == 'f' and len(y) and y.min() >= 0 and np.all(y == np.floor(y)):
+        return y.astype(np.intp)
+    if y.dtype.kind == 'b':
+        return y.astype(np.intp)
+    return None
+
+
+def _dense_n_classes(*label_arrays):
+    """
+    Tamanho da matriz indexada diretamente por labels índices (maior
+    label + 1), ou None se as labels forem esparsas demais para isso
+    (ex.: [0, 200000]) e devem passar pelo LabelEncoder; mesmo critério
+    da tabela de consulta do LabelEncoder
+    """
+    n_classes = int(max(idx.max(initial=-1) for idx in label_arrays)) + 1
+    if n_classes <= 1024:
+        return n_classes
+    n_distinct = len(np.unique(np.concatenate(label_arrays)))
+    return n_classes if n_classes <= 4 * n_distinct + 1024 else None
+
+
+def _binary_positions(classes):
+    """Posições das labels 0 (negativa) e 1 (positiva) na matriz, ou None"""
+    index = {label: i for i, label in enumerate(np.asarray(classes).tolist())}
+    return index.get(0), index.get(1)
+
+
+class MetricsReport:
+    """
+    Métricas de classificação derivadas de uma única matriz de confusão
+
+    A matriz é montada uma vez com np.bincount(true * n_classes + pred) e
+    todas as métricas (acurácia, precisão, recall e F1 com médias binary,
+    macro, micro e weighted) saem de operações vetorizadas sobre ela.
+
+    Labels que já são índices (inteiros >= 0) e densas indexam a matriz
+    diretamente, com n_classes = maior label + 1, como em
+    confusion_matrix_manual; as demais (negativas, esparsas como
+    [0, 200000], strings) são codificadas por um LabelEncoder em cache e
+    a matriz tem só as classes presentes.
+    """
+
+    def __init__(self, y_true, y_pred, n_classes=None, zero_division=0):
+        """
+        Constrói a matriz de confusão
+
+        Args:
+            y_true: Labels verdadeiros
+            y_pred: Labels preditos
+            n_classes: Número de classes (labels devem ser índices)
+            zero_division: Valor usado quando uma divisão é por zero
+        """
+        self.zero_division = zero_division
+
+        true_idx = _as_index_labels(y_true)
+        pred_idx = _as_index_labels(y_pred)
+        if true_idx is not None and pred_idx is not None and n_classes is None:
+            n_classes = _dense_n_classes(true_idx, pred_idx)
+            if n_classes is None:
+                true_idx = pred_idx = None
+        if true_idx is not None and pred_idx is not None:
+            self.classes_ = np.arange(n_classes)
+        else:
+            if n_classes is not None:
+                raise ValueError("n_classes exige labels inteiras a partir de 0")
+            self.classes_ = np.union1d(np.unique(y_true), np.unique(y_pred))
+            encoder = get_label_encoder(self.classes_)
+            true_idx = encoder.transform(y_true)
+            pred_idx = encoder.transform(y_pred)
+            n_classes = len(self.classes_)
+
+        codes = true_idx * n_classes + pred_idx
+        self._set_matrix(np.bincount(
+            codes, minlength=n_classes * n_classes).reshape(n_classes, n_classes))
+
+    @classmethod
+    def from_confusion_matrix(cls, confusion_matrix, classes=None, zero_division=0):
+        """
+        Cria o relatório a partir de uma matriz de confusão já contada
+
+        Args:
+            confusion_matrix: Matriz (n_classes, n_classes), linhas = verdadeiro
+            classes: Labels das linhas/colunas (padrão: 0..n_classes-1)
+            zero_division: Valor usado quando uma divisão é por zero
+
+        Returns:
+            MetricsReport
+        """
+        report = cls.__new__(cls)
+        report.zero_division = zero_division
+        confusion_matrix = np.asarray(confusion_matrix)
+        report.classes_ = (np.arange(len(confusion_matrix)) if classes is None
+                           else np.asarray(classes))
+        report._set_matrix(confusion_matrix)
+        return report
+
+    def _set_matrix(self, confusion_matrix):
+        """Guarda a matriz e os totais derivados dela"""
+        self.confusion_matrix = confusion_matrix
+        self.n_classes = len(confusion_matrix)
+        self.n_samples = int(confusion_matrix.sum())
+        self.tp = np.diag(self.confusion_matrix)
+        self.support = self.confusion_matrix.sum(axis=1)         # tp + fn
+        self.predicted = self.confusion_matrix.sum(axis=0)       # tp + fp
+
+    def _ratio(self, num, den):
+        """num / den elemento a elemento, com zero_division onde den == 0"""
+        num = np.asarray(num, dtype=float)
+        den = np.asarray(den, dtype=float)
+        out = np.full(np.shape(num), float(self.zero_division))
+        np.divide(num, den, out=out, where=den > 0)
+        return out
+
+    def _binary_counts(self):
+        """
+        tp, fp e fn da classe 1 contra a classe 0 (submatriz 2x2 das
+        labels 0 e 1, como na definição binária original)
+        """
+        neg, pos = _binary_positions(self.classes_)
+        cm = self.confusion_matrix
+        tp = cm[pos, pos] if pos is not None else 0
+        fp = cm[neg, pos] if pos is not None and neg is not None else 0
+        fn = cm[pos, neg] if pos is not None and neg is not None else 0
+        return tp, fp, fn
+
+    def _average(self, per_class, average):
+        """
+        Aplica a média pedida a uma métrica por classe
+
+        Args:
+            per_class: Métrica de cada classe
+            average: 'macro', 'micro' ou 'weighted'
+        """
+        if average == 'macro':
+            return np.mean(per_class)
+        elif average == 'micro':
+            # tp global / total: igual para precisão e recall
+            if self.n_samples == 0:
+                return self.zero_division
+            return np.trace(self.confusion_matrix) / self.n_samples
+        elif average == 'weighted':
+            return np.average(per_class, weights=self.support)
+        raise ValueError(f"average '{average}' não suportado")
+
+    def precision_per_class(self):
+        """Precisão de cada classe"""
+        return self._ratio(self.tp, self.predicted)
+
+    def recall_per_class(self):
+        """Recall de cada classe"""
+        return self._ratio(self.tp, self.support)
+
+    def accuracy(self):
+        """Acurácia"""
+        return np.trace(self.confusion_matrix) / self.n_samples
+
+    def precision(self, average='binary'):
+        """Precisão com a média indicada"""
+        if average == 'binary':
+            tp, fp, _ = self._binary_counts()
+            return tp / (tp + fp) if tp + fp > 0 else self.zero_division
+        return self._average(self.precision_per_class(), average)
+
+    def recall(self, average='binary'):
+        """Recall com a média indicada"""
+        if average == 'binary':
+            tp, _, fn = self._binary_counts()
+            return tp / (tp + fn) if tp + fn > 0 else self.zero_division
+        return self._average(self.recall_per_class(), average)
+
+    def f1(self, average='binary'):
+        """
+        F1 como média harmônica da precisão e do recall já agregados
+        (mesma definição de f1_score)
+        """
+        precision = self.precision(average)
+        recall = self.recall(average)
+        if precision + recall == 0:
+            return self.zero_division
+        return 2 * (precision * recall) / (precision + recall)
+
+    def as_dict(self, average='macro'):
+        """
+        Métricas principais
+
+        Args:
+            average: Média usada em precisão, recall e F1
+
+        Returns:
+            Dict com 'accuracy', 'precision', 'recall' e 'f1_score'
+        """
+        return {
+            'accuracy': self.accuracy(),
+            'precision': self.precision(average),
+            'recall': self.recall(average),
+            'f1_score': self.f1(average)
+        }
+
+
 def accuracy_score(y_true, y_pred):
     """
-    Calcula acurácia manualmente
+    Calcula acurácia
 
     Args:
         y_true: Labels verdadeiros
@@ -16,16 +285,17 @@ def accuracy_score(y_true, y_pred):
     Returns:
         Acurácia (float entre 0 e 1)
     """
-    correct = 0
-    for i in range(len(y_true)):
-        if y_true[i] == y_pred[i]:
-            correct += 1
-    return correct / len(y_true)
+    # Não precisa da matriz de confusão: só das igualdades
+    y_true = np.asarray(y_true)
+    y_pred = np.asarray(y_pred)
+    if len(y_true) != len(y_pred):
+        raise ValueError("y_true e y_pred com tamanhos diferentes")
+    return float(np.count_nonzero(y_true == y_pred)) / len(y_true)
 
 
 def confusion_matrix_manual(y_true, y_pred, n_classes=None):
     """
-    Calcula matriz de confusão manualmente
+    Calcula matriz de confusão
 
     Args:
         y_true: Labels verdadeiros
@@ -35,20 +305,12 @@ def confusion_matrix_manual(y_true, y_pred, n_classes=None):
     Returns:
         Matriz de confusão (numpy array)
     """
-    if n_classes is None:
-        n_classes = max(max(y_true), max(y_pred)) + 1
-
-    cm = np.zeros((n_classes, n_classes), dtype=int)
-
-    for true, pred in zip(y_true, y_pred):
-        cm[int(true), int(pred)] += 1
-
-    return cm
+    return MetricsReport(y_true, y_pred, n_classes=n_classes).confusion_matrix
 
 
 def precision_score(y_true, y_pred, average='binary', zero_division=0):
     """
-    Calcula precisão manualmente
+    Calcula precisão
 
     Args:
         y_true: Labels verdadeiros
@@ -59,56 +321,12 @@ def precision_score(y_true, y_pred, average='binary', zero_division=0):
     Returns:
         Precisão (float)
     """
-    cm = confusion_matrix_manual(y_true, y_pred)
-    n_classes = cm.shape[0]
-
-    if average == 'binary':
-        # Para classificação binária
-        tp = cm[1, 1]
-        fp = cm[0, 1]
-        if tp + fp == 0:
-            return zero_division
-        return tp / (tp + fp)
-
-    elif average == 'macro':
-        # Média não ponderada das precisões por classe
-        precisions = []
-        for i in range(n_classes):
-            tp = cm[i, i]
-            fp = cm[:, i].sum() - tp
-            if tp + fp == 0:
-                precisions.append(zero_division)
-            else:
-                precisions.append(tp / (tp + fp))
-        return np.mean(precisions)
-
-    elif average == 'micro':
-        # Calcula globalmente
-        tp_sum = np.trace(cm)
-        fp_sum = cm.sum() - tp_sum
-        if tp_sum + fp_sum == 0:
-            return zero_division
-        return tp_sum / (tp_sum + fp_sum)
-
-    elif average == 'weighted':
-        # Média ponderada pelo número de amostras por classe
-        precisions = []
-        weights = []
-        for i in range(n_classes):
-            tp = cm[i, i]
-            fp = cm[:, i].sum() - tp
-            weight = cm[i, :].sum()
-            weights.append(weight)
-            if tp + fp == 0:
-                precisions.append(zero_division)
-            else:
-                precisions.append(tp / (tp + fp))
-        return np.average(precisions, weights=weights)
+    return MetricsReport(y_true, y_pred, zero_division=zero_division).precision(average)
 
 
 def recall_score(y_true, y_pred, average='binary', zero_division=0):
     """
-    Calcula recall (sensibilidade) manualmente
+    Calcula recall (sensibilidade)
 
     Args:
         y_true: Labels verdadeiros
@@ -119,56 +337,12 @@ def recall_score(y_true, y_pred, average='binary', zero_division=0):
     Returns:
         Recall (float)
     """
-    cm = confusion_matrix_manual(y_true, y_pred)
-    n_classes = cm.shape[0]
-
-    if average == 'binary':
-        # Para classificação binária
-        tp = cm[1, 1]
-        fn = cm[1, 0]
-        if tp + fn == 0:
-            return zero_division
-        return tp / (tp + fn)
-
-    elif average == 'macro':
-        # Média não ponderada dos recalls por classe
-        recalls = []
-        for i in range(n_classes):
-            tp = cm[i, i]
-            fn = cm[i, :].sum() - tp
-            if tp + fn == 0:
-                recalls.append(zero_division)
-            else:
-                recalls.append(tp / (tp + fn))
-        return np.mean(recalls)
-
-    elif average == 'micro':
-        # Calcula globalmente
-        tp_sum = np.trace(cm)
-        fn_sum = cm.sum() - tp_sum
-        if tp_sum + fn_sum == 0:
-            return zero_division
-        return tp_sum / (tp_sum + fn_sum)
-
-    elif average == 'weighted':
-        # Média ponderada pelo número de amostras por classe
-        recalls = []
-        weights = []
-        for i in range(n_classes):
-            tp = cm[i, i]
-            fn = cm[i, :].sum() - tp
-            weight = cm[i, :].sum()
-            weights.append(weight)
-            if tp + fn == 0:
-                recalls.append(zero_division)
-            else:
-                recalls.append(tp / (tp + fn))
-        return np.average(recalls, weights=weights)
+    return MetricsReport(y_true, y_pred, zero_division=zero_division).recall(average)
 
 
 def f1_score(y_true, y_pred, average='binary', zero_division=0):
     """
-    Calcula F1-Score manualmente
+    Calcula F1-Score
 
     Args:
         y_true: Labels verdadeiros
@@ -179,13 +353,7 @@ def f1_score(y_true, y_pred, average='binary', zero_division=0):
     Returns:
         F1-Score (float)
     """
-    precision = precision_score(y_true, y_pred, average=average, zero_division=zero_division)
-    recall = recall_score(y_true, y_pred, average=average, zero_division=zero_division)
-
-    if precision + recall == 0:
-        return zero_division
-
-    return 2 * (precision * recall) / (precision + recall)
+    return MetricsReport(y_true, y_pred, zero_division=zero_division).f1(average)
 
 
 def mean_squared_error(y_true, y_pred):
@@ -248,8 +416,8 @@ def classification_report(y_true, y_pred, class_names=None):
     Returns:
         String formatada com métricas
     """
-    cm = confusion_matrix_manual(y_true, y_pred)
-    n_classes = cm.shape[0]
+    report_data = MetricsReport(y_true, y_pred)
+    n_classes = report_data.n_classes
 
     if class_names is None:
         class_names = [f"Class {i}" for i in range(n_classes)]
@@ -259,24 +427,767 @@ def classification_report(y_true, y_pred, class_names=None):
     report += f"{'Class':<20} {'Precision':<12} {'Recall':<12} {'F1-Score':<12}\n"
     report += "-" * 60 + "\n"
 
-    for i in range(n_classes):
-        # Calcula métricas por classe
-        tp = cm[i, i]
-        fp = cm[:, i].sum() - tp
-        fn = cm[i, :].sum() - tp
+    # Métricas por classe
+    precisions = report_data.precision_per_class()
+    recalls = report_data.recall_per_class()
+    f1s = report_data._ratio(2 * precisions * recalls, precisions + recalls)
 
-        precision = tp / (tp + fp) if (tp + fp) > 0 else 0
-        recall = tp / (tp + fn) if (tp + fn) > 0 else 0
-        f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
-
-        report += f"{class_names[i]:<20} {precision:<12.4f} {recall:<12.4f} {f1:<12.4f}\n"
+    for i in range(n_classes):
+        report += (f"{class_names[i]:<20} {precisions[i]:<12.4f} {recalls[i]:<12.4f} "
+                   f"{f1s[i]:<12.4f}\n")
 
     # Métricas globais
-    accuracy = accuracy_score(y_true, y_pred)
-    macro_f1 = f1_score(y_true, y_pred, average='macro')
-
     report += "=" * 60 + "\n"
-    report += f"Accuracy: {accuracy:.4f}\n"
-    report += f"Macro F1-Score: {macro_f1:.4f}\n"
+    report += f"Accuracy: {report_data.accuracy():.4f}\n"
+    report += f"Macro F1-Score: {report_data.f1('macro'):.4f}\n"
 
     return report
+
+
+class ConfusionAccumulator:
+    """
+    Matriz de confusão acumulada em streaming
+
+    Cada update soma o bincount de um lote, então a memória é
+    O(n_classes²) independente do número de predições. Acumuladores de
+    processos diferentes podem ser combinados com merge (são picklable).
+    """
+
+    def __init__(self, n_classes=None, classes=None, zero_division=0):
+        """
+        Inicializa o acumulador vazio
+
+        Args:
+            n_classes: Número inicial de classes (labels índices; a matriz
+                cresce se aparecer label maior, desde que não muito além
+                das já vistas; labels esparsas exigem 'classes')
+            classes: Conjunto fixo de labels arbitrárias (strings,
+                negativas, esparsas); obrigatório para labels não índices
+            zero_division: Valor usado quando uma divisão é por zero
+        """
+        self.zero_division = zero_division
+        self.classes_ = None
+        self._encoder = None
+        if classes is not None:
+            self.classes_ = np.unique(classes)
+            self._encoder = get_label_encoder(self.classes_)
+            n_classes = len(self.classes_)
+        n_classes = n_classes or 0
+        self.confusion_matrix = np.zeros((n_classes, n_classes), dtype=np.int64)
+
+    @property
+    def n_classes(self):
+        """Número de classes atual"""
+        return len(self.confusion_matrix)
+
+    @property
+    def n_samples(self):
+        """Total de predições acumuladas"""
+        return int(self.confusion_matrix.sum())
+
+    def _grow(self, n_classes):
+        """Aumenta a matriz para n_classes (só labels índices)"""
+        if n_classes > self.n_classes:
+            pad = n_classes - self.n_classes
+            self.confusion_matrix = np.pad(self.confusion_matrix, ((0, pad), (0, pad)))
+
+    def _encode(self, y):
+        """Converte um lote de labels em índices da matriz"""
+        if self._encoder is None:
+            idx = _as_index_labels(y)
+            if idx is None:
+                raise ValueError("labels que não são índices exigem 'classes'")
+            return idx
+        y = np.asarray(y)
+        idx = np.searchsorted(self.classes_, y)
+        known = np.take(self.classes_, idx, mode='clip') == y
+        if not np.all(known):
+            unknown = np.unique(y[~known])
+            raise ValueError(f"labels fora de 'classes': {unknown[:5].tolist()}")
+        return idx
+
+    def update(self, y_true, y_pred):
+        """
+        Acumula um lote de predições
+
+        Args:
+            y_true: Labels verdadeiros do lote
+            y_pred: Labels preditos do lote
+
+        Returns:
+            self
+        """
+        true_idx = self._encode(y_true)
+        pred_idx = self._encode(y_pred)
+        if len(true_idx) != len(pred_idx):
+            raise ValueError("y_true e y_pred com tamanhos diferentes")
+        if len(true_idx) == 0:
+            return self
+        if self._encoder is None:
+            needed = int(max(true_idx.max(), pred_idx.max())) + 1
+            if needed > self.n_classes:
+                # Só cresce até labels próximas das já vistas: uma label
+                # esparsa (ex.: 150000) alocaria uma matriz de needed²
+                n_distinct = len(np.union1d(true_idx, pred_idx))
+                if needed > 4 * (self.n_classes + n_distinct) + 1024:
+                    raise ValueError(f"label {needed - 1} esparsa demais para labels "
+                                     f"índices; informe 'classes'")
+                self._grow(needed)
+
+        n = self.n_classes
+        self.confusion_matrix += np.bincount(
+            true_idx * n + pred_idx, minlength=n * n).reshape(n, n)
+        return self
+
+    def merge(self, other):
+        """
+        Soma outro acumulador a este (ex.: de outro processo)
+
+        Args:
+            other: ConfusionAccumulator com as mesmas classes
+
+        Returns:
+            self
+        """
+        if (self.classes_ is None) != (other.classes_ is None) or (
+                self.classes_ is not None
+                and not np.array_equal(self.classes_, other.classes_)):
+            raise ValueError("acumuladores com classes diferentes")
+        self._grow(other.n_classes)
+        n = other.n_classes
+        self.confusion_matrix[:n, :n] += other.confusion_matrix
+        return self
+
+    def result(self):
+        """
+        Métricas do que foi acumulado
+
+        Returns:
+            MetricsReport sobre a matriz acumulada
+        """
+        return MetricsReport.from_confusion_matrix(
+            self.confusion_matrix.copy(), classes=self.classes_,
+            zero_division=self.zero_division)
+
+
+class RegressionAccumulator:
+    """
+    MSE, MAE e R² acumulados em streaming com memória O(1)
+
+    Guarda contagem, média e soma dos desvios quadráticos de y_true
+    (combinadas pela fórmula de Chan et al.) e as somas dos erros
+    quadráticos e absolutos. Saídas multidimensionais são achatadas, como
+    nas funções mean_squared_error/r2_score sobre arrays 2D.
+    """
+
+    def __init__(self):
+        """Inicializa o acumulador vazio"""
+        self.n_samples = 0
+        self.mean_true = 0.0
+        self.m2_true = 0.0
+        self.sum_squared_error = 0.0
+        self.sum_absolute_error = 0.0
+
+    def _combine(self, n, mean, m2, sse, sae):
+        """Junta estatísticas de outro bloco às atuais"""
+        total = self.n_samples + n
+        delta = mean - self.mean_true
+        self.m2_true += m2 + delta * delta * self.n_samples * n / total
+        self.mean_true += delta * n / total
+        self.n_samples = total
+        self.sum_squared_error += sse
+        self.sum_absolute_error += sae
+
+    def update(self, y_true, y_pred):
+        """
+        Acumula um lote de predições
+
+        Args:
+            y_true: Valores verdadeiros do lote
+            y_pred: Valores preditos do lote
+
+        Returns:
+            self
+        """
+        y_true = np.asarray(y_true, dtype=float).ravel()
+        y_pred = np.asarray(y_pred, dtype=float).ravel()
+        if len(y_true) != len(y_pred):
+            raise ValueError("y_true e y_pred com tamanhos diferentes")
+        if len(y_true) == 0:
+            return self
+
+        errors = y_true - y_pred
+        mean = y_true.mean()
+        centered = y_true - mean
+        self._combine(len(y_true), mean, centered @ centered,
+                      errors @ errors, np.abs(errors).sum())
+        return self
+
+    def merge(self, other):
+        """
+        Soma outro acumulador a este (ex.: de outro processo)
+
+        Args:
+            other: RegressionAccumulator
+
+        Returns:
+            self
+        """
+        if other.n_samples:
+            self._combine(other.n_samples, other.mean_true, other.m2_true,
+                          other.sum_squared_error, other.sum_absolute_error)
+        return self
+
+    def result(self):
+        """
+        Métricas do que foi acumulado
+
+        Returns:
+            Dict com 'mse', 'mae' e 'r2'
+        """
+        if self.n_samples == 0:
+            raise ValueError("nenhuma predição acumulada")
+        return {
+            'mse': self.sum_squared_error / self.n_samples,
+            'mae': self.sum_absolute_error / self.n_samples,
+            'r2': (1 - self.sum_squared_error / self.m2_true) if self.m2_true != 0 else 0.0
+        }
+
+
+def evaluate_stream(predict, batches, classes=None, zero_division=0):
+    """
+    Métricas de classificação acumuladas lote a lote
+
+    Só a matriz de confusão fica em memória, então os dados de avaliação
+    não precisam caber nela.
+
+    Args:
+        predict: Função X -> labels preditos (ex.: model.predict)
+        batches: Iterável de (X, y) ou Dataset (lido por iter_chunks)
+        classes: Labels arbitrárias do problema (None = labels índices)
+        zero_division: Valor usado quando uma divisão é por zero
+
+    Returns:
+        MetricsReport sobre todos os lotes
+    """
+    if hasattr(batches, 'iter_chunks'):
+        batches = batches.iter_chunks()
+    accumulator = ConfusionAccumulator(classes=classes, zero_division=zero_division)
+    for X, y in batches:
+        accumulator.update(y, predict(X))
+    return accumulator.result()
+
+
+def _stacked_ratio(num, den, zero_division):
+    """num / den elemento a elemento, com zero_division onde den == 0"""
+    num, den = np.broadcast_arrays(np.asarray(num, dtype=float), np.asarray(den, dtype=float))
+    out = np.full(num.shape, float(zero_division))
+    np.divide(num, den, out=out, where=den > 0)
+    return out
+
+
+def stacked_metrics(matrices, classes=None, average='macro', zero_division=0):
+    """
+    Métricas de uma pilha de matrizes de confusão, sem laço em Python
+
+    Mesmas definições de MetricsReport (inclusive 'binary' como classe 1
+    contra classe 0 e F1 como média harmônica de P e R agregados).
+
+    Args:
+        matrices: Array (..., n_classes, n_classes), linhas = verdadeiro
+        classes: Labels das linhas/colunas (padrão: 0..n_classes-1)
+        average: 'binary', 'macro', 'micro' ou 'weighted'
+        zero_division: Valor usado quando uma divisão é por zero
+
+    Returns:
+        Dict {'accuracy', 'precision', 'recall', 'f1_score'} de arrays com
+        o formato matrices.shape[:-2]
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    if classes is None:
+        classes = np.arange(matrices.shape[-1])
+    tp = np.diagonal(matrices, axis1=-2, axis2=-1)
+    support = matrices.sum(axis=-1)
+    predicted = matrices.sum(axis=-2)
+    n_samples = support.sum(axis=-1)
+    correct = tp.sum(axis=-1)
+
+    if average == 'binary':
+        neg, pos = _binary_positions(classes)
+        zeros = np.zeros(matrices.shape[:-2])
+        tp_pos = matrices[..., pos, pos] if pos is not None else zeros
+        both = pos is not None and neg is not None
+        fp = matrices[..., neg, pos] if both else zeros
+        fn = matrices[..., pos, neg] if both else zeros
+        precision = _stacked_ratio(tp_pos, tp_pos + fp, zero_division)
+        recall = _stacked_ratio(tp_pos, tp_pos + fn, zero_division)
+    elif average == 'macro':
+        precision = _stacked_ratio(tp, predicted, zero_division).mean(axis=-1)
+        recall = _stacked_ratio(tp, support, zero_division).mean(axis=-1)
+    elif average == 'micro':
+        precision = recall = _stacked_ratio(correct, n_samples, zero_division)
+    elif average == 'weighted':
+        precision = (_stacked_ratio(tp, predicted, zero_division) * support).sum(axis=-1) / n_samples
+        recall = correct / n_samples
+    else:
+        raise ValueError(f"average '{average}' não suportado")
+
+    return {
+        'accuracy': correct / n_samples,
+        'precision': precision,
+        'recall': recall,
+        'f1_score': _stacked_ratio(2 * precision * recall, precision + recall, zero_division)
+    }
+
+
+def _normal_cdf(z):
+    """Função de distribuição da normal padrão"""
+    return 0.5 * (1.0 + math.erf(z / math.sqrt(2.0)))
+
+
+def _normal_ppf(p):
+    """Inversa da normal padrão (bisseção sobre erf)"""
+    low, high = -12.0, 12.0
+    for _ in range(100):
+        mid = 0.5 * (low + high)
+        if _normal_cdf(mid) < p:
+            low = mid
+        else:
+            high = mid
+    return 0.5 * (low + high)
+
+
+def _bca_interval(replicates, estimate, jackknife, weights, alpha):
+    """
+    Intervalo BCa (viés corrigido e acelerado)
+
+    Args:
+        replicates: Valores da métrica nas réplicas bootstrap
+        estimate: Valor na amostra original
+        jackknife: Valores leave-one-out distintos
+        weights: Quantas amostras produzem cada valor leave-one-out
+        alpha: 1 - confiança
+    """
+    n_boot = len(replicates)
+    below = np.mean(replicates < estimate) + 0.5 * np.mean(replicates == estimate)
+    bias = _normal_ppf(min(max(below, 0.5 / n_boot), 1 - 0.5 / n_boot))
+
+    deviation = np.sum(weights * jackknife) / np.sum(weights) - jackknife
+    spread = np.sum(weights * deviation ** 2)
+    acceleration = (np.sum(weights * deviation ** 3) / (6 * spread ** 1.5)
+                    if spread > 0 else 0.0)
+
+    levels = []
+    for z in (_normal_ppf(alpha / 2), _normal_ppf(1 - alpha / 2)):
+        shifted = bias + z
+        levels.append(_normal_cdf(bias + shifted / (1 - acceleration * shifted)))
+    return np.quantile(replicates, levels)
+
+
+def bootstrap_metrics(y_true, y_pred, n_boot=10000, method='percentile', confidence=0.95,
+                      average='macro', random_seed=42, zero_division=0,
+                      chunk_size=8192):
+    """
+    Intervalos de confiança bootstrap para acurácia, precisão, recall e F1
+
+    Cada réplica é um vetor de contagens multinomial sobre as amostras e
+    sua matriz de confusão é o bincount dos códigos (true, pred) ponderado
+    por essas contagens. Como todas as amostras de uma mesma célula têm o
+    mesmo código, esse bincount ponderado é sorteado diretamente como uma
+    multinomial sobre as n_classes² células: nenhuma réplica copia ou
+    percorre os dados, e o custo é O(n_boot * n_classes²) após um único
+    bincount sobre as predições.
+
+    Args:
+        y_true: Labels verdadeiros
+        y_pred: Labels preditos
+        n_boot: Número de réplicas bootstrap
+        method: 'percentile' ou 'bca'
+        confidence: Nível de confiança dos intervalos
+        average: Média de precisão, recall e F1 (ver MetricsReport)
+        random_seed: Seed das réplicas
+        zero_division: Valor usado quando uma divisão é por zero
+        chunk_size: Réplicas sorteadas por vez (limita a memória)
+
+    Returns:
+        Dictionary {métrica: {'estimate', 'lower', 'upper', 'std'}} mais
+        'n_boot', 'method' e 'confidence'
+    """
+    if method not in ('percentile', 'bca'):
+        raise ValueError(f"method '{method}' não suportado")
+
+    report = MetricsReport(y_true, y_pred)
+    cells = report.confusion_matrix.ravel()
+    n_samples, n_classes = report.n_samples, report.n_classes
+    if n_samples < 2:
+        raise ValueError("bootstrap exige ao menos 2 predições")
+
+    def _metrics(matrices):
+        return stacked_metrics(matrices, report.classes_, average, zero_division)
+
+    estimate = _metrics(report.confusion_matrix)
+
+    rng = np.random.default_rng(random_seed)
+    probabilities = cells / n_samples
+    chunks = []
+    for start in range(0, n_boot, chunk_size):
+        size = min(chunk_size, n_boot - start)
+        counts = rng.multinomial(n_samples, probabilities, size=size)
+        chunks.append(_metrics(counts.reshape(size, n_classes, n_classes)))
+    replicates = {key: np.concatenate([chunk[key] for chunk in chunks])
+                  for key in estimate}
+
+    if method == 'bca':
+        # Jackknife: remover uma amostra só depende da célula em que ela está
+        occupied = np.flatnonzero(cells)
+        removed = np.repeat(cells[None, :], len(occupied), axis=0)
+        removed[np.arange(len(occupied)), occupied] -= 1
+        jackknife = _metrics(removed.reshape(-1, n_classes, n_classes))
+
+    alpha = 1 - confidence
+    results = {'n_boot': n_boot, 'method': method, 'confidence': confidence}
+    for key, values in replicates.items():
+        if method == 'bca':
+            lower, upper = _bca_interval(values, estimate[key], jackknife[key],
+                                         cells[occupied], alpha)
+        else:
+            lower, upper = np.quantile(values, [alpha / 2, 1 - alpha / 2])
+        results[key] = {
+            'estimate': float(estimate[key]),
+            'lower': float(lower),
+            'upper': float(upper),
+            'std': float(np.std(values))
+        }
+    return results
+
+
+def _binary_clf_curve(y_true, y_score):
+    """
+    Falsos e verdadeiros positivos acumulados por limiar
+
+    Uma única ordenação decrescente dos scores e somas acumuladas; scores
+    empatados viram um único limiar.
+
+    Args:
+        y_true: Array booleano (True = positivo)
+        y_score: Scores da classe positiva
+
+    Returns:
+        fps, tps, thresholds (limiares decrescentes)
+    """
+    y_score = np.asarray(y_score, dtype=float)
+    order = np.argsort(-y_score, kind='mergesort')
+    y_score = y_score[order]
+    y_true = np.asarray(y_true, dtype=bool)[order]
+
+    # Último índice de cada valor distinto de score
+    threshold_idx = np.r_[np.flatnonzero(np.diff(y_score)), len(y_score) - 1]
+    tps = np.cumsum(y_true)[threshold_idx]
+    fps = threshold_idx + 1 - tps
+    return fps, tps, y_score[threshold_idx]
+
+
+def _roc_from_counts(fps, tps, thresholds):
+    """Curva ROC a partir das contagens acumuladas (limiares decrescentes)"""
+    if len(fps) == 0 or fps[-1] == 0 or tps[-1] == 0:
+        raise ValueError("ROC exige exemplos positivos e negativos")
+    fpr = np.r_[0.0, fps / fps[-1]]
+    tpr = np.r_[0.0, tps / tps[-1]]
+    return fpr, tpr, np.r_[np.inf, thresholds]
+
+
+def _pr_from_counts(fps, tps, thresholds):
+    """
+    Curva precisão-recall a partir das contagens acumuladas
+
+    Retorna limiares crescentes, com o ponto final (precisão 1, recall 0)
+    """
+    if len(tps) == 0 or tps[-1] == 0:
+        raise ValueError("precisão-recall exige exemplos positivos")
+    precision = tps / (tps + fps)
+    recall = tps / tps[-1]
+    return np.r_[precision[::-1], 1.0], np.r_[recall[::-1], 0.0], thresholds[::-1]
+
+
+def _auc(x, y):
+    """Área pela regra do trapézio"""
+    return float(np.sum(np.diff(x) * (y[1:] + y[:-1])) / 2)
+
+
+def _average_precision_from_counts(fps, tps, thresholds):
+    """AP = soma dos (R_n - R_n-1) * P_n"""
+    precision, recall, _ = _pr_from_counts(fps, tps, thresholds)
+    return float(-np.sum(np.diff(recall) * precision[:-1]))
+
+
+def _roc_auc_from_counts(fps, tps, thresholds):
+    """Área sob a curva ROC"""
+    fpr, tpr, _ = _roc_from_counts(fps, tps, thresholds)
+    return _auc(fpr, tpr)
+
+
+def _score_columns(y_true, y_score, classes, pos_label):
+    """
+    Separa o problema em alvos binários e colunas de score
+
+    Args:
+        y_true: Labels verdadeiros
+        y_score: Scores (n,) da classe positiva ou matriz (n, n_classes)
+            de predict_proba, colunas na ordem das classes
+        classes: Labels das colunas (padrão: índices 0..n_classes-1 ou as
+            classes ordenadas de y_true)
+        pos_label: Label positiva quando y_score é 1D
+
+    Returns:
+        Lista de pares (alvo booleano, scores), um por classe avaliada
+    """
+    y_true = np.asarray(y_true)
+    y_score = np.asarray(y_score, dtype=float)
+    if y_score.ndim == 1:
+        return [(y_true == pos_label, y_score)]
+
+    n_columns = y_score.shape[1]
+    if classes is None:
+        classes = (np.arange(n_columns) if _as_index_labels(y_true) is not None
+                   else np.unique(y_true))
+    if len(classes) != n_columns:
+        raise ValueError("y_score deve ter uma coluna por classe")
+    if n_columns == 2:
+        return [(y_true == classes[1], y_score[:, 1])]
+    return [(y_true == label, y_score[:, c]) for c, label in enumerate(classes)]
+
+
+def _one_vs_rest(columns, score_fn, average):
+    """
+    Aplica uma métrica binária a cada coluna e agrega
+
+    Args:
+        columns: Lista de (alvo booleano, dados da coluna)
+        score_fn: Função (alvo, dados) -> float
+        average: 'macro', 'weighted' ou None (valor por classe)
+    """
+    scores = np.array([score_fn(target, data) for target, data in columns])
+    if len(scores) == 1:
+        return float(scores[0])
+    if average is None:
+        return scores
+    if average == 'macro':
+        return float(np.mean(scores))
+    if average == 'weighted':
+        prevalence = np.array([np.sum(target) for target, _ in columns])
+        return float(np.average(scores, weights=prevalence))
+    raise ValueError(f"average '{average}' não suportado")
+
+
+def roc_curve(y_true, y_score, pos_label=1):
+    """
+    Curva ROC em O(n log n)
+
+    Args:
+        y_true: Labels verdadeiros
+        y_score: Scores da classe positiva (ex.: predict_proba(X)[:, 1])
+        pos_label: Label positiva
+
+    Returns:
+        fpr, tpr, thresholds (limiares decrescentes, o primeiro é inf)
+    """
+    return _roc_from_counts(*_binary_clf_curve(np.asarray(y_true) == pos_label, y_score))
+
+
+def precision_recall_curve(y_true, y_score, pos_label=1):
+    """
+    Curva precisão-recall em O(n log n)
+
+    Args:
+        y_true: Labels verdadeiros
+        y_score: Scores da classe positiva
+        pos_label: Label positiva
+
+    Returns:
+        precision, recall, thresholds (limiares crescentes; precision e
+        recall têm um ponto final extra (1, 0))
+    """
+    return _pr_from_counts(*_binary_clf_curve(np.asarray(y_true) == pos_label, y_score))
+
+
+def roc_auc_score(y_true, y_score, average='macro', classes=None, pos_label=1):
+    """
+    Área sob a curva ROC (binária ou one-vs-rest)
+
+    Args:
+        y_true: Labels verdadeiros
+        y_score: Scores (n,) da classe positiva ou saída de predict_proba
+        average: Agregação one-vs-rest: 'macro', 'weighted' ou None
+        classes: Labels das colunas de y_score
+        pos_label: Label positiva quando y_score é 1D
+
+    Returns:
+        AUC (float) ou array por classe (average=None)
+    """
+    columns = _score_columns(y_true, y_score, classes, pos_label)
+    return _one_vs_rest(columns, lambda target, score: _roc_auc_from_counts(
+        *_binary_clf_curve(target, score)), average)
+
+
+def average_precision(y_true, y_score, average='macro', classes=None, pos_label=1):
+    """
+    Average precision (área da curva precisão-recall em degraus)
+
+    Args:
+        y_true: Labels verdadeiros
+        y_score: Scores (n,) da classe positiva ou saída de predict_proba
+        average: Agregação one-vs-rest: 'macro', 'weighted' ou None
+        classes: Labels das colunas de y_score
+        pos_label: Label positiva quando y_score é 1D
+
+    Returns:
+        AP (float) ou array por classe (average=None)
+    """
+    columns = _score_columns(y_true, y_score, classes, pos_label)
+    return _one_vs_rest(columns, lambda target, score: _average_precision_from_counts(
+        *_binary_clf_curve(target, score)), average)
+
+
+class ScoreHistogramAccumulator:
+    """
+    Curvas ROC/PR aproximadas em streaming por histogramas de scores
+
+    Para cada coluna de score guarda histogramas de positivos e negativos
+    em n_bins faixas fixas; memória O(n_colunas * n_bins) independente do
+    número de predições. As curvas usam as bordas inferiores das faixas
+    como limiares (scores dentro de uma faixa contam como empatados).
+    Acumuladores de processos diferentes podem ser combinados com merge.
+    """
+
+    def __init__(self, n_bins=1000, n_outputs=1, score_range=(0.0, 1.0), classes=None,
+                 pos_label=1):
+        """
+        Inicializa o acumulador vazio
+
+        Args:
+            n_bins: Número de faixas do histograma
+            n_outputs: 1 para scores binários ou n_classes para as colunas
+                de predict_proba (one-vs-rest)
+            score_range: Intervalo (min, max) dos scores; valores fora
+                dele caem nas faixas extremas
+            classes: Labels das colunas (padrão: índices 0..n_outputs-1)
+            pos_label: Label positiva quando n_outputs == 1
+        """
+        self.n_bins = n_bins
+        self.n_outputs = n_outputs
+        self.score_range = score_range
+        self.classes_ = None if classes is None else np.asarray(classes)
+        self.pos_label = pos_label
+        # counts[coluna, 0 = negativo / 1 = positivo, faixa]
+        self.counts = np.zeros((n_outputs, 2, n_bins), dtype=np.int64)
+
+    def update(self, y_true, y_score):
+        """
+        Acumula um lote de scores
+
+        Args:
+            y_true: Labels verdadeiros do lote
+            y_score: Scores (n,) ou matriz (n, n_outputs)
+
+        Returns:
+            self
+        """
+        y_true = np.asarray(y_true)
+        y_score = np.asarray(y_score, dtype=float).reshape(len(y_true), -1)
+        if y_score.shape[1] != self.n_outputs:
+            raise ValueError(f"esperadas {self.n_outputs} colunas de score")
+        if len(y_true) == 0:
+            return self
+
+        low, high = self.score_range
+        bins = ((y_score - low) * (self.n_bins / (high - low))).astype(np.intp)
+        np.clip(bins, 0, self.n_bins - 1, out=bins)
+
+        if self.n_outputs == 1:
+            positive = (y_true == self.pos_label)[:, None]
+        else:
+            positive = self._encode(y_true)[:, None] == np.arange(self.n_outputs)
+
+        # Um único bincount para todas as colunas
+        codes = (np.arange(self.n_outputs) * 2 + positive) * self.n_bins + bins
+        self.counts += np.bincount(codes.ravel(), minlength=self.counts.size).reshape(
+            self.counts.shape)
+        return self
+
+    def _encode(self, y):
+        """Índices das colunas dos labels (erro para labels desconhecidos)"""
+        if self.classes_ is None:
+            idx = _as_index_labels(y)
+            if idx is None:
+                raise ValueError("labels que não são índices exigem 'classes'")
+            known = idx < self.n_outputs
+        else:
+            idx = np.searchsorted(self.classes_, y)
+            known = np.take(self.classes_, idx, mode='clip') == y
+        if not np.all(known):
+            unknown = np.unique(y[~known])
+            raise ValueError(f"labels fora das colunas de score: {unknown[:5].tolist()}")
+        return idx
+
+    def merge(self, other):
+        """
+        Soma outro acumulador a este (ex.: de outro processo)
+
+        Args:
+            other: ScoreHistogramAccumulator com as mesmas faixas
+
+        Returns:
+            self
+        """
+        if (other.counts.shape != self.counts.shape
+                or tuple(other.score_range) != tuple(self.score_range)):
+            raise ValueError("acumuladores com faixas diferentes")
+        self.counts += other.counts
+        return self
+
+    def _cumulative(self, output):
+        """fps, tps e limiares decrescentes de uma coluna"""
+        negative, positive = self.counts[output, 0, ::-1], self.counts[output, 1, ::-1]
+        low, high = self.score_range
+        edges = low + (high - low) * np.arange(self.n_bins)[::-1] / self.n_bins
+        occupied = (negative + positive) > 0
+        return (np.cumsum(negative)[occupied], np.cumsum(positive)[occupied],
+                edges[occupied])
+
+    def roc_curve(self, output=0):
+        """
+        Curva ROC aproximada de uma coluna
+
+        Returns:
+            fpr, tpr, thresholds
+        """
+        return _roc_from_counts(*self._cumulative(output))
+
+    def precision_recall_curve(self, output=0):
+        """
+        Curva precisão-recall aproximada de uma coluna
+
+        Returns:
+            precision, recall, thresholds
+        """
+        return _pr_from_counts(*self._cumulative(output))
+
+    def _columns(self):
+        """
+        Pares (positivos da coluna, coluna) para _one_vs_rest
+
+        Com duas colunas o problema é binário e só a da classe positiva
+        (coluna 1) é avaliada, como em roc_auc_score(y_true, proba).
+        """
+        outputs = [1] if self.n_outputs == 2 else range(self.n_outputs)
+        return [(self.counts[c, 1].sum(), c) for c in outputs]
+
+    def roc_auc_score(self, average='macro'):
+        """AUC ROC aproximada (one-vs-rest quando n_outputs > 2)"""
+        return _one_vs_rest(self._columns(), lambda _, c: _roc_auc_from_counts(
+            *self._cumulative(c)), average)
+
+    def average_precision(self, average='macro'):
+        """Average precision aproximada (one-vs-rest quando n_outputs > 2)"""
+        return _one_vs_rest(self._columns(), lambda _, c: _average_precision_from_counts(
+            *self._cumulative(c)), average)
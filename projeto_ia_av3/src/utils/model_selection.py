@@ -0,0 +1,476 @@
+"""
+Seleção de modelos
+Racing (teste pareado por fold contra o líder), successive halving e
+curvas de aprendizado incrementais
+"""
+import math
+import pickle
+import time
+from contextlib import nullcontext
+
+import numpy as np
+
+from . import cross_validation
+from .cross_validation import (FoldPlan, evaluate_fold, run_fold_worker, shared_pool,
+                               resolve_n_jobs)
+from .metrics import accuracy_score
+
+
+def _betacf(a, b, x, max_iter=200, eps=3e-14):
+    """Fração contínua da função beta incompleta (Numerical Recipes)"""
+    qab, qap, qam = a + b, a + 1.0, a - 1.0
+    c, d = 1.0, 1.0 - qab * x / qap
+    d = 1.0 / (d if abs(d) > 1e-300 else 1e-300)
+    h = d
+    for m in range(1, max_iter + 1):
+        m2 = 2 * m
+        aa = m * (b - m) * x / ((qam + m2) * (a + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > 1e-300 else 1e-300)
+        c = 1.0 + aa / c if abs(c) > 1e-300 else 1.0 + aa / 1e-300
+        h *= d * c
+        aa = -(a + m) * (qab + m) * x / ((a + m2) * (qap + m2))
+        d = 1.0 + aa * d
+        d = 1.0 / (d if abs(d) > 1e-300 else 1e-300)
+        c = 1.0 + aa / c if abs(c) > 1e-300 else 1.0 + aa / 1e-300
+        delta = d * c
+        h *= delta
+        if abs(delta - 1.0) < eps:
+            break
+    return h
+
+
+def _regularized_beta(a, b, x):
+    """Função beta incompleta regularizada I_x(a, b)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    log_bt = (math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b)
+              + a * math.log(x) + b * math.log(1 - x))
+    if x < (a + 1) / (a + b + 2):
+        return math.exp(log_bt) * _betacf(a, b, x) / a
+    return 1.0 - math.exp(log_bt) * _betacf(b, a, 1 - x) / b
+
+
+def student_t_sf(t, df):
+    """
+    P(T > t) para a distribuição t de Student
+
+    Args:
+        t: Estatística t
+        df: Graus de liberdade
+
+    Returns:
+        Probabilidade da cauda superior
+    """
+    if math.isinf(t):
+        return 0.0 if t > 0 else 1.0
+    tail = 0.5 * _regularized_beta(df / 2.0, 0.5, df / (df + t * t))
+    return tail if t > 0 else 1.0 - tail
+
+
+def paired_t_test(leader_scores, scores):
+    """
+    Teste t pareado unilateral: o líder é melhor que o candidato?
+
+    Args:
+        leader_scores: Scores por fold do líder
+        scores: Scores do candidato nos mesmos folds
+
+    Returns:
+        p-valor (H1: média(líder - candidato) > 0)
+    """
+    diff = np.asarray(leader_scores) - np.asarray(scores)
+    n = len(diff)
+    if n < 2:
+        return 1.0
+    mean, std = diff.mean(), diff.std(ddof=1)
+    if std == 0:
+        return 0.0 if mean > 0 else 1.0
+    return student_t_sf(mean / (std / math.sqrt(n)), n - 1)
+
+
+class _Evaluator:
+    """
+    Executa lotes de tarefas (candidato, fold) em série ou em um pool
+    mantido aberto entre as rodadas
+    """
+
+    def __init__(self, X, y, n_jobs, memory):
+        self.X, self.y = X, y
+        self.n_jobs = n_jobs
+        self.memory = memory
+        self.n_evaluations = 0
+        self._context = shared_pool(X, y, n_jobs) if n_jobs > 1 else nullcontext()
+
+    def __enter__(self):
+        self.executor = self._context.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._context.__exit__(*exc)
+
+    def run(self, tasks):
+        """
+        Args:
+            tasks: Lista de (chave, model_bytes, train, val)
+
+        Returns:
+            Dict {chave: resultado do fold}
+        """
+        self.n_evaluations += len(tasks)
+        if self.executor is None:
+            return {
+                key: evaluate_fold(pickle.loads(model_bytes),
+                                   self.X[train], self.y[train],
+                                   self.X[val], self.y[val], memory=self.memory)
+                for key, model_bytes, train, val in tasks
+            }
+        futures = {
+            key: self.executor.submit(run_fold_worker, model_bytes, train, val,
+                                      False, self.memory)
+            for key, model_bytes, train, val in tasks
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+
+def race_candidates(candidates, X, y, folds, metric='accuracy', alpha=0.05,
+                    min_folds=2, n_jobs=1, memory=None, verbose=True):
+    """
+    Racing: avalia os candidatos fold a fold e descarta os dominados
+
+    A cada rodada todos os candidatos sobreviventes são avaliados no
+    próximo fold. A partir de min_folds rodadas, cada candidato é
+    comparado ao líder atual (maior média) com um teste t pareado
+    unilateral sobre os scores por fold; candidatos com p < alpha são
+    descartados.
+
+    Args:
+        candidates: Dict {nome: modelo não treinado}
+        X: Features
+        y: Target
+        folds: Lista de pares (train, val) (ex.: FoldLayout.folds)
+        metric: Métrica usada na comparação
+        alpha: Nível de significância
+        min_folds: Folds mínimos antes do primeiro descarte
+        n_jobs: Número de processos
+        memory: Medição de memória por fold (ver evaluate_fold)
+        verbose: Se True, imprime cada rodada
+
+    Returns:
+        Dict com 'ranking', 'survivors', 'pruned' ({nome: {'round',
+        'p_value', 'mean'}}), 'scores' (por fold), 'n_evaluations',
+        'n_full_evaluations' e 'wall_time'
+    """
+    model_bytes = {name: pickle.dumps(model) for name, model in candidates.items()}
+    scores = {name: [] for name in candidates}
+    survivors = list(candidates)
+    pruned = {}
+    n_jobs = resolve_n_jobs(n_jobs, len(candidates))
+    start = time.time()
+
+    with _Evaluator(X, y, n_jobs, memory) as evaluator:
+        for round_idx, (train, val) in enumerate(folds, 1):
+            results = evaluator.run([(name, model_bytes[name], train, val)
+                                     for name in survivors])
+            for name in survivors:
+                scores[name].append(results[name][metric])
+
+            leader = max(survivors, key=lambda name: np.mean(scores[name]))
+            dropped = []
+            if round_idx >= min_folds and len(survivors) > 1:
+                for name in survivors:
+                    if name == leader:
+                        continue
+                    p_value = paired_t_test(scores[leader], scores[name])
+                    if p_value < alpha:
+                        pruned[name] = {'round': round_idx, 'p_value': p_value,
+                                        'mean': float(np.mean(scores[name]))}
+                        dropped.append(name)
+                survivors = [name for name in survivors if name not in dropped]
+
+            if verbose:
+                print(f"  Rodada {round_idx}/{len(folds)}: líder {leader} "
+                      f"({np.mean(scores[leader]):.4f}), "
+                      f"{len(survivors)} restante(s), descartados: {dropped or '-'}")
+
+    ranking = sorted(survivors, key=lambda name: np.mean(scores[name]), reverse=True)
+    return {
+        'ranking': ranking,
+        'survivors': survivors,
+        'pruned': pruned,
+        'scores': {name: np.array(values) for name, values in scores.items()},
+        'n_evaluations': evaluator.n_evaluations,
+        'n_full_evaluations': len(candidates) * len(folds),
+        'wall_time': time.time() - start
+    }
+
+
+def _subsample(train, fraction):
+    """
+    Subconjunto do treino por passo fixo (continua sendo view para slices)
+    """
+    step = max(int(round(1 / fraction)), 1)
+    if isinstance(train, slice):
+        return slice(train.start, train.stop, step)
+    return train[::step]
+
+
+def successive_halving(candidates, X, y, folds, metric='accuracy', eta=2,
+                       min_fraction=None, n_jobs=1, memory=None, verbose=True):
+    """
+    Successive halving sobre a fração de dados de treino
+
+    Na primeira etapa todos os candidatos treinam com uma fração pequena
+    dos dados de treino de cada fold; a cada etapa apenas o melhor 1/eta
+    segue, com eta vezes mais dados, até a fração 1.
+
+    Args:
+        candidates: Dict {nome: modelo não treinado}
+        X: Features
+        y: Target
+        folds: Lista de pares (train, val)
+        metric: Métrica de comparação
+        eta: Fator de redução de candidatos / aumento de dados
+        min_fraction: Fração inicial (padrão: eta^-(n_etapas - 1))
+        n_jobs: Número de processos
+        memory: Medição de memória por fold
+        verbose: Se True, imprime cada etapa
+
+    Returns:
+        Dict com 'ranking', 'survivors', 'pruned' ({nome: {'rung',
+        'fraction', 'mean'}}), 'rungs', 'n_evaluations', 'budget'
+        (avaliações ponderadas pela fração de dados), 'n_full_evaluations'
+        e 'wall_time'
+    """
+    model_bytes = {name: pickle.dumps(model) for name, model in candidates.items()}
+    n_rungs = max(int(math.ceil(math.log(len(candidates), eta))) + 1, 1)
+    if min_fraction is None:
+        min_fraction = eta ** -(n_rungs - 1)
+
+    survivors = list(candidates)
+    pruned = {}
+    rungs = []
+    budget = 0.0
+    n_jobs = resolve_n_jobs(n_jobs, len(candidates) * len(folds))
+    start = time.time()
+
+    with _Evaluator(X, y, n_jobs, memory) as evaluator:
+        rung = 0
+        while True:
+            fraction = min(1.0, min_fraction * eta ** rung)
+            tasks = [((name, k), model_bytes[name], _subsample(train, fraction), val)
+                     for name in survivors for k, (train, val) in enumerate(folds)]
+            results = evaluator.run(tasks)
+            means = {name: float(np.mean([results[name, k][metric]
+                                          for k in range(len(folds))]))
+                     for name in survivors}
+            ranked = sorted(survivors, key=means.get, reverse=True)
+            rungs.append({'rung': rung, 'fraction': fraction, 'scores': means})
+            budget += fraction * len(tasks)
+
+            if verbose:
+                print(f"  Etapa {rung}: fração {fraction:.3f}, "
+                      f"{len(survivors)} candidato(s), melhor {ranked[0]} "
+                      f"({means[ranked[0]]:.4f})")
+
+            if fraction >= 1.0 or len(survivors) == 1:
+                survivors = ranked
+                break
+
+            n_keep = max(1, len(survivors) // eta)
+            for name in ranked[n_keep:]:
+                pruned[name] = {'rung': rung, 'fraction': fraction, 'mean': means[name]}
+            survivors = ranked[:n_keep]
+            rung += 1
+
+    return {
+        'ranking': survivors,
+        'survivors': survivors,
+        'pruned': pruned,
+        'rungs': rungs,
+        'n_evaluations': evaluator.n_evaluations,
+        'budget': budget,
+        'n_full_evaluations': len(candidates) * len(folds),
+        'wall_time': time.time() - start
+    }
+
+
+def _curve_task(model_bytes, train_order, val, sizes, incremental, classes,
+                max_score_rows=None, X=None, y=None):
+    """
+    Curva de aprendizado de um fold (ou de um único tamanho)
+
+    Com incremental=True o mesmo modelo recebe, via partial_fit, apenas
+    as linhas acrescentadas de um tamanho para o seguinte.
+
+    Args:
+        model_bytes: Modelo não treinado serializado
+        train_order: Índices de treino do fold em ordem aleatória; o
+            tamanho m usa train_order[:m]
+        val: Índices (ou slice) de validação
+        sizes: Tamanhos absolutos, crescentes
+        incremental: Se True, usa partial_fit entre tamanhos
+        classes: Todas as classes (para partial_fit)
+        max_score_rows: Limite de linhas para o score de treino
+        X, y: Dados (None = memória compartilhada do worker)
+
+    Returns:
+        Arrays (n_sizes,) de score de treino, score de validação e tempo
+        de treino
+    """
+    if X is None:
+        X, y = cross_validation._WORKER_DATA['X'], cross_validation._WORKER_DATA['y']
+    X_val, y_val = X[val], y[val]
+
+    train_scores, val_scores, fit_times = [], [], []
+    model = pickle.loads(model_bytes)
+    previous = 0
+    for size in sizes:
+        if incremental:
+            new = train_order[previous:size]
+            start = time.perf_counter()
+            model.partial_fit(X[new], y[new], classes=classes)
+        else:
+            model = pickle.loads(model_bytes)
+            subset = train_order[:size]
+            start = time.perf_counter()
+            model.fit(X[subset], y[subset])
+        fit_times.append(time.perf_counter() - start)
+        previous = size
+
+        scored = train_order[:min(size, max_score_rows or size)]
+        train_scores.append(accuracy_score(y[scored], model.predict(X[scored])))
+        val_scores.append(accuracy_score(y_val, model.predict(X_val)))
+
+    return np.array(train_scores), np.array(val_scores), np.array(fit_times)
+
+
+def learning_curve(model, X, y, sizes=(0.1, 0.325, 0.55, 0.775, 1.0), n_folds=5,
+                   stratified=True, incremental=True, n_jobs=1, max_score_rows=None,
+                   random_seed=42, verbose=True):
+    """
+    Curva de aprendizado: scores de treino e validação por tamanho de treino
+
+    Para cada fold os tamanhos são subconjuntos aninhados de uma ordem
+    aleatória do treino. Se o partial_fit do modelo for exato
+    (exact_partial_fit = True: partial_fit com todos os lotes dá o mesmo
+    modelo que fit com os dados concatenados, como no Naive Bayes e no KNN)
+    e incremental=True, cada tamanho estende o modelo do tamanho anterior
+    em vez de treinar do zero; o fold inteiro é então uma única tarefa.
+    Modelos cujo partial_fit roda épocas só sobre as linhas novas (MLP,
+    Perceptron) não dariam um modelo treinado com m linhas e são sempre
+    treinados do zero por tamanho. Caso contrário cada par (tamanho, fold)
+    é uma tarefa independente. As tarefas rodam em um pool
+    com X e y em memória compartilhada.
+
+    Args:
+        model: Modelo não treinado
+        X: Features
+        y: Target
+        sizes: Frações (<= 1.0) ou números absolutos de amostras de treino
+        n_folds: Número de folds
+        stratified: Se True, folds estratificados
+        incremental: Se False, força um fit completo por tamanho (só tem
+            efeito em modelos com exact_partial_fit)
+        n_jobs: Número de processos
+        max_score_rows: Limite de linhas usadas no score de treino
+            (útil para o KNN, cuja predição é cara)
+        random_seed: Seed dos folds e da ordem dos subconjuntos
+        verbose: Se True, imprime cada tarefa
+
+    Returns:
+        Dict com 'train_sizes' (n_sizes,), 'train_scores', 'val_scores' e
+        'fit_times' (n_sizes, n_folds) e 'incremental'; use com
+        plot_learning_curve(nome, r['train_scores'], r['val_scores'],
+        train_sizes=r['train_sizes'])
+    """
+    plan = FoldPlan(y, n_folds=n_folds, stratified=stratified, random_seed=random_seed)
+    rng = np.random.RandomState(random_seed)
+    folds = [(rng.permutation(train), val) for train, val in plan]
+
+    n_train = min(len(train) for train, _ in folds)
+    sizes = np.asarray(sizes, dtype=float)
+    if np.all(sizes <= 1.0):
+        sizes = sizes * n_train
+    train_sizes = np.unique(np.clip(sizes.astype(int), 1, n_train))
+
+    incremental = incremental and getattr(model, 'exact_partial_fit', False)
+    model_bytes = pickle.dumps(model)
+    classes = np.unique(y)
+
+    # (fold, índices dos tamanhos) de cada tarefa
+    if incremental:
+        tasks = [(k, np.arange(len(train_sizes))) for k in range(n_folds)]
+    else:
+        tasks = [(k, np.array([i])) for k in range(n_folds)
+                 for i in range(len(train_sizes))]
+
+    train_scores = np.zeros((len(train_sizes), n_folds))
+    val_scores = np.zeros_like(train_scores)
+    fit_times = np.zeros_like(train_scores)
+
+    def _collect(k, idx, result):
+        train_scores[idx, k], val_scores[idx, k], fit_times[idx, k] = result
+        if verbose:
+            print(f"  Fold {k + 1}/{n_folds}, tamanhos {train_sizes[idx].tolist()}: "
+                  f"val {np.round(val_scores[idx, k], 4).tolist()}")
+
+    n_jobs = resolve_n_jobs(n_jobs, len(tasks))
+    if n_jobs == 1:
+        for k, idx in tasks:
+            train_order, val = folds[k]
+            _collect(k, idx, _curve_task(model_bytes, train_order, val, train_sizes[idx],
+                                         incremental, classes, max_score_rows, X, y))
+    else:
+        with shared_pool(X, y, n_jobs) as executor:
+            futures = [
+                executor.submit(_curve_task, model_bytes, folds[k][0], folds[k][1],
+                                train_sizes[idx], incremental, classes, max_score_rows)
+                for k, idx in tasks
+            ]
+            for (k, idx), future in zip(tasks, futures):
+                _collect(k, idx, future.result())
+
+    return {
+        'train_sizes': train_sizes,
+        'train_scores': train_scores,
+        'val_scores': val_scores,
+        'fit_times': fit_times,
+        'incremental': incremental
+    }
+
+
+def format_selection_report(result):
+    """
+    Relatório em texto de race_candidates / successive_halving
+
+    Args:
+        result: Dict retornado pela seleção
+
+    Returns:
+        String formatada
+    """
+    report = "Seleção de Modelos\n" + "=" * 60 + "\n"
+    report += "Sobreviventes (ordem de ranking):\n"
+    for name in result['ranking']:
+        report += f"  {name}\n"
+
+    report += "Descartados:\n"
+    for name, info in result['pruned'].items():
+        if 'round' in info:
+            when = f"rodada {info['round']} (p={info['p_value']:.4f})"
+        else:
+            when = f"etapa {info['rung']} (fração {info['fraction']:.3f})"
+        report += f"  {name:<30} {when}, média {info['mean']:.4f}\n"
+
+    report += "-" * 60 + "\n"
+    report += f"Avaliações (modelo, fold): {result['n_evaluations']}"
+    cost = result.get('budget', result['n_evaluations'])
+    if 'budget' in result:
+        report += f" (equivalente a {cost:.1f} com todos os dados)"
+    saving = result['n_full_evaluations'] / max(cost, 1e-12)
+    report += f"\nAvaliação completa: {result['n_full_evaluations']} ({saving:.1f}x mais cara)"
+    report += f"\nTempo: {result['wall_time']:.2f}s\n"
+    return report
@@ -0,0 +1,407 @@
+"""
+Pipeline de pré-processamento + estimador, ajustado dentro de cada fold
+SEM uso de scikit-learn
+"""
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+
+from .dataset import fit_dataset, is_dataset
+
+
+def _array_identity(X):
+    """
+    Identidade de uma view: (id do buffer raiz, endereço, shape, strides, dtype)
+
+    Views iguais do mesmo buffer (ex.: X[train] de um FoldLayout, recriada a
+    cada tarefa) têm a mesma identidade, calculada em O(1), sem hash do
+    conteúdo.
+
+    Returns:
+        Chave e o objeto raiz (a entrada do cache o mantém vivo, para que
+        o id não seja reaproveitado por outro array)
+    """
+    X = np.asarray(X)
+    root = X
+    while isinstance(root, np.ndarray) and root.base is not None:
+        root = root.base
+    key = (id(root), X.__array_interface__['data'][0], X.shape, X.strides, X.dtype.str)
+    return key, root
+
+
+class TransformCache:
+    """
+    Cache LRU em memória de transformações ajustadas por fold
+
+    Guarda os transformadores ajustados e as matrizes transformadas de
+    treino e validação; as entradas mais antigas saem quando o total passa
+    de max_bytes. O total inclui os buffers raiz que as entradas mantêm
+    vivos, cada um contado uma vez. É um cache por processo: em paralelo, cada worker guarda
+    os folds que executou.
+    """
+
+    def __init__(self, max_bytes=512 * 1024 ** 2):
+        """
+        Args:
+            max_bytes: Tamanho máximo das matrizes guardadas e dos buffers
+                mantidos vivos
+        """
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._pinned = {}
+        self.n_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Valor guardado (e marca como usado) ou None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value, n_bytes, refs):
+        """
+        Guarda um valor
+
+        Args:
+            key: Chave
+            value: Valor
+            n_bytes: Tamanho contabilizado
+            refs: Tupla de objetos mantidos vivos enquanto a entrada existir
+        """
+        new_refs = {id(ref): ref for ref in refs if id(ref) not in self._pinned}
+        if n_bytes + sum(_pinned_bytes(ref) for ref in new_refs.values()) > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (value, n_bytes, refs)
+        self.n_bytes += n_bytes
+        for ref in refs:
+            self._pin(ref)
+        while self.n_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+
+    def _pin(self, ref):
+        """Conta uma referência a um buffer raiz (os bytes entram uma vez)"""
+        entry = self._pinned.get(id(ref))
+        if entry is None:
+            self._pinned[id(ref)] = [ref, 1]
+            self.n_bytes += _pinned_bytes(ref)
+        else:
+            entry[1] += 1
+
+    def _remove(self, key):
+        """Remove uma entrada e solta os buffers que só ela mantinha vivos"""
+        _, size, refs = self._entries.pop(key)
+        self.n_bytes -= size
+        for ref in refs:
+            entry = self._pinned[id(ref)]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._pinned[id(ref)]
+                self.n_bytes -= _pinned_bytes(ref)
+
+    def clear(self):
+        """Remove todas as entradas"""
+        self._entries.clear()
+        self._pinned.clear()
+        self.n_bytes = 0
+
+
+# Cache compartilhado por todos os pipelines do processo
+TRANSFORM_CACHE = TransformCache()
+
+
+def _pinned_bytes(obj):
+    """Bytes de um buffer raiz mantido vivo por uma entrada do cache"""
+    # Outras raízes (o mmap de um memmap) são paginadas do arquivo
+    return obj.nbytes if isinstance(obj, np.ndarray) else 0
+
+
+def _read_only(X):
+    """Marca como somente leitura uma matriz que será compartilhada"""
+    if isinstance(X, np.ndarray):
+        X.flags.writeable = False
+    return X
+
+
+class Pipeline:
+    """
+    Transformações de pré-processamento seguidas de um estimador
+
+    fit ajusta as transformações apenas nos dados recebidos (o treino do
+    fold, dentro da validação cruzada), evitando vazamento de estatísticas
+    da validação. Transformações ajustadas e matrizes transformadas são
+    memoizadas por (identidade dos dados, parâmetros dos passos): todos os
+    modelos avaliados no mesmo fold com o mesmo pré-processamento usam uma
+    única cópia transformada, compartilhada como somente leitura.
+
+    Os dados não devem ser alterados in place entre chamadas.
+
+    fit também aceita um Dataset (utils.dataset): cada passo é ajustado em
+    streaming sobre a saída dos anteriores, sem memoização.
+
+    O parâmetro compartilhado de busca do estimador é exposto com o prefixo
+    do passo (ex.: 'model__n_epochs'), e partial_fit, kneighbors e
+    predict_from_neighbors são repassados a ele: a busca (utils.search)
+    reaproveita trabalho entre candidatos também dentro do pipeline.
+    """
+
+    accepts_dataset = True
+
+    def __init__(self, steps, memoize=True):
+        """
+        Inicializa o pipeline
+
+        Args:
+            steps: Lista de (nome, objeto); todos menos o último têm
+                fit_transform(X)/transform(X) e o último é o estimador
+            memoize: Se True, usa o TRANSFORM_CACHE do processo
+        """
+        self.steps = list(steps)
+        self.memoize = memoize
+        self.transformers_ = None
+        self._fit_key = None
+        self._fit_root = None
+
+    @property
+    def named_steps(self):
+        """Dict {nome: passo}"""
+        return dict(self.steps)
+
+    @property
+    def estimator(self):
+        """Estimador final"""
+        return self.steps[-1][1]
+
+    @property
+    def shared_search_param(self):
+        """Parâmetro compartilhado de busca do estimador, com o prefixo do passo"""
+        name, estimator = self.steps[-1]
+        param = getattr(estimator, 'shared_search_param', None)
+        return None if param is None else f'{name}__{param}'
+
+    def __getstate__(self):
+        # Chaves de identidade só valem no processo que as criou
+        state = self.__dict__.copy()
+        state['_fit_key'] = None
+        state['_fit_root'] = None
+        return state
+
+    def _fit_transforms(self, X):
+        """
+        Ajusta (ou recupera do cache) as transformações e transforma X
+
+        Returns:
+            X transformado
+        """
+        templates = [step for _, step in self.steps[:-1]]
+        self._fit_key = None
+        if self.memoize and templates:
+            x_key, root = _array_identity(X)
+            key = ('fit', pickle.dumps(templates), x_key)
+            cached = TRANSFORM_CACHE.get(key)
+            if cached is not None:
+                self.transformers_, Xt = cached
+                self._fit_key, self._fit_root = key, root
+                return Xt
+
+        # Cópias não ajustadas: os passos de self.steps continuam modelos
+        self.transformers_ = []
+        Xt = X
+        for template in templates:
+            transformer = pickle.loads(pickle.dumps(template))
+            Xt = transformer.fit_transform(Xt)
+            self.transformers_.append(transformer)
+
+        if self.memoize and templates:
+            _read_only(Xt)
+            TRANSFORM_CACHE.put(key, (self.transformers_, Xt), Xt.nbytes, (root,))
+            self._fit_key, self._fit_root = key, root
+        return Xt
+
+    def _fit_stream(self, dataset):
+        """Ajusta cada passo sobre o Dataset transformado pelos anteriores"""
+        self._fit_key = None
+        self.transformers_ = []
+        for _, template in self.steps[:-1]:
+            transformer = fit_dataset(pickle.loads(pickle.dumps(template)), dataset)
+            dataset = transformer.transform(dataset)
+            self.transformers_.append(transformer)
+        fit_dataset(self.estimator, dataset)
+        return self
+
+    def fit(self, X, y=None):
+        """
+        Ajusta as transformações e treina o estimador
+
+        Args:
+            X: Features ou Dataset
+            y: Labels (ignorado se X for um Dataset)
+
+        Returns:
+            self
+        """
+        if is_dataset(X):
+            return self._fit_stream(X)
+        self.estimator.fit(self._fit_transforms(X), y)
+        return self
+
+    def prepare_fold(self, X_train, X_val):
+        """
+        Ajusta e memoiza as transformações de um fold antes do treino
+
+        Chamado por evaluate_fold fora da medição de tempo: o fit e o
+        predict seguintes recebem as matrizes do cache, e o custo do
+        pré-processamento, compartilhado com os outros modelos do fold, não
+        entra no tempo de quem roda primeiro. Sem memoização não faz nada.
+
+        Args:
+            X_train: Features de treino
+            X_val: Features de validação
+        """
+        if not (self.memoize and len(self.steps) > 1):
+            return
+        self._fit_transforms(X_train)
+        self.transform(X_val)
+
+    def partial_fit(self, X, y, classes=None):
+        """
+        Continua o treino do estimador (warm start)
+
+        As transformações são ajustadas na primeira chamada e reaplicadas
+        nas seguintes; com os mesmos dados (treino continuado por épocas)
+        a cópia transformada vem do cache.
+
+        Args:
+            X: Features
+            y: Labels
+            classes: Todas as classes possíveis
+
+        Returns:
+            self
+        """
+        Xt = self._fit_transforms(X) if self.transformers_ is None else self.transform(X)
+        self.estimator.partial_fit(Xt, y, classes=classes)
+        return self
+
+    def transform(self, X):
+        """
+        Aplica as transformações ajustadas (memoizado por fold)
+
+        Args:
+            X: Features ou Dataset (retorna um Dataset transformado)
+
+        Returns:
+            X transformado
+        """
+        if not self.transformers_:
+            return X
+        if self._fit_key is not None and not is_dataset(X):
+            x_key, root = _array_identity(X)
+            key = ('transform', self._fit_key, x_key)
+            cached = TRANSFORM_CACHE.get(key)
+            if cached is not None:
+                return cached
+
+        for transformer in self.transformers_:
+            X = transformer.transform(X)
+
+        if self._fit_key is not None and not is_dataset(X):
+            # A entrada mantém vivo também o buffer do treino: enquanto ela
+            # existir, o id em _fit_key não pode ser reaproveitado
+            TRANSFORM_CACHE.put(key, _read_only(X), X.nbytes, (root, self._fit_root))
+        return X
+
+    def predict(self, X):
+        """
+        Prediz com o estimador sobre X transformado
+
+        Args:
+            X: Features
+
+        Returns:
+            Array de predições
+        """
+        return self.estimator.predict(self.transform(X))
+
+    def kneighbors(self, X, n_neighbors=None):
+        """
+        Vizinhos do estimador (KNN) para X transformado
+
+        Args:
+            X: Features
+            n_neighbors: Número de vizinhos
+
+        Returns:
+            Vizinhos no formato de estimator.kneighbors
+        """
+        return self.estimator.kneighbors(self.transform(X), n_neighbors)
+
+    def predict_from_neighbors(self, neighbors, k=None):
+        """
+        Prediz a partir de vizinhos já calculados (ver kneighbors)
+
+        Returns:
+            Array de predições
+        """
+        return self.estimator.predict_from_neighbors(neighbors, k)
+
+    def predict_proba(self, X):
+        """
+        Probabilidades do estimador sobre X transformado
+
+        Args:
+            X: Features
+
+        Returns:
+            Matriz de probabilidades
+        """
+        return self.estimator.predict_proba(self.transform(X))
+
+    def score(self, X, y):
+        """
+        Calcula acurácia
+
+        Args:
+            X: Features
+            y: Labels verdadeiros
+
+        Returns:
+            Acurácia
+        """
+        return np.mean(self.predict(X) == y)
+
+    def get_params(self):
+        """Retorna parâmetros de todos os passos"""
+        return {
+            'steps': [
+                (name, type(step).__name__,
+                 step.get_params() if hasattr(step, 'get_params') else {})
+                for name, step in self.steps
+            ]
+        }
+
+    def set_params(self, **params):
+        """
+        Atualiza parâmetros de um passo, no formato '<passo>__<parâmetro>'
+
+        Returns:
+            self
+        """
+        named = self.named_steps
+        for full_name, value in params.items():
+            step_name, sep, param = full_name.partition('__')
+            if not sep or step_name not in named:
+                raise ValueError(f"parâmetro '{full_name}' deve ser '<passo>__<parâmetro>'")
+            step = named[step_name]
+            if hasattr(step, 'set_params'):
+                step.set_params(**{param: value})
+            else:
+                setattr(step, param, value)
+        return self
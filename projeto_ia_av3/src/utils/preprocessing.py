@@ -4,50 +4,158 @@ Normalização e transformações implementadas manualmente
 """
 import numpy as np
 
+from .dataset import is_dataset
+
+
+# Linhas processadas por vez em fit/transform (limita os temporários)
+_CHUNK_ROWS = 16384
+
+
+def _row_slices(n_rows, chunk_rows=_CHUNK_ROWS):
+    """Slices consecutivos de até chunk_rows linhas"""
+    for start in range(0, n_rows, chunk_rows):
+        yield slice(start, min(start + chunk_rows, n_rows))
+
+
+def _transform_output(X, out, copy):
+    """
+    Array de saída de um transform
+
+    Com out=None e copy=False, escreve sobre o próprio X (se for float e
+    gravável); caso contrário aloca um array do mesmo dtype float de X
+    (float32 continua float32, inteiros viram float64).
+
+    Returns:
+        X (como array) e o array de saída
+    """
+    X = np.asarray(X)
+    if out is not None:
+        if out.shape != X.shape:
+            raise ValueError(f"out com formato {out.shape}, esperado {X.shape}")
+        return X, out
+    if not copy and X.dtype.kind == 'f' and X.flags.writeable:
+        return X, X
+    dtype = X.dtype if X.dtype.kind == 'f' else np.float64
+    return X, np.empty(X.shape, dtype=dtype)
+
+
+def _partial_fit_source(scaler, X):
+    """partial_fit com um array ou com cada bloco de um Dataset"""
+    if not is_dataset(X):
+        return scaler.partial_fit(X)
+    for X_chunk, _ in X.iter_chunks():
+        scaler.partial_fit(X_chunk)
+    return scaler
+
 
 class MinMaxScaler:
     """
     Normalização Min-Max implementada manualmente
     SEM uso de sklearn
+
+    Mínimo e máximo são acumulados incrementalmente (partial_fit) e podem
+    ser combinados entre partes dos dados (merge).
     """
 
+    # fit/transform aceitam um Dataset (utils.dataset)
+    accepts_dataset = True
+
     def __init__(self, feature_range=(0, 1)):
         self.feature_range = feature_range
         self.min_ = None
         self.max_ = None
         self.data_min_ = None
         self.data_max_ = None
+        self.n_samples_seen_ = 0
 
     def fit(self, X):
         """
         Calcula min e max de cada feature
 
         Args:
-            X: Array de features
+            X: Array de features ou Dataset (uma passada pelos blocos)
+        """
+        self.data_min_ = None
+        self.data_max_ = None
+        self.n_samples_seen_ = 0
+        return _partial_fit_source(self, X)
+
+    def partial_fit(self, X):
+        """
+        Atualiza min e max com mais um lote de amostras
+
+        Args:
+            X: Lote de features
+
+        Returns:
+            self
+        """
+        X = np.asarray(X)
+        if len(X) == 0:
+            return self
+        return self._update(len(X), np.min(X, axis=0), np.max(X, axis=0))
+
+    def merge(self, other):
         """
-        self.data_min_ = np.min(X, axis=0)
-        self.data_max_ = np.max(X, axis=0)
+        Combina as estatísticas de outro scaler (ex.: ajustado em outra parte)
+
+        Args:
+            other: MinMaxScaler
+
+        Returns:
+            self
+        """
+        if other.n_samples_seen_ == 0:
+            return self
+        return self._update(other.n_samples_seen_, other.data_min_, other.data_max_)
+
+    def _update(self, n, data_min, data_max):
+        """Junta mínimo e máximo de um bloco aos atuais"""
+        if self.n_samples_seen_ == 0:
+            self.data_min_ = np.array(data_min, dtype=np.float64)
+            self.data_max_ = np.array(data_max, dtype=np.float64)
+        else:
+            np.minimum(self.data_min_, data_min, out=self.data_min_)
+            np.maximum(self.data_max_, data_max, out=self.data_max_)
+        self.n_samples_seen_ += n
         return self
 
-    def transform(self, X):
+    def _scale(self):
+        """Fator e deslocamento de X * scale + offset"""
+        low, high = self.feature_range
+        scale = (high - low) / (self.data_max_ - self.data_min_ + 1e-8)
+        return scale, low - self.data_min_ * scale
+
+    def transform(self, X, out=None, copy=True):
         """
         Aplica normalização
 
+        Processa X em blocos de linhas sem temporários do tamanho de X;
+        X pode ser um memmap.
+
         Args:
-            X: Array de features
+            X: Array de features ou Dataset (retorna um Dataset
+                normalizado bloco a bloco)
+            out: Array de saída opcional (ex.: memmap float32)
+            copy: Se False e out=None, normaliza X in place (X float)
 
         Returns:
             X normalizado
         """
-        X_std = (X - self.data_min_) / (self.data_max_ - self.data_min_ + 1e-8)
-        X_scaled = X_std * (self.feature_range[1] - self.feature_range[0]) + self.feature_range[0]
-        return X_scaled
-
-    def fit_transform(self, X):
+        if is_dataset(X):
+            return X.map(self.transform)
+        X, out = _transform_output(X, out, copy)
+        scale, offset = self._scale()
+        for rows in _row_slices(len(X)):
+            np.multiply(X[rows], scale, out=out[rows])
+            out[rows] += offset
+        return out
+
+    def fit_transform(self, X, out=None, copy=True):
         """
         Fit e transform em um passo
         """
-        return self.fit(X).transform(X)
+        return self.fit(X).transform(X, out=out, copy=copy)
 
     def inverse_transform(self, X):
         """
@@ -57,45 +165,124 @@ class MinMaxScaler:
         X_original = X_std * (self.data_max_ - self.data_min_) + self.data_min_
         return X_original
 
+    def get_params(self):
+        """Retorna parâmetros do scaler"""
+        return {'feature_range': self.feature_range}
+
 
 class StandardScaler:
     """
     Normalização Z-Score implementada manualmente
     SEM uso de sklearn
+
+    Média e variância são acumuladas em uma passada (partial_fit), com a
+    combinação de Welford/Chan por bloco, e podem ser combinadas entre
+    partes dos dados (merge).
     """
 
+    # fit/transform aceitam um Dataset (utils.dataset)
+    accepts_dataset = True
+
     def __init__(self):
         self.mean_ = None
         self.std_ = None
+        self.var_ = None
+        self.n_samples_seen_ = 0
+        self._m2 = None
 
     def fit(self, X):
         """
         Calcula média e desvio padrão de cada feature
 
         Args:
-            X: Array de features
+            X: Array de features ou Dataset (uma passada pelos blocos)
+        """
+        self.mean_ = None
+        self.std_ = None
+        self.var_ = None
+        self.n_samples_seen_ = 0
+        self._m2 = None
+        return _partial_fit_source(self, X)
+
+    def partial_fit(self, X):
         """
-        self.mean_ = np.mean(X, axis=0)
-        self.std_ = np.std(X, axis=0)
+        Atualiza média e variância com mais um lote de amostras
+
+        Args:
+            X: Lote de features (pode ser um memmap; é lido em blocos)
+
+        Returns:
+            self
+        """
+        X = np.asarray(X)
+        for rows in _row_slices(len(X)):
+            chunk = X[rows]
+            mean = chunk.mean(axis=0, dtype=np.float64)
+            centered = chunk - mean
+            self._update(len(chunk), mean, np.einsum('ij,ij->j', centered, centered)
+                         if centered.ndim == 2 else centered @ centered)
         return self
 
-    def transform(self, X):
+    def merge(self, other):
+        """
+        Combina as estatísticas de outro scaler (ex.: ajustado em outra parte)
+
+        Args:
+            other: StandardScaler
+
+        Returns:
+            self
+        """
+        if other.n_samples_seen_ == 0:
+            return self
+        return self._update(other.n_samples_seen_, other.mean_, other._m2)
+
+    def _update(self, n, mean, m2):
+        """Junta contagem, média e soma dos desvios quadráticos de um bloco"""
+        if self.n_samples_seen_ == 0:
+            self.mean_ = np.array(mean, dtype=np.float64)
+            self._m2 = np.array(m2, dtype=np.float64)
+            total = n
+        else:
+            total = self.n_samples_seen_ + n
+            delta = mean - self.mean_
+            self._m2 = self._m2 + m2 + delta ** 2 * (self.n_samples_seen_ * n / total)
+            self.mean_ = self.mean_ + delta * (n / total)
+        self.n_samples_seen_ = total
+        self.var_ = self._m2 / total
+        self.std_ = np.sqrt(self.var_)
+        return self
+
+    def transform(self, X, out=None, copy=True):
         """
         Aplica normalização Z-Score
 
+        Processa X em blocos de linhas sem temporários do tamanho de X;
+        X pode ser um memmap.
+
         Args:
-            X: Array de features
+            X: Array de features ou Dataset (retorna um Dataset
+                normalizado bloco a bloco)
+            out: Array de saída opcional (ex.: memmap float32)
+            copy: Se False e out=None, normaliza X in place (X float)
 
         Returns:
             X normalizado
         """
-        return (X - self.mean_) / (self.std_ + 1e-8)
-
-    def fit_transform(self, X):
+        if is_dataset(X):
+            return X.map(self.transform)
+        X, out = _transform_output(X, out, copy)
+        scale = self.std_ + 1e-8
+        for rows in _row_slices(len(X)):
+            np.subtract(X[rows], self.mean_, out=out[rows])
+            out[rows] /= scale
+        return out
+
+    def fit_transform(self, X, out=None, copy=True):
         """
         Fit e transform em um passo
         """
-        return self.fit(X).transform(X)
+        return self.fit(X).transform(X, out=out, copy=copy)
 
     def inverse_transform(self, X):
         """
@@ -103,6 +290,270 @@ class StandardScaler:
         """
         return X * self.std_ + self.mean_
 
+    def get_params(self):
+        """Retorna parâmetros do scaler"""
+        return {}
+
+
+def _flip_signs(components):
+    """
+    Sinal determinístico: maior coeficiente (em módulo) de cada componente
+    positivo
+    """
+    max_rows = np.argmax(np.abs(components), axis=1)
+    signs = np.sign(components[np.arange(len(components)), max_rows])
+    signs[signs == 0] = 1
+    return components * signs[:, None]
+
+
+class PCA:
+    """
+    Análise de componentes principais implementada manualmente
+    SEM uso de sklearn
+
+    Dois caminhos: SVD exata da matriz centrada ('full') ou range finder
+    aleatório com iterações de potência ('randomized', Halko et al.), que
+    custa O(n * d * k) em matrizes altas. n_components pode ser um inteiro
+    ou uma fração da variância explicada a atingir (ex.: 0.95).
+    """
+
+    def __init__(self, n_components=None, svd_solver='auto', n_oversamples=10,
+                 n_iter=4, random_seed=42):
+        """
+        Inicializa o PCA
+
+        Args:
+            n_components: Número de componentes, fração da variância
+                explicada (0 < f < 1) ou None (todas)
+            svd_solver: 'full', 'randomized' (só com n_components inteiro)
+                ou 'auto' (randomized para matrizes grandes com
+                n_components inteiro pequeno)
+            n_oversamples: Colunas extras do range finder aleatório
+            n_iter: Iterações de potência do range finder
+            random_seed: Seed do range finder
+        """
+        self.n_components = n_components
+        self.svd_solver = svd_solver
+        self.n_oversamples = n_oversamples
+        self.n_iter = n_iter
+        self.random_seed = random_seed
+        self.mean_ = None
+        self.components_ = None
+
+    def _solver(self, n_samples, n_features):
+        """Caminho usado no fit"""
+        k = self.n_components
+        if self.svd_solver == 'randomized' and not isinstance(k, (int, np.integer)):
+            # O range finder precisa do número de componentes antes da SVD
+            raise ValueError(f"svd_solver='randomized' exige n_components inteiro "
+                             f"(recebido {k!r}); use 'full' ou 'auto'")
+        if self.svd_solver != 'auto':
+            return self.svd_solver
+        if (isinstance(k, (int, np.integer)) and max(n_samples, n_features) > 500
+                and k < 0.8 * min(n_samples, n_features)):
+            return 'randomized'
+        return 'full'
+
+    def _randomized_svd(self, Xc, k):
+        """SVD truncada aproximada de Xc com k componentes"""
+        rng = np.random.default_rng(self.random_seed)
+        n_random = min(k + self.n_oversamples, min(Xc.shape))
+        Q = Xc @ rng.standard_normal((Xc.shape[1], n_random))
+        for _ in range(self.n_iter):
+            # Reortogonaliza a cada passo para não perder as direções menores
+            Q, _ = np.linalg.qr(Q)
+            Q, _ = np.linalg.qr(Xc.T @ Q)
+            Q = Xc @ Q
+        Q, _ = np.linalg.qr(Q)
+        _, S, Vt = np.linalg.svd(Q.T @ Xc, full_matrices=False)
+        return S[:k], Vt[:k]
+
+    def _n_components_for(self, explained_variance_ratio):
+        """Número de componentes pedido (inteiro ou fração da variância)"""
+        k = self.n_components
+        if k is None:
+            return len(explained_variance_ratio)
+        if isinstance(k, float) and 0 < k < 1:
+            cumulative = np.cumsum(explained_variance_ratio)
+            return min(int(np.searchsorted(cumulative, k) + 1), len(cumulative))
+        return min(int(k), len(explained_variance_ratio))
+
+    def fit(self, X):
+        """
+        Calcula média e componentes principais
+
+        Args:
+            X: Array de features (n_samples, n_features)
+        """
+        X = np.asarray(X)
+        n_samples, n_features = X.shape
+        self.mean_ = X.mean(axis=0, dtype=np.float64)
+        Xc = X - self.mean_
+        total_variance = np.einsum('ij,ij->', Xc, Xc) / max(n_samples - 1, 1)
+
+        if self._solver(n_samples, n_features) == 'randomized':
+            S, Vt = self._randomized_svd(Xc, int(self.n_components))
+        else:
+            _, S, Vt = np.linalg.svd(Xc, full_matrices=False)
+
+        self._set_components(S, Vt, n_samples, total_variance)
+        return self
+
+    def _set_components(self, S, Vt, n_samples, total_variance):
+        """Guarda os componentes, truncados para n_components"""
+        explained_variance = S ** 2 / max(n_samples - 1, 1)
+        ratio = (explained_variance / total_variance if total_variance > 0
+                 else np.zeros_like(explained_variance))
+        k = self._n_components_for(ratio)
+
+        self.n_components_ = k
+        self.components_ = _flip_signs(Vt[:k])
+        self.singular_values_ = S[:k]
+        self.explained_variance_ = explained_variance[:k]
+        self.explained_variance_ratio_ = ratio[:k]
+
+    def transform(self, X):
+        """
+        Projeta X nos componentes principais
+
+        Calculado como X @ W - média @ W, sem o temporário X - média.
+
+        Args:
+            X: Array de features ou Dataset (retorna um Dataset projetado
+                bloco a bloco)
+
+        Returns:
+            Array (n_samples, n_components_)
+        """
+        if is_dataset(X):
+            return X.map(self.transform)
+        W = self.components_.T
+        return np.asarray(X) @ W - self.mean_ @ W
+
+    def fit_transform(self, X):
+        """
+        Fit e transform em um passo
+        """
+        return self.fit(X).transform(X)
+
+    def inverse_transform(self, Z):
+        """
+        Reconstrói as features a partir das projeções
+        """
+        return np.asarray(Z) @ self.components_ + self.mean_
+
+    def get_params(self):
+        """Retorna parâmetros do PCA"""
+        return {
+            'n_components': self.n_components,
+            'svd_solver': self.svd_solver,
+            'n_oversamples': self.n_oversamples,
+            'n_iter': self.n_iter,
+            'random_seed': self.random_seed
+        }
+
+
+class IncrementalPCA(PCA):
+    """
+    PCA incremental: consome X em blocos (partial_fit) com memória
+    O(batch_size * n_features)
+
+    Cada bloco é combinado aos componentes atuais por uma SVD da pilha
+    [S * componentes; bloco centrado; correção da média] (Ross et al.).
+    Com n_components fracionário, todos os componentes são mantidos
+    durante o ajuste e o corte pela variância explicada é refeito a cada
+    bloco.
+    """
+
+    # fit/transform aceitam um Dataset (utils.dataset)
+    accepts_dataset = True
+
+    def __init__(self, n_components=None, batch_size=None):
+        """
+        Inicializa o PCA incremental
+
+        Args:
+            n_components: Número de componentes, fração da variância
+                explicada (0 < f < 1) ou None (todas)
+            batch_size: Linhas por bloco no fit (padrão: 5 * n_features)
+        """
+        super().__init__(n_components=n_components, svd_solver='incremental')
+        self.batch_size = batch_size
+        self._reset()
+
+    def _reset(self):
+        """Descarta o ajuste anterior"""
+        self.mean_ = None
+        self.components_ = None
+        self.n_samples_seen_ = 0
+        self._scaler = StandardScaler()
+        self._all_components = None
+        self._all_singular_values = None
+
+    def _n_kept(self, n_features):
+        """Componentes mantidos entre blocos"""
+        k = self.n_components
+        if k is None or (isinstance(k, float) and 0 < k < 1):
+            return n_features
+        return min(int(k), n_features)
+
+    def fit(self, X):
+        """
+        Ajusta em blocos de batch_size linhas (X pode ser um memmap)
+
+        Args:
+            X: Array de features ou Dataset (cada bloco é dividido em
+                lotes de batch_size linhas)
+        """
+        self._reset()
+        for X_chunk in (chunk for chunk, _ in X.iter_chunks()) if is_dataset(X) else [X]:
+            X_chunk = np.asarray(X_chunk)
+            batch_size = self.batch_size or 5 * X_chunk.shape[1]
+            for rows in _row_slices(len(X_chunk), batch_size):
+                self.partial_fit(X_chunk[rows])
+        return self
+
+    def partial_fit(self, X):
+        """
+        Atualiza os componentes com mais um bloco de amostras
+
+        Args:
+            X: Bloco de features
+
+        Returns:
+            self
+        """
+        X = np.asarray(X)
+        if len(X) == 0:
+            return self
+        n_old = self.n_samples_seen_
+        old_mean = self._scaler.mean_
+        self._scaler.partial_fit(X)
+        n_total = self._scaler.n_samples_seen_
+
+        batch_mean = X.mean(axis=0, dtype=np.float64)
+        blocks = [X - batch_mean]
+        if n_old:
+            correction = np.sqrt(n_old * len(X) / n_total) * (old_mean - batch_mean)
+            blocks = [self._all_singular_values[:, None] * self._all_components,
+                      X - batch_mean, correction[None, :]]
+
+        _, S, Vt = np.linalg.svd(np.vstack(blocks), full_matrices=False)
+        Vt = _flip_signs(Vt)
+        kept = self._n_kept(X.shape[1])
+        self._all_components, self._all_singular_values = Vt[:kept], S[:kept]
+
+        self.n_samples_seen_ = n_total
+        self.mean_ = self._scaler.mean_
+        total_variance = np.sum(self._scaler.var_) * n_total / max(n_total - 1, 1)
+        self._set_components(self._all_singular_values, self._all_components,
+                             n_total, total_variance)
+        return self
+
+    def get_params(self):
+        """Retorna parâmetros do PCA incremental"""
+        return {'n_components': self.n_components, 'batch_size': self.batch_size}
+
 
 def normalize_manual(X, method='minmax'):
     """
@@ -0,0 +1,264 @@
+"""
+Cache em disco de resultados de validação cruzada
+Endereçado por conteúdo: dataset, fold, modelo, parâmetros e código
+"""
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import zipfile
+
+import numpy as np
+
+
+def _hash_bytes(*chunks):
+    """SHA-256 (hex) de uma sequência de blocos de bytes"""
+    h = hashlib.sha256()
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def dataset_fingerprint(X, y):
+    """
+    Hash do conteúdo de X e y (inclui shape e dtype)
+
+    Args:
+        X: Features
+        y: Target
+
+    Returns:
+        String hexadecimal
+    """
+    X = np.ascontiguousarray(X)
+    y = np.ascontiguousarray(y)
+    header = f"{X.shape}|{X.dtype.str}|{y.shape}|{y.dtype.str}".encode()
+    return _hash_bytes(header, memoryview(X).cast('B'), memoryview(y).cast('B'))
+
+
+def fold_fingerprint(fold):
+    """
+    Hash de um fold (par de arrays de índices ou de slices)
+
+    Args:
+        fold: Par (train, val)
+
+    Returns:
+        String hexadecimal
+    """
+    parts = []
+    for part in fold:
+        if isinstance(part, slice):
+            parts.append(f"slice({part.start},{part.stop},{part.step})".encode())
+        else:
+            parts.append(np.ascontiguousarray(part).tobytes())
+    return _hash_bytes(*parts)
+
+
+_CODE_VERSIONS = {}
+
+
+def _source_hash(path):
+    """Hash (com cache) do conteúdo de um arquivo-fonte"""
+    if path not in _CODE_VERSIONS:
+        try:
+            with open(path, 'rb') as f:
+                _CODE_VERSIONS[path] = _hash_bytes(f.read())
+        except (TypeError, OSError):
+            _CODE_VERSIONS[path] = 'unknown'
+    return _CODE_VERSIONS[path]
+
+
+def code_version(model):
+    """
+    Hash do código-fonte dos módulos que definem a classe do modelo
+
+    Inclui os módulos das classes base (MRO): qualquer alteração no arquivo
+    do algoritmo ou no de uma classe herdada (ex.: mlp.py para o
+    MLPRegressor) invalida as entradas correspondentes do cache.
+
+    Args:
+        model: Instância do modelo
+
+    Returns:
+        String hexadecimal
+    """
+    paths = []
+    for cls in type(model).__mro__:
+        try:
+            path = inspect.getsourcefile(cls)
+        except TypeError:
+            continue  # classes embutidas (object)
+        if path not in paths:
+            paths.append(path)
+    versions = [_source_hash(path).encode() for path in paths]
+    if hasattr(model, 'steps'):
+        # Pipeline: o código de cada passo também conta
+        versions += [code_version(step).encode() for _, step in model.steps]
+    return _hash_bytes(*versions)
+
+
+def _evaluation_version():
+    """Hash do código-fonte do módulo de validação cruzada"""
+    from . import cross_validation
+    return _source_hash(cross_validation.__file__)
+
+
+def model_fingerprint(model):
+    """
+    Hash da classe, dos parâmetros (get_params) e da versão do código
+
+    Args:
+        model: Instância não treinada
+
+    Returns:
+        String hexadecimal
+    """
+    cls = type(model)
+    if hasattr(model, 'get_params'):
+        params = json.dumps(model.get_params(), sort_keys=True, default=str).encode()
+    else:
+        params = pickle.dumps(model)
+    return _hash_bytes(f"{cls.__module__}.{cls.__qualname__}".encode(), params,
+                       code_version(model).encode())
+
+
+class ResultCache:
+    """
+    Cache de resultados por (modelo, fold) em arquivos .npz
+
+    Cada entrada guarda as métricas e tempos do fold e, opcionalmente,
+    arrays como as predições fora do fold. Quando o tamanho total passa de
+    max_bytes, as entradas usadas há mais tempo são removidas (LRU pela
+    data de modificação, atualizada a cada leitura).
+    """
+
+    def __init__(self, directory, max_bytes=256 * 1024 ** 2, enabled=True):
+        """
+        Inicializa o cache
+
+        Args:
+            directory: Diretório das entradas
+            max_bytes: Tamanho máximo em disco
+            enabled: Se False, get() sempre falha e put() não grava
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        # Tamanho total em disco, mantido por put (None = ainda não lido)
+        self._n_bytes = None
+        if enabled:
+            os.makedirs(directory, exist_ok=True)
+
+    def task_key(self, model, dataset_key, fold):
+        """
+        Chave de uma tarefa (modelo, fold)
+
+        Inclui também a versão do código de avaliação (cross_validation),
+        de modo que novas métricas por fold invalidam entradas antigas.
+
+        Args:
+            model: Modelo não treinado
+            dataset_key: Saída de dataset_fingerprint
+            fold: Par (train, val)
+
+        Returns:
+            String hexadecimal
+        """
+        return _hash_bytes(dataset_key.encode(), fold_fingerprint(fold).encode(),
+                           model_fingerprint(model).encode(),
+                           _evaluation_version().encode())
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key):
+        """
+        Lê uma entrada
+
+        Args:
+            key: Chave da tarefa
+
+        Returns:
+            Dict do resultado do fold ou None
+        """
+        if not self.enabled:
+            return None
+
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                result = {}
+                for name in data.files:
+                    value = data[name]
+                    result[name] = float(value) if value.ndim == 0 else value
+        except (OSError, ValueError, EOFError, zipfile.BadZipFile):
+            # Ausente ou corrompido (ex.: .npz truncado): é recalculado
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        self.hits += 1
+        return result
+
+    def put(self, key, fold_result):
+        """
+        Grava uma entrada e aplica o limite de tamanho
+
+        Args:
+            key: Chave da tarefa
+            fold_result: Dict com escalares e arrays
+        """
+        if not self.enabled:
+            return
+
+        if self._n_bytes is None:
+            self._n_bytes = sum(size for _, size, _ in self._entries())
+
+        path = self._path(key)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            np.savez_compressed(f, **{name: np.asarray(value)
+                                      for name, value in fold_result.items()})
+        try:
+            self._n_bytes -= os.path.getsize(path)  # entrada substituída
+        except OSError:
+            pass
+        self._n_bytes += os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+
+        # O diretório só é listado quando o limite é ultrapassado
+        if self._n_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        """Lista (mtime, tamanho, nome) das entradas em disco"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                stat = os.stat(os.path.join(self.directory, name))
+                entries.append((stat.st_mtime, stat.st_size, name))
+        return entries
+
+    def evict(self):
+        """
+        Remove as entradas menos recentes até caber em max_bytes
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, name in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(os.path.join(self.directory, name))
+            total -= size
+        self._n_bytes = total
+
+    def clear(self):
+        """Remove todas as entradas"""
+        for name in os.listdir(self.directory):
+            if name.endswith('.npz'):
+                os.remove(os.path.join(self.directory, name))
+        self._n_bytes = 0
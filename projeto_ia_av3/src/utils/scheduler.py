@@ -0,0 +1,258 @@
+"""
+Escalonador global de experimentos (modelo × fold)
+Distribui todas as tarefas em um único pool, maiores primeiro (LPT)
+"""
+import json
+import os
+import pickle
+import time
+from concurrent.futures import as_completed
+
+import numpy as np
+
+from .cross_validation import (evaluate_fold, run_fold_worker, shared_pool,
+                               summarize_folds, resolve_n_jobs)
+from .result_cache import dataset_fingerprint
+
+
+def _probe_time(model, X, y, n_rows, random_seed=42):
+    """
+    Mede fit + predict de uma cópia do modelo em uma amostra pequena
+
+    Args:
+        model: Modelo não treinado
+        X: Features
+        y: Target
+        n_rows: Linhas de treino (a validação usa n_rows // 4)
+
+    Returns:
+        Tempo em segundos
+    """
+    rng = np.random.RandomState(random_seed)
+    n_val = max(n_rows // 4, 1)
+    idx = rng.choice(len(X), size=min(n_rows + n_val, len(X)), replace=False)
+    train_idx, val_idx = idx[:-n_val], idx[-n_val:]
+
+    probe = pickle.loads(pickle.dumps(model))
+    start = time.perf_counter()
+    probe.fit(X[train_idx], y[train_idx])
+    probe.predict(X[val_idx])
+    return time.perf_counter() - start
+
+
+def probe_task_cost(model, X, y, n_train, sizes=(100, 200)):
+    """
+    Estima o custo de um fold com duas sondagens rápidas
+
+    Ajusta uma lei de potência custo ~ n^alpha entre os dois tamanhos
+    (alpha limitado a [1, 2]: linear para NB/MLP, quadrático para KNN)
+    e extrapola para o tamanho de treino do fold.
+
+    Args:
+        model: Modelo não treinado
+        X: Features
+        y: Target
+        n_train: Tamanho do treino de um fold
+        sizes: Tamanhos das duas sondagens
+
+    Returns:
+        Custo estimado em segundos
+    """
+    n1, n2 = min(sizes[0], n_train), min(sizes[1], n_train)
+    t1 = _probe_time(model, X, y, n1)
+    t2 = _probe_time(model, X, y, n2)
+    if n2 <= n1 or t1 <= 0 or t2 <= 0:
+        return t2 * n_train / max(n2, 1)
+
+    alpha = np.clip(np.log(t2 / t1) / np.log(n2 / n1), 1.0, 2.0)
+    return t2 * (n_train / n2) ** alpha
+
+
+def load_cost_history(path):
+    """
+    Carrega custos médios por fold medidos em execuções anteriores
+
+    Args:
+        path: Arquivo JSON (pode não existir)
+
+    Returns:
+        Dict {nome_do_modelo: segundos por fold}
+    """
+    if path is None or not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_cost_history(path, results):
+    """
+    Salva o custo médio por fold (treino + teste) de cada modelo
+
+    Args:
+        path: Arquivo JSON
+        results: Dict {nome_do_modelo: summary}
+    """
+    history = load_cost_history(path)
+    for name, summary in results.items():
+        history[name] = float(summary['train_time_mean'] + summary['test_time_mean'])
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(history, f, indent=2, sort_keys=True)
+
+
+def estimate_task_costs(models, X, y, folds, history=None):
+    """
+    Custo estimado de um fold de cada modelo
+
+    Usa o histórico quando disponível; caso contrário, sonda o modelo.
+
+    Args:
+        models: Dict {nome: modelo}
+        X: Features
+        y: Target
+        folds: Lista de pares (train_indices, val_indices)
+        history: Dict {nome: segundos por fold}
+
+    Returns:
+        Dict {nome: segundos por fold}
+    """
+    history = history or {}
+    train = folds[0][0]
+    n_train = train.stop - train.start if isinstance(train, slice) else len(train)
+    return {
+        name: history[name] if name in history else probe_task_cost(model, X, y, n_train)
+        for name, model in models.items()
+    }
+
+
+def run_experiments(models, X, y, folds, n_jobs=-1, cost_history_path=None,
+                    verbose=True, on_result=None, cache=None, keep_predictions=False,
+                    memory='rss'):
+    """
+    Executa todas as tarefas (modelo, fold) em um único pool
+
+    As tarefas são ordenadas pelo custo estimado (maiores primeiro) e
+    submetidas a um pool com X e y em memória compartilhada, de modo que o
+    tempo total se aproxima da tarefa mais lenta e não da soma das
+    validações cruzadas.
+
+    Args:
+        models: Dict {nome: modelo não treinado}
+        X: Features
+        y: Target
+        folds: Lista de pares (train, val): arrays de índices ou slices
+            (ex.: FoldLayout.folds)
+        n_jobs: Número de processos (-1 = todas as CPUs)
+        cost_history_path: JSON com custos de execuções anteriores
+            (atualizado ao final)
+        verbose: Se True, imprime cada tarefa ao terminar
+        on_result: Callback opcional on_result(nome, fold_idx, resultado)
+            chamado assim que cada tarefa termina
+        cache: ResultCache opcional; tarefas já calculadas com o mesmo
+            dataset, fold, modelo, parâmetros e código não são executadas
+        keep_predictions: Se True, guarda as predições de cada fold
+            ('y_pred_folds' no summary); com 'proba', também as
+            probabilidades ('y_proba_folds')
+        memory: Medição do pico de memória por fold ('rss', 'tracemalloc' ou None)
+
+    Returns:
+        results: Dict {nome: summary} na ordem de `models`
+        stats: Dict com 'wall_time', 'serial_time' (soma dos tempos das
+            tarefas executadas; as servidas do cache não contam) e
+            'task_time_ratio' (serial_time / wall_time; não é um speed-up,
+            pois os tempos medidos nos workers crescem com a disputa por CPU)
+    """
+    n_folds = len(folds)
+    n_total = len(models) * n_folds
+    fold_results = {name: [None] * n_folds for name in models}
+    n_done = 0
+    serial_time = 0.0
+
+    def _collect(name, fold_idx, fold_result, cached=False):
+        nonlocal n_done, serial_time
+        n_done += 1
+        fold_results[name][fold_idx] = fold_result
+        if not cached:
+            # Só o trabalho feito nesta execução
+            serial_time += fold_result['train_time'] + fold_result['test_time']
+        if cache is not None and not cached:
+            cache.put(task_keys[name, fold_idx], fold_result)
+        if verbose:
+            origin = " (cache)" if cached else ""
+            print(f"  [{n_done}/{n_total}] {name} - fold {fold_idx + 1}: "
+                  f"Acc {fold_result['accuracy']:.4f}, "
+                  f"{fold_result['train_time'] + fold_result['test_time']:.2f}s{origin}")
+        if on_result is not None:
+            on_result(name, fold_idx, fold_result)
+
+    start_wall = time.time()
+
+    # Serve do cache as tarefas inalteradas
+    required = []
+    if keep_predictions:
+        required.append('y_pred')
+    if keep_predictions == 'proba':
+        required.append('y_proba')
+    task_keys = {}
+    tasks = []
+    if cache is not None:
+        dataset_key = dataset_fingerprint(X, y)
+    for name, model in models.items():
+        for fold_idx in range(n_folds):
+            if cache is not None:
+                key = cache.task_key(model, dataset_key, folds[fold_idx])
+                task_keys[name, fold_idx] = key
+                cached = cache.get(key)
+                if cached is not None and all(key in cached for key in required):
+                    _collect(name, fold_idx, cached, cached=True)
+                    continue
+            tasks.append((name, fold_idx))
+
+    # Longest-job-first
+    pending = {name: models[name] for name, _ in tasks}
+    costs = estimate_task_costs(pending, X, y, folds,
+                                load_cost_history(cost_history_path))
+    tasks.sort(key=lambda task: costs[task[0]], reverse=True)
+
+    model_bytes = {name: pickle.dumps(model) for name, model in pending.items()}
+    n_jobs = resolve_n_jobs(n_jobs, max(len(tasks), 1))
+
+    if verbose:
+        print(f"  {len(tasks)} tarefas em {n_jobs} processo(s)")
+
+    if n_jobs == 1:
+        for name, fold_idx in tasks:
+            train_idx, val_idx = folds[fold_idx]
+            _collect(name, fold_idx, evaluate_fold(
+                pickle.loads(model_bytes[name]),
+                X[train_idx], y[train_idx], X[val_idx], y[val_idx],
+                keep_predictions=keep_predictions, memory=memory
+            ))
+    else:
+        with shared_pool(X, y, n_jobs) as executor:
+            futures = {}
+            for name, fold_idx in tasks:
+                train_idx, val_idx = folds[fold_idx]
+                future = executor.submit(run_fold_worker, model_bytes[name],
+                                         train_idx, val_idx, keep_predictions, memory)
+                futures[future] = (name, fold_idx)
+
+            for future in as_completed(futures):
+                name, fold_idx = futures[future]
+                _collect(name, fold_idx, future.result())
+
+    wall_time = time.time() - start_wall
+
+    results = {name: summarize_folds(fold_results[name]) for name in models}
+
+    stats = {
+        'wall_time': wall_time,
+        'serial_time': serial_time,
+        'task_time_ratio': serial_time / wall_time if wall_time > 0 and serial_time > 0 else 1.0
+    }
+
+    if cost_history_path is not None:
+        save_cost_history(cost_history_path, results)
+
+    return results, stats
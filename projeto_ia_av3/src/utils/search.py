@@ -0,0 +1,385 @@
+"""
+Busca de hiperparâmetros (grid e aleatória) sobre um FoldPlan compartilhado
+Candidatos que diferem apenas no parâmetro compartilhado do modelo
+(k do KNN, variante do Naive Bayes, épocas do MLP) reaproveitam trabalho
+"""
+import itertools
+import json
+import os
+import pickle
+import time
+
+import numpy as np
+
+from . import cross_validation
+from .cross_validation import FoldPlan, shared_pool, resolve_n_jobs
+from .metrics import MetricsReport
+from .result_cache import _hash_bytes, dataset_fingerprint, model_fingerprint
+
+
+SEARCH_METRICS = ['accuracy', 'precision', 'f1_score']
+
+
+def parameter_grid(space):
+    """
+    Todas as combinações de um espaço de parâmetros
+
+    Args:
+        space: Dict {parâmetro: lista de valores}
+
+    Returns:
+        Lista de dicts de parâmetros
+    """
+    names = sorted(space)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(space[name] for name in names))]
+
+
+def parameter_sample(space, n_iter, random_seed=42):
+    """
+    Amostra aleatória de um espaço de parâmetros
+
+    Args:
+        space: Dict {parâmetro: lista de valores ou função rng -> valor}
+        n_iter: Número de candidatos
+        random_seed: Seed
+
+    Returns:
+        Lista de dicts de parâmetros (sem repetições)
+    """
+    rng = np.random.RandomState(random_seed)
+    names = sorted(space)
+    candidates, seen = [], set()
+
+    for _ in range(n_iter * 10):
+        if len(candidates) == n_iter:
+            break
+        params = {}
+        for name in names:
+            values = space[name]
+            if callable(values):
+                params[name] = values(rng)
+            else:
+                params[name] = values[rng.randint(len(values))]
+        key = _params_key(params)
+        if key not in seen:
+            seen.add(key)
+            candidates.append(params)
+    return candidates
+
+
+def _params_key(params):
+    """Chave textual estável de um dict de parâmetros"""
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _fold_scores(y_val, y_pred, elapsed):
+    """Métricas de um candidato em um fold"""
+    report = MetricsReport(y_val, y_pred, zero_division=0)
+    return {
+        'accuracy': report.accuracy(),
+        'precision': report.precision('macro'),
+        'f1_score': report.f1('macro'),
+        'time': elapsed
+    }
+
+
+def _random_seed(model):
+    """Seed do modelo (ou do estimador final de um Pipeline); 0 se não houver"""
+    model = getattr(model, 'estimator', model)
+    return model.get_params().get('random_seed', 0)
+
+
+def _group_task(model_bytes, params_list, shared, train, val, X=None, y=None):
+    """
+    Avalia um grupo de candidatos em um fold
+
+    Todos os candidatos do grupo têm os mesmos parâmetros exceto
+    `shared` (com o prefixo do passo, em um Pipeline: 'model__k'); o
+    trabalho comum é feito uma única vez:
+    - 'k': um fit e uma busca de vizinhos com o maior k
+    - 'variant': um passe de estatísticas, trocando só a variante
+    - 'n_epochs': treino continuado, do menor para o maior número de épocas
+    Sem parâmetro compartilhado, cada candidato treina do zero.
+
+    Args:
+        model_bytes: Modelo base serializado
+        params_list: Lista de dicts de parâmetros do grupo
+        shared: Nome do parâmetro compartilhado ou None
+        train, val: Índices ou slices do fold
+        X, y: Dados (None = memória compartilhada do worker)
+
+    Returns:
+        Lista de dicts de métricas, na ordem de params_list ('time' é o
+        tempo adicional gasto para obter cada candidato)
+    """
+    if X is None:
+        X, y = cross_validation._WORKER_DATA['X'], cross_validation._WORKER_DATA['y']
+    X_train, y_train, X_val, y_val = X[train], y[train], X[val], y[val]
+
+    def _build(params):
+        model = pickle.loads(model_bytes)
+        return model.set_params(**params)
+
+    results = [None] * len(params_list)
+    kind = shared.rpartition('__')[2] if shared is not None else None
+
+    if kind == 'k':
+        start = time.perf_counter()
+        model = _build({name: value for name, value in params_list[0].items()
+                        if name != shared})
+        model.fit(X_train, y_train)
+        neighbors = model.kneighbors(X_val, max(params[shared] for params in params_list))
+        base_time = time.perf_counter() - start
+
+        for i, params in enumerate(params_list):
+            start = time.perf_counter()
+            y_pred = model.predict_from_neighbors(neighbors, params[shared])
+            results[i] = _fold_scores(y_val, y_pred,
+                                      base_time + time.perf_counter() - start)
+            base_time = 0.0
+
+    elif kind == 'variant':
+        start = time.perf_counter()
+        model = _build(dict(params_list[0], **{shared: 'multivariate'}))
+        model.fit(X_train, y_train)
+        base_time = time.perf_counter() - start
+
+        for i, params in enumerate(params_list):
+            start = time.perf_counter()
+            # Só a predição depende da variante: as estatísticas ficam
+            model.set_params(**{shared: params[shared]})
+            y_pred = model.predict(X_val)
+            results[i] = _fold_scores(y_val, y_pred,
+                                      base_time + time.perf_counter() - start)
+            base_time = 0.0
+
+    elif kind == 'n_epochs':
+        model = _build(params_list[0])
+        classes = np.unique(y)
+        # O treino continuado usa o RNG global (embaralhamento por época):
+        # semeado aqui, o resultado não depende do que o worker já executou
+        # e cada candidato equivale ao treino do zero com a mesma seed
+        np.random.seed(_random_seed(model))
+        done = 0
+        for i in sorted(range(len(params_list)),
+                        key=lambda i: params_list[i][shared]):
+            start = time.perf_counter()
+            n_epochs = params_list[i][shared]
+            if n_epochs > done:
+                model.set_params(**{shared: n_epochs - done})
+                model.partial_fit(X_train, y_train, classes=classes)
+                done = n_epochs
+            y_pred = model.predict(X_val)
+            results[i] = _fold_scores(y_val, y_pred, time.perf_counter() - start)
+
+    else:
+        for i, params in enumerate(params_list):
+            start = time.perf_counter()
+            model = _build(params)
+            model.fit(X_train, y_train)
+            y_pred = model.predict(X_val)
+            results[i] = _fold_scores(y_val, y_pred, time.perf_counter() - start)
+
+    return results
+
+
+def _group_candidates(model, candidates):
+    """
+    Agrupa candidatos que diferem apenas no parâmetro compartilhado
+
+    Args:
+        model: Modelo base
+        candidates: Lista de dicts de parâmetros
+
+    Returns:
+        Lista de (parâmetro compartilhado ou None, lista de candidatos)
+    """
+    shared = getattr(model, 'shared_search_param', None)
+    if shared is None or not all(shared in params for params in candidates):
+        return [(None, [params]) for params in candidates]
+
+    groups = {}
+    for params in candidates:
+        rest = {name: value for name, value in params.items() if name != shared}
+        groups.setdefault(_params_key(rest), []).append(params)
+    return [(shared, group) for group in groups.values()]
+
+
+def _load_log(log_path, signature):
+    """
+    Lê os resultados já calculados de uma busca
+
+    Args:
+        log_path: Arquivo JSON Lines (pode não existir)
+        signature: Assinatura da busca (dados, folds e modelo)
+
+    Returns:
+        Dict {(chave dos parâmetros, fold): métricas}
+    """
+    done = {}
+    if log_path is None or not os.path.exists(log_path):
+        return done
+    with open(log_path, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # linha incompleta de uma execução interrompida
+            if record.get('search') == signature:
+                done[record['params_key'], record['fold']] = {
+                    key: record[key] for key in SEARCH_METRICS + ['time']
+                }
+    return done
+
+
+def search(model, space, X, y, n_iter=None, plan=None, n_folds=5, metric='accuracy',
+           n_jobs=1, log_path=None, random_seed=42, verbose=True):
+    """
+    Busca de hiperparâmetros com validação cruzada
+
+    Com n_iter=None avalia a grade completa; caso contrário, n_iter
+    candidatos aleatórios. Todos os candidatos usam o mesmo FoldPlan. Cada
+    tarefa é um grupo de candidatos em um fold (ver _group_task) e as
+    tarefas rodam em um pool com X e y em memória compartilhada. Cada
+    resultado é acrescentado a log_path assim que termina; uma nova chamada
+    com os mesmos dados, folds, modelo e log retoma de onde parou.
+
+    Args:
+        model: Modelo base com get_params() e set_params()
+        space: Dict {parâmetro: lista de valores} (ou funções rng -> valor
+            para busca aleatória)
+        X: Features
+        y: Target
+        n_iter: Número de candidatos aleatórios (None = grade)
+        plan: FoldPlan compartilhado (padrão: estratificado com n_folds)
+        n_folds: Número de folds se plan for None
+        metric: Métrica usada para ordenar os candidatos
+        n_jobs: Número de processos
+        log_path: Arquivo JSON Lines para retomar a busca
+        random_seed: Seed dos folds e da amostragem
+        verbose: Se True, imprime progresso
+
+    Returns:
+        Dict com 'candidates' (lista ordenada pela métrica, cada um com
+        'params' e '<métrica>_mean/_std/_all'), 'best_params',
+        'best_score', 'n_tasks', 'n_resumed' e 'wall_time'
+    """
+    if plan is None:
+        plan = FoldPlan(y, n_folds=n_folds, stratified=True, random_seed=random_seed)
+    layout = plan.layout(X, y)
+    folds = layout.folds
+
+    if n_iter is None:
+        candidates = parameter_grid(space)
+    else:
+        candidates = parameter_sample(space, n_iter, random_seed=random_seed)
+
+    signature = _hash_bytes(dataset_fingerprint(X, y).encode(),
+                            np.ascontiguousarray(plan.fold_of).tobytes(),
+                            model_fingerprint(model).encode())
+    done = _load_log(log_path, signature)
+    candidate_keys = {_params_key(params) for params in candidates}
+    n_resumed = sum(1 for key, fold_idx in done
+                    if key in candidate_keys and fold_idx < len(folds))
+
+    # Tarefas (grupo, fold) com os candidatos ainda não avaliados
+    model_bytes = pickle.dumps(model)
+    tasks = []
+    for shared, group in _group_candidates(model, candidates):
+        for fold_idx in range(len(folds)):
+            pending = [params for params in group
+                       if (_params_key(params), fold_idx) not in done]
+            if pending:
+                tasks.append((shared, pending, fold_idx))
+
+    n_jobs = resolve_n_jobs(n_jobs, max(len(tasks), 1))
+    if verbose:
+        print(f"  {len(candidates)} candidatos, {len(tasks)} tarefas em {n_jobs} "
+              f"processo(s), {n_resumed} resultado(s) retomado(s) do log")
+
+    log_file = open(log_path, 'a') if log_path is not None else None
+    start_wall = time.time()
+
+    def _collect(shared, group, fold_idx, results):
+        for params, result in zip(group, results):
+            key = _params_key(params)
+            done[key, fold_idx] = result
+            if log_file is not None:
+                record = {'search': signature, 'params_key': key, 'params': params,
+                          'fold': fold_idx}
+                record.update(result)
+                log_file.write(json.dumps(record, default=str) + "\n")
+        if log_file is not None:
+            log_file.flush()
+        if verbose:
+            best = max(result[metric] for result in results)
+            print(f"  fold {fold_idx + 1}: {len(group)} candidato(s)"
+                  f"{' (' + shared + ' compartilhado)' if shared else ''}, "
+                  f"melhor {metric} {best:.4f}")
+
+    try:
+        if n_jobs == 1:
+            for shared, group, fold_idx in tasks:
+                train, val = folds[fold_idx]
+                _collect(shared, group, fold_idx, _group_task(
+                    model_bytes, group, shared, train, val, layout.X, layout.y))
+        else:
+            with shared_pool(layout.X, layout.y, n_jobs) as executor:
+                futures = [executor.submit(_group_task, model_bytes, group, shared,
+                                           *folds[fold_idx])
+                           for shared, group, fold_idx in tasks]
+                for (shared, group, fold_idx), future in zip(tasks, futures):
+                    _collect(shared, group, fold_idx, future.result())
+    finally:
+        if log_file is not None:
+            log_file.close()
+
+    # Agrega por candidato
+    summaries = []
+    for params in candidates:
+        key = _params_key(params)
+        summary = {'params': params}
+        for name in SEARCH_METRICS + ['time']:
+            values = np.array([done[key, fold_idx][name]
+                               for fold_idx in range(len(folds))])
+            summary[f'{name}_mean'] = float(np.mean(values))
+            summary[f'{name}_std'] = float(np.std(values))
+            summary[f'{name}_all'] = values
+        summaries.append(summary)
+
+    summaries.sort(key=lambda summary: summary[f'{metric}_mean'], reverse=True)
+    return {
+        'candidates': summaries,
+        'best_params': summaries[0]['params'],
+        'best_score': summaries[0][f'{metric}_mean'],
+        'n_tasks': len(tasks),
+        'n_resumed': n_resumed,
+        'wall_time': time.time() - start_wall
+    }
+
+
+def format_search_report(result, metric='accuracy', top=10):
+    """
+    Relatório em texto dos melhores candidatos
+
+    Args:
+        result: Dict retornado por search
+        metric: Métrica exibida
+        top: Número de candidatos listados
+
+    Returns:
+        String formatada
+    """
+    report = "Busca de Hiperparâmetros\n" + "=" * 80 + "\n"
+    for rank, summary in enumerate(result['candidates'][:top], 1):
+        report += (f"{rank:>3}. {summary[f'{metric}_mean']:.4f} "
+                   f"± {summary[f'{metric}_std']:.4f}  "
+                   f"{_params_key(summary['params'])}\n")
+    report += "-" * 80 + "\n"
+    report += (f"Melhor: {_params_key(result['best_params'])} "
+               f"({metric} {result['best_score']:.4f})\n")
+    report += (f"Tarefas executadas: {result['n_tasks']}, "
+               f"resultados retomados: {result['n_resumed']}, "
+               f"tempo: {result['wall_time']:.2f}s\n")
+    return report
@@ -0,0 +1,186 @@
+"""
+Stacking de classificadores a partir de predições fora do fold
+SEM uso de scikit-learn
+"""
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from .cross_validation import FoldPlan
+from .scheduler import run_experiments
+
+
+class StackingClassifier:
+    """
+    Ensemble por stacking: um meta-modelo sobre as probabilidades dos
+    modelos base
+
+    As probabilidades fora do fold (out-of-fold) de cada modelo base são
+    coletadas em uma única validação cruzada (reaproveitando o
+    ResultCache, se fornecido) e guardadas em uma matriz float32 compacta
+    (n_samples, n_modelos * (n_classes - 1)): a última coluna de cada
+    modelo é redundante, pois as probabilidades somam 1. Cada modelo base
+    custa n_folds + 1 treinos (folds e refit com todos os dados).
+    """
+
+    def __init__(self, base_models, meta_model, n_folds=5, random_seed=42,
+                 n_jobs=1, cache=None, verbose=False):
+        """
+        Inicializa o stacking
+
+        Args:
+            base_models: Dict {nome: modelo não treinado com predict_proba}
+            meta_model: Modelo não treinado com fit/predict, copiado no fit
+                (ex.: MLP(1, hidden_sizes=[], learning_rate=2.0,
+                n_epochs=1000, batch_size=None) como regressão logística
+                multinomial; input_size é ajustado ao número de
+                meta-features). predict_proba do stacking exige um
+                meta-modelo com predict_proba
+            n_folds: Número de folds para as predições fora do fold
+            random_seed: Seed dos folds
+            n_jobs: Processos na validação cruzada e threads na predição
+            cache: ResultCache opcional para as predições por fold
+            verbose: Se True, imprime o progresso da validação cruzada
+        """
+        self.base_models = base_models
+        self.meta_model = meta_model
+        self.n_folds = n_folds
+        self.random_seed = random_seed
+        self.n_jobs = n_jobs
+        self.cache = cache
+        self.verbose = verbose
+
+    def _make_meta_model(self, n_features):
+        """Cópia não treinada do meta-modelo, com input_size = n_features"""
+        meta_model = pickle.loads(pickle.dumps(self.meta_model))
+        if 'input_size' in (meta_model.get_params() if hasattr(meta_model, 'get_params')
+                            else {}):
+            meta_model.set_params(input_size=n_features)
+        return meta_model
+
+    def _compact(self, proba):
+        """
+        Probabilidades (n, n_classes) sem a última coluna (redundante)
+        """
+        if proba.shape[1] != len(self.classes_):
+            raise ValueError("predict_proba de um modelo base não cobre todas as classes")
+        return proba[:, :-1]
+
+    def fit(self, X, y):
+        """
+        Treina modelos base e meta-modelo
+
+        Args:
+            X: Features
+            y: Labels
+        """
+        self.classes_ = np.unique(y)
+        width = len(self.classes_) - 1
+
+        plan = FoldPlan(y, n_folds=self.n_folds, stratified=True,
+                        random_seed=self.random_seed)
+        layout = plan.layout(X, y)
+
+        # Uma validação cruzada por modelo base, todas no mesmo pool
+        self.cv_results_, _ = run_experiments(
+            self.base_models, layout.X, layout.y, layout.folds, n_jobs=self.n_jobs,
+            verbose=self.verbose, cache=self.cache, keep_predictions='proba', memory=None
+        )
+
+        # Matriz fora do fold na ordem original das amostras
+        self.oof_ = np.empty((len(y), width * len(self.base_models)), dtype=np.float32)
+        for m, name in enumerate(self.base_models):
+            columns = slice(m * width, (m + 1) * width)
+            for fold_idx, proba in enumerate(self.cv_results_[name]['y_proba_folds']):
+                rows = layout.perm[layout.bounds[fold_idx]:layout.bounds[fold_idx + 1]]
+                self.oof_[rows, columns] = self._compact(proba)
+
+        self.meta_model_ = self._make_meta_model(self.oof_.shape[1])
+        self.meta_model_.fit(self.oof_, y)
+
+        # Modelos base finais com todos os dados
+        self.fitted_models_ = {}
+        for name, model in self.base_models.items():
+            fitted = pickle.loads(pickle.dumps(model))
+            self.fitted_models_[name] = fitted.fit(X, y)
+
+        return self
+
+    def meta_features(self, X):
+        """
+        Probabilidades dos modelos base (avaliados em threads concorrentes)
+
+        Args:
+            X: Features
+
+        Returns:
+            Matriz float32 (n_samples, n_modelos * (n_classes - 1))
+        """
+        width = len(self.classes_) - 1
+        features = np.empty((len(X), width * len(self.fitted_models_)), dtype=np.float32)
+        models = list(self.fitted_models_.values())
+
+        def _fill(m):
+            proba = models[m].predict_proba(X)
+            features[:, m * width:(m + 1) * width] = self._compact(proba)
+
+        n_threads = max(1, min(self.n_jobs if self.n_jobs and self.n_jobs > 0
+                               else len(models), len(models)))
+        if n_threads == 1:
+            for m in range(len(models)):
+                _fill(m)
+        else:
+            with ThreadPoolExecutor(max_workers=n_threads) as executor:
+                list(executor.map(_fill, range(len(models))))
+        return features
+
+    def predict(self, X):
+        """
+        Prediz classes
+
+        Args:
+            X: Features
+
+        Returns:
+            Array de predições
+        """
+        return self.meta_model_.predict(self.meta_features(X))
+
+    def predict_proba(self, X):
+        """
+        Prediz probabilidades (meta-modelo com predict_proba)
+
+        Args:
+            X: Features
+
+        Returns:
+            Matriz de probabilidades
+        """
+        if not hasattr(self.meta_model_, 'predict_proba'):
+            raise TypeError(f"meta-modelo {type(self.meta_model_).__name__} "
+                            f"não tem predict_proba")
+        return self.meta_model_.predict_proba(self.meta_features(X))
+
+    def score(self, X, y):
+        """
+        Calcula acurácia
+
+        Args:
+            X: Features
+            y: Labels verdadeiros
+
+        Returns:
+            Acurácia
+        """
+        return np.mean(self.predict(X) == y)
+
+    def get_params(self):
+        """Retorna parâmetros do modelo"""
+        return {
+            'base_models': {name: type(model).__name__
+                            for name, model in self.base_models.items()},
+            'meta_model': type(self.meta_model).__name__,
+            'n_folds': self.n_folds,
+            'random_seed': self.random_seed
+        }
@@ -2,6 +2,8 @@
 Visualização de resultados
 Gera gráficos e tabelas para análise
 """
+import json
+import time
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib
@@ -241,24 +243,41 @@ def generate_markdown_table(results_dict, save_path=None):
     return table
 
 
-def plot_learning_curve(model_name, train_scores, val_scores, save_path=None):
+def plot_learning_curve(model_name, train_scores, val_scores, save_path=None,
+                        train_sizes=None):
     """
     Plota curva de aprendizado
 
     Args:
         model_name: Nome do modelo
-        train_scores: Scores de treino por época
-        val_scores: Scores de validação por época
+        train_scores: Scores de treino por época, ou por tamanho de treino
+            (n_sizes,) / (n_sizes, n_folds)
+        val_scores: Scores de validação no mesmo formato
         save_path: Caminho para salvar
+        train_sizes: Tamanhos de treino (eixo x); se None, o eixo x é a época
     """
     fig, ax = plt.subplots(figsize=(10, 6))
 
-    epochs = np.arange(1, len(train_scores) + 1)
-
-    ax.plot(epochs, train_scores, 'b-', label='Treino', linewidth=2)
-    ax.plot(epochs, val_scores, 'r-', label='Validação', linewidth=2)
-
-    ax.set_xlabel('Época', fontsize=12)
+    train_scores = np.asarray(train_scores)
+    val_scores = np.asarray(val_scores)
+
+    if train_sizes is None:
+        x = np.arange(1, len(train_scores) + 1)
+        xlabel = 'Época'
+    else:
+        x = np.asarray(train_sizes)
+        xlabel = 'Amostras de treino'
+
+    for scores, style, label in [(train_scores, 'b-', 'Treino'),
+                                 (val_scores, 'r-', 'Validação')]:
+        if scores.ndim == 2:
+            # Média ± desvio entre os folds
+            mean, std = scores.mean(axis=1), scores.std(axis=1)
+            ax.fill_between(x, mean - std, mean + std, color=style[0], alpha=0.15)
+            scores = mean
+        ax.plot(x, scores, style, label=label, linewidth=2)
+
+    ax.set_xlabel(xlabel, fontsize=12)
     ax.set_ylabel('Score', fontsize=12)
     ax.set_title(f'Curva de Aprendizado - {model_name}', fontsize=14, fontweight='bold')
     ax.legend(fontsize=11)
@@ -269,3 +288,36 @@ def plot_learning_curve(model_name, train_scores, val_scores, save_path=None):
     if save_path:
         plt.savefig(save_path, dpi=300, bbox_inches='tight')
     plt.close()
+
+
+def save_fold_metrics_jsonl(results_dict, save_path, run_info=None):
+    """
+    Acrescenta as métricas de cada fold em formato JSON Lines
+
+    Uma linha por (classificador, fold), com todas as métricas escalares
+    do summary (acurácia, tempos de parede e CPU, pico de memória, vazão).
+    O arquivo é aberto em modo append para acompanhar regressões de
+    desempenho entre execuções.
+
+    Args:
+        results_dict: Dict com resultados de cada classificador
+        save_path: Caminho do arquivo .jsonl
+        run_info: Dict opcional com metadados da execução
+    """
+    run_info = dict(run_info or {})
+    run_info.setdefault('timestamp', time.strftime('%Y-%m-%dT%H:%M:%S'))
+
+    with open(save_path, 'a') as f:
+        for clf, result in results_dict.items():
+            keys = [key[:-len('_all')] for key in result
+                    if key.endswith('_all') and np.ndim(result[key]) == 1]
+            n_folds = len(result[keys[0] + '_all'])
+
+            for fold in range(n_folds):
+                record = dict(run_info)
+                record['model'] = clf
+                record['fold'] = fold + 1
+                for key in keys:
+                    value = float(result[key + '_all'][fold])
+                    record[key] = value if np.isfinite(value) else None
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
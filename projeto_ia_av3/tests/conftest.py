@@ -0,0 +1,7 @@
+"""
+Configuração dos testes: src no path, como nos scripts (main.py etc.)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -0,0 +1,59 @@
+"""
+Testes dos algoritmos: partial_fit exato e compressão
+"""
+import numpy as np
+import pytest
+
+from algorithms.knn import KNNEuclidean
+from algorithms.naive_bayes import MultivariateNaiveBayes, UnivariateNaiveBayes
+
+
+def _data(n=600, n_features=4, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n, n_features))
+    y = (X[:, 0] + 0.5 * X[:, 1] > 0).astype(int)
+    return X, y
+
+
+@pytest.mark.parametrize('make', [KNNEuclidean, UnivariateNaiveBayes, MultivariateNaiveBayes])
+def test_exact_partial_fit_equals_fit(make):
+    X, y = _data()
+    X_test, _ = _data(n=200, seed=1)
+    full = make().fit(X, y)
+
+    model = make()
+    assert model.exact_partial_fit
+    for start in range(0, len(X), 150):
+        model.partial_fit(X[start:start + 150], y[start:start + 150], classes=[0, 1])
+
+    np.testing.assert_array_equal(model.predict(X_test), full.predict(X_test))
+    if hasattr(full, 'predict_proba'):
+        np.testing.assert_allclose(model.predict_proba(X_test), full.predict_proba(X_test),
+                                   rtol=1e-7, atol=1e-10)
+
+
+def test_quantize_model_rejects_non_classifier_mlps():
+    from algorithms.mlp_ensemble import MLPEnsemble
+    from algorithms.mlp_regressor import MLPRegressor
+    from algorithms.quantization import compression_report, quantize_model
+
+    X, _ = _data(n=50)
+    for model in (MLPEnsemble(input_size=4, hidden_sizes=[4]),
+                  MLPRegressor(input_size=4, hidden_sizes=[4])):
+        with pytest.raises(ValueError):
+            quantize_model(model)
+        with pytest.raises(ValueError):
+            compression_report(model, X, np.zeros(len(X)))
+    with pytest.raises(ValueError):
+        quantize_model(KNNEuclidean())
+
+
+def test_quantized_mlp_keeps_pruned_layers_compact():
+    from algorithms.mlp import MLP
+    from algorithms.quantization import quantize_model
+
+    X, y = _data()
+    mlp = MLP(input_size=4, hidden_sizes=[16], output_size=2, n_epochs=20).fit(X, y)
+    quantized = quantize_model(mlp, sparsity=0.5)
+    assert np.mean(quantized.predict(X) == mlp.predict(X)) > 0.9
+    assert all(layer._W_q is None for layer in quantized.layers)
@@ -0,0 +1,66 @@
+"""
+Testes do treino em streaming (fit_dataset)
+"""
+import numpy as np
+import pytest
+
+from utils.dataset import ArrayDataset, fit_dataset
+
+
+class _Spy:
+    """Estimador que registra cada chamada de partial_fit"""
+
+    def __init__(self, n_epochs=None, is_regressor=False):
+        self.n_epochs = n_epochs
+        self.is_regressor = is_regressor
+        self.calls = []
+
+    def get_params(self):
+        return {} if self.n_epochs is None else {'n_epochs': self.n_epochs}
+
+    def set_params(self, **params):
+        for key, value in params.items():
+            setattr(self, key, value)
+        return self
+
+    def partial_fit(self, X, y, classes=None):
+        self.calls.append((len(X), self.n_epochs, classes))
+        return self
+
+
+def _dataset(n_samples=1000):
+    rng = np.random.default_rng(0)
+    return ArrayDataset(rng.standard_normal((n_samples, 3)), rng.integers(0, 3, n_samples),
+                        chunk_rows=300)
+
+
+@pytest.mark.parametrize('n_epochs', [1, 3])
+def test_fit_dataset_runs_each_epoch_as_one_partial_fit_pass(n_epochs):
+    spy = fit_dataset(_Spy(n_epochs=n_epochs), _dataset(), batch_size=256)
+
+    assert all(epochs == 1 for _, epochs, _ in spy.calls)
+    assert sum(n for n, _, _ in spy.calls) == n_epochs * 1000
+    assert len(spy.calls) == n_epochs * 4
+    np.testing.assert_array_equal(spy.calls[0][2], [0, 1, 2])
+    assert spy.n_epochs == n_epochs
+
+
+def test_fit_dataset_without_epochs_makes_a_single_pass():
+    spy = fit_dataset(_Spy(), _dataset())
+
+    assert [n for n, _, _ in spy.calls] == [300, 300, 300, 100]
+
+
+def test_fit_dataset_restores_n_epochs_on_error():
+    spy = _Spy(n_epochs=5)
+    spy.partial_fit = lambda X, y, classes=None: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        fit_dataset(spy, _dataset())
+    assert spy.n_epochs == 5
+
+
+def test_fit_dataset_passes_no_classes_to_regressors():
+    spy = fit_dataset(_Spy(n_epochs=2, is_regressor=True), _dataset())
+
+    assert all(classes is None for _, _, classes in spy.calls)
@@ -0,0 +1,63 @@
+"""
+Testes dos acumuladores de métricas em streaming
+"""
+import numpy as np
+import pytest
+
+from utils.metrics import (ConfusionAccumulator, MetricsReport, ScoreHistogramAccumulator,
+                           average_precision, roc_auc_score)
+
+
+def test_confusion_accumulator_matches_metrics_report():
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, 3, 1000)
+    y_pred = np.where(rng.random(1000) < 0.7, y_true, rng.integers(0, 3, 1000))
+
+    acc = ConfusionAccumulator()
+    for start in range(0, 1000, 128):
+        acc.update(y_true[start:start + 128], y_pred[start:start + 128])
+    report = MetricsReport(y_true, y_pred)
+
+    np.testing.assert_array_equal(acc.confusion_matrix, report.confusion_matrix)
+    assert acc.result().accuracy() == pytest.approx(report.accuracy())
+    assert acc.result().f1('macro') == pytest.approx(report.f1('macro'))
+
+
+def test_confusion_accumulator_merge_and_string_labels():
+    y_true = np.array(['a', 'b', 'b', 'c', 'a'])
+    y_pred = np.array(['a', 'b', 'c', 'c', 'b'])
+    left = ConfusionAccumulator(classes=['a', 'b', 'c']).update(y_true[:2], y_pred[:2])
+    right = ConfusionAccumulator(classes=['a', 'b', 'c']).update(y_true[2:], y_pred[2:])
+    left.merge(right)
+
+    assert left.n_samples == 5
+    assert left.result().accuracy() == pytest.approx(0.6)
+    with pytest.raises(ValueError):
+        left.update(['d'], ['a'])
+
+
+def test_confusion_accumulator_rejects_far_sparse_labels():
+    with pytest.raises(ValueError):
+        ConfusionAccumulator().update([0, 150000], [0, 150000])
+
+
+def test_score_histogram_matches_exact_curves():
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 2, 5000)
+    p1 = np.clip(0.3 * y_true + 0.7 * rng.random(5000), 0, 1)
+    proba = np.column_stack([1 - p1, p1])
+
+    acc = ScoreHistogramAccumulator(n_bins=10000, n_outputs=2)
+    for start in range(0, 5000, 1000):
+        acc.update(y_true[start:start + 1000], proba[start:start + 1000])
+
+    assert acc.roc_auc_score() == pytest.approx(roc_auc_score(y_true, proba), abs=1e-4)
+    assert acc.average_precision() == pytest.approx(average_precision(y_true, proba), abs=1e-3)
+
+
+def test_score_histogram_rejects_unknown_labels():
+    with pytest.raises(ValueError):
+        ScoreHistogramAccumulator(n_outputs=2).update(np.array([0, 2]), np.full((2, 2), 0.5))
+    with pytest.raises(ValueError):
+        ScoreHistogramAccumulator(n_outputs=2, classes=['a', 'b']).update(
+            np.array(['a', 'c']), np.full((2, 2), 0.5))